@@ -0,0 +1,300 @@
+"""
+Adaptive difficulty for GameMaster Quiz
+Elo ratings for questions, updated after every answer, and a difficulty-bucketed index to pick from
+"""
+
+import math
+import os
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left, insort
+
+from durable import write_bytes_atomic
+from question_stats import MIN_ANSWERS
+
+INITIAL_RATING = 1500.0
+BUCKET_WIDTH = 50.0  # Elo points per difficulty bucket
+TARGET_OFFSET = 70.0  # ask slightly below the player's rating, for about 60% correct answers
+PLAYER_K = 48.0
+QUESTION_K = 32.0
+MIN_QUESTION_K = 4.0
+MAX_POINTS_FACTOR = 4  # the hardest questions are worth at most 4x the base points
+RATINGS_SUFFIX = ".ratings"
+
+# Ratings file: magic, question count and quiz version, then every question's
+# rating (float64) and number of rating updates (uint32), little-endian
+RATINGS_MAGIC = b"GMQRATE1"
+RATINGS_HEADER = struct.Struct("<8sII")
+
+
+def expected_score(player_rating, question_rating):
+    """Get the chance that a player answers a question correctly"""
+    return 1 / (1 + 10 ** ((question_rating - player_rating) / 400))
+
+
+def rating_from_rate(correct_rate):
+    """Get the rating of a question that an average player answers correctly at this rate"""
+    correct_rate = min(max(correct_rate, 0.02), 0.98)
+    return INITIAL_RATING + 400 * math.log10((1 - correct_rate) / correct_rate)
+
+
+def question_points(rating, base_points):
+    """Get the points for answering a question of this rating correctly"""
+    factor = 2 ** ((rating - INITIAL_RATING) / 400)
+    return max(1, min(round(base_points * factor), base_points * MAX_POINTS_FACTOR))
+
+
+class RatingIndex:
+    """Question ratings of one quiz, bucketed by difficulty so a pick is a bisect away"""
+
+    def __init__(self, ratings, updates=None, version=0):
+        """Build the buckets over an array of ratings"""
+        self.ratings = ratings
+        self.updates = updates if updates is not None else array('I', bytes(4 * len(ratings)))
+        self.version = version
+        self.lock = threading.Lock()
+
+        # Each question sits in one bucket; position makes moving it between buckets O(1)
+        self.buckets = {}
+        self.keys = []  # sorted keys of the non-empty buckets
+        self.bucket_of = array('i', bytes(4 * len(ratings)))
+        self.position = array('I', bytes(4 * len(ratings)))
+        for question, rating in enumerate(ratings):
+            self._insert(question, self._bucket(rating))
+
+    def __len__(self):
+        """Number of rated questions"""
+        return len(self.ratings)
+
+    @staticmethod
+    def _bucket(rating):
+        """Get the bucket key of a rating"""
+        return math.floor(rating / BUCKET_WIDTH)
+
+    def _insert(self, question, key):
+        """Add a question to a bucket"""
+        members = self.buckets.get(key)
+        if members is None:
+            members = self.buckets[key] = array('I')
+            insort(self.keys, key)
+        self.bucket_of[question] = key
+        self.position[question] = len(members)
+        members.append(question)
+
+    def _remove(self, question):
+        """Take a question out of its bucket by swapping in the bucket's last member"""
+        key = self.bucket_of[question]
+        members = self.buckets[key]
+        last = members.pop()
+        if last != question:
+            members[self.position[question]] = last
+            self.position[last] = self.position[question]
+        if not members:
+            del self.buckets[key]
+            del self.keys[bisect_left(self.keys, key)]
+
+    def pick(self, target, asked, rng):
+        """Get a question not in asked whose rating is closest to target, or None"""
+        with self.lock:
+            # Walk outwards from the target's bucket; buckets are searched, never questions
+            keys = self.keys
+            target_key = self._bucket(target)
+            high = bisect_left(keys, target_key)
+            low = high - 1
+            while low >= 0 or high < len(keys):
+                if high >= len(keys) or (low >= 0 and target_key - keys[low] <= keys[high] - target_key):
+                    key, low = keys[low], low - 1
+                else:
+                    key, high = keys[high], high + 1
+                question = self._draw(self.buckets[key], asked, rng)
+                if question is not None:
+                    return question
+            return None
+
+    @staticmethod
+    def _draw(members, asked, rng):
+        """Get a random member of a bucket that wasn't asked yet"""
+        for _ in range(4):
+            question = members[rng.randrange(len(members))]
+            if question not in asked:
+                return question
+        # Nearly every member was asked already; at most one pass over the bucket
+        start = rng.randrange(len(members))
+        for offset in range(len(members)):
+            question = members[(start + offset) % len(members)]
+            if question not in asked:
+                return question
+        return None
+
+    def update(self, question, player_rating, is_correct):
+        """Apply one answer to the question's rating; returns the player's new rating"""
+        with self.lock:
+            rating = self.ratings[question]
+            surprise = (1 if is_correct else 0) - expected_score(player_rating, rating)
+
+            # New questions move fast, well-known ones settle
+            k = max(MIN_QUESTION_K, QUESTION_K / math.sqrt(1 + self.updates[question] / 10))
+            new_rating = rating - k * surprise
+            self.ratings[question] = new_rating
+            self.updates[question] = min(self.updates[question] + 1, 0xFFFFFFFF)
+
+            key = self._bucket(new_rating)
+            if key != self.bucket_of[question]:
+                self._remove(question)
+                self._insert(question, key)
+        return player_rating + PLAYER_K * surprise
+
+    def to_bytes(self):
+        """Encode the ratings as a ratings file"""
+        with self.lock:
+            ratings, updates = array('d', self.ratings), array('I', self.updates)
+        if sys.byteorder != "little":
+            ratings.byteswap()
+            updates.byteswap()
+        return (RATINGS_HEADER.pack(RATINGS_MAGIC, len(ratings), self.version)
+                + ratings.tobytes() + updates.tobytes())
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Decode a ratings file; raises ValueError if it is not one"""
+        if len(data) < RATINGS_HEADER.size:
+            raise ValueError("Not a ratings file")
+        magic, count, version = RATINGS_HEADER.unpack_from(data)
+        if magic != RATINGS_MAGIC or len(data) != RATINGS_HEADER.size + 12 * count:
+            raise ValueError("Not a ratings file")
+        ratings, updates = array('d'), array('I')
+        ratings.frombytes(data[RATINGS_HEADER.size:RATINGS_HEADER.size + 8 * count])
+        updates.frombytes(data[RATINGS_HEADER.size + 8 * count:])
+        if sys.byteorder != "little":
+            ratings.byteswap()
+            updates.byteswap()
+        return cls(ratings, updates, version)
+
+
+class AdaptivePlay:
+    """One adaptive game: the player's running rating and the questions asked so far"""
+
+    def __init__(self, index, rng, base_points, rating=INITIAL_RATING):
+        """Start an adaptive game over a rating index"""
+        self.index = index
+        self.rng = rng
+        self.base_points = base_points
+        self.rating = rating
+        self.asked = set()
+
+    def next_question(self):
+        """Pick the next question for the player's current rating"""
+        question = self.index.pick(self.rating - TARGET_OFFSET, self.asked, self.rng)
+        if question is not None:
+            self.asked.add(question)
+        return question
+
+    def answer(self, question, is_correct):
+        """Record an answer; returns the points it earns"""
+        points = question_points(self.index.ratings[question], self.base_points) if is_correct else 0
+        self.rating = self.index.update(question, self.rating, is_correct)
+        return points
+
+
+class QuestionRatings:
+    """Loads, caches and saves the rating index of every quiz played in adaptive mode"""
+
+    def __init__(self, answer_stats, persistence=None):
+        """Initialize question ratings next to the answer stats they are seeded from"""
+        self.answer_stats = answer_stats
+        self.persistence = persistence
+        self.indexes = {}
+        self.dirty = set()
+        self.lock = threading.Lock()
+        if persistence:
+            persistence.register("question_ratings", self.flush)
+
+    def ratings_path(self, quiz_name, is_custom):
+        """Get the ratings file of a quiz"""
+        return os.path.join(self.answer_stats.stats_dir, "custom" if is_custom else "default",
+                            quiz_name + RATINGS_SUFFIX)
+
+    def index(self, quiz_name, is_custom, questions):
+        """Get the rating index of this version of a quiz, building it on first use"""
+        key = (quiz_name, bool(is_custom))
+        # Keyed by version, not by the questions object: a compiled quiz evicted and
+        # opened again is a new object, and its unsaved ratings must carry over
+        version = self.answer_stats.version(quiz_name, is_custom, questions)
+        with self.lock:
+            cached = self.indexes.get(key)
+            if cached is not None and cached.version == version:
+                return cached
+
+        index = self._load(key, len(questions), version) or self._seed(key, questions, version)
+        with self.lock:
+            # Another game may have built it meanwhile and already moved its ratings
+            cached = self.indexes.get(key)
+            if cached is not None and cached.version == version:
+                return cached
+            self.indexes[key] = index
+        return index
+
+    def _load(self, key, count, version):
+        """Load saved ratings if they belong to this version of the quiz"""
+        try:
+            with open(self.ratings_path(*key), 'rb') as f:
+                index = RatingIndex.from_bytes(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Warning: ignoring unreadable question ratings for {key[0]}: {e}")
+            return None
+        if len(index) != count or index.version != version:
+            return None
+        return index
+
+    def _seed(self, key, questions, version):
+        """Start the ratings from the answer stats, where questions have enough answers"""
+        ratings = array('d', [INITIAL_RATING]) * len(questions)
+        stats = self.answer_stats.load_current(*key, questions)
+        if stats is not None:
+            for question in range(stats.count):
+                answered = stats.counts["answered"][question]
+                if answered >= MIN_ANSWERS:
+                    ratings[question] = rating_from_rate(stats.counts["correct"][question] / answered)
+        return RatingIndex(ratings, version=version)
+
+    def changed(self, quiz_name, is_custom):
+        """Note that a quiz's ratings moved; they are saved with the next flush"""
+        with self.lock:
+            self.dirty.add((quiz_name, bool(is_custom)))
+        if self.persistence:
+            self.persistence.mark_dirty("question_ratings")
+        else:
+            self.flush()
+
+    def clear(self):
+        """Drop every cached index and unsaved change, e.g. after the ratings files were replaced"""
+        with self.lock:
+            self.indexes = {}
+            self.dirty = set()
+
+    def ratings_files(self):
+        """Get every ratings file, for backups"""
+        files = []
+        for kind in ("default", "custom"):
+            directory = os.path.join(self.answer_stats.stats_dir, kind)
+            if os.path.isdir(directory):
+                files.extend(os.path.join(directory, name) for name in sorted(os.listdir(directory))
+                             if name.endswith(RATINGS_SUFFIX))
+        return files
+
+    def flush(self):
+        """Save the ratings of every quiz that changed"""
+        with self.lock:
+            dirty, self.dirty = self.dirty, set()
+            indexes = [(key, self.indexes[key]) for key in dirty if key in self.indexes]
+        for key, index in indexes:
+            path = self.ratings_path(*key)
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                write_bytes_atomic(path, index.to_bytes())
+            except (OSError, ValueError) as e:
+                print(f"Warning: could not save question ratings for {key[0]}: {e}")
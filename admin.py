@@ -7,6 +7,14 @@ import json
 import os
 import shutil
 from datetime import datetime
+from adaptive import RATINGS_SUFFIX
+from durable import write_json_atomic
+from question_stats import STATS_SUFFIX
+from quiz_cache import shared_cache
+from ranking import sorted_page
+
+# Questions whose answers barely separate strong from weak players
+LOW_DISCRIMINATION = 0.2
 
 
 class AdminManager:
@@ -17,9 +25,10 @@ class AdminManager:
         self.quiz_game = quiz_game
         self.auth_system = auth_system
         self.quiz_manager = quiz_manager
+        self.storage = quiz_game.storage
 
-    def backup_data(self, backup_name=None):
-        """Create a backup of all data"""
+    def backup_data(self, backup_name=None, progress=None, cancelled=None):
+        """Create a backup of all data; progress(done, total, message) and cancelled() are optional"""
         if not backup_name:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             backup_name = f"backup_{timestamp}"
@@ -30,56 +39,68 @@ class AdminManager:
             # Create backup directory
             os.makedirs(backup_dir, exist_ok=True)
 
-            # Copy all data files
-            data_files = ["data/users.json", "data/scores.json"]
-            data_files.extend(self._get_all_quiz_files())
+            # Fold the score journal into the snapshot so the backup is complete; callers
+            # flush pending user saves first, on the thread that runs the save timer
+            self.quiz_game.save_scores()
 
-            for filepath in data_files:
-                if os.path.exists(filepath):
-                    # Create directory structure in backup
-                    rel_path = os.path.relpath(filepath, ".")
-                    backup_path = os.path.join(backup_dir, rel_path)
-                    os.makedirs(os.path.dirname(backup_path), exist_ok=True)
-                    shutil.copy2(filepath, backup_path)
+            # Copy all data files of the active storage, plus the answer stats and question ratings
+            files = (self.storage.backup_files() + self.quiz_game.answer_stats.stats_files()
+                     + self.quiz_game.question_ratings.ratings_files())
+            files = [path for path in files if os.path.exists(path)]
+            for done, filepath in enumerate(files):
+                if cancelled and cancelled():
+                    # A partial backup would look complete later, so remove it
+                    shutil.rmtree(backup_dir, ignore_errors=True)
+                    return False, "Backup cancelled"
+
+                # Create directory structure in backup
+                rel_path = os.path.relpath(filepath, ".")
+                backup_path = os.path.join(backup_dir, rel_path)
+                os.makedirs(os.path.dirname(backup_path), exist_ok=True)
+                shutil.copy2(filepath, backup_path)
+                if progress:
+                    progress(done + 1, len(files), rel_path)
 
             return True, f"Backup created: {backup_dir}"
         except Exception as e:
             return False, f"Backup failed: {e}"
 
-    def _get_all_quiz_files(self):
-        """Get all quiz file paths"""
-        quiz_files = []
-
-        # Default quizzes
-        for category in ["history", "characters", "mechanics"]:
-            filepath = f"data/quizzes/{category}.json"
-            if os.path.exists(filepath):
-                quiz_files.append(filepath)
-
-        # Custom quizzes
-        custom_dir = "data/quizzes/custom"
-        if os.path.exists(custom_dir):
-            for filename in os.listdir(custom_dir):
-                if filename.endswith('.json'):
-                    quiz_files.append(os.path.join(custom_dir, filename))
-
-        return quiz_files
+    def restore_backup(self, backup_dir, progress=None, cancelled=None):
+        """Replace the data files with a backup; it can be cancelled until files start being replaced
 
-    def restore_backup(self, backup_dir):
-        """Restore data from backup"""
+        Only files are touched here. Callers flush pending saves and close the storage
+        before, and call reload_data() after, on the GUI thread.
+        """
         if not os.path.exists(backup_dir):
             return False, "Backup directory not found"
 
         try:
-            # Find all JSON files in backup
+            # Find all data files in backup
             backup_files = []
             for root, dirs, files in os.walk(backup_dir):
                 for file in files:
-                    if file.endswith('.json'):
+                    if file.endswith(('.json', '.jsonl', '.db', STATS_SUFFIX, RATINGS_SUFFIX)):
                         backup_files.append(os.path.join(root, file))
+            total = len(backup_files) * 2
+
+            # Check every JSON file first so a broken backup never half-replaces the data
+            for done, backup_file in enumerate(backup_files):
+                if cancelled and cancelled():
+                    return False, "Restore cancelled; no files were changed"
+                if backup_file.endswith('.json'):
+                    with open(backup_file, 'r') as f:
+                        json.load(f)
+                if progress:
+                    progress(done + 1, total, f"Checked {os.path.relpath(backup_file, backup_dir)}")
+
+            # Nothing from the current data may outlive the restore: newer history
+            # segments, or compiled quizzes whose source is about to change
+            self.storage.prepare_restore(
+                [os.path.join(".", os.path.relpath(backup_file, backup_dir)) for backup_file in backup_files]
+            )
 
             # Restore each file
-            for backup_file in backup_files:
+            for done, backup_file in enumerate(backup_files, start=len(backup_files)):
                 # Calculate destination path
                 rel_path = os.path.relpath(backup_file, backup_dir)
                 dest_path = os.path.join(".", rel_path)
@@ -89,14 +110,30 @@ class AdminManager:
 
                 # Copy file
                 shutil.copy2(backup_file, dest_path)
-
-            # Reload data
-            self.quiz_game.scores = self.quiz_game.load_scores()
+                if progress:
+                    progress(done + 1, total, f"Restored {rel_path}")
 
             return True, "Backup restored successfully"
+        except json.JSONDecodeError as e:
+            return False, f"Restore failed: the backup contains a corrupted file ({e})"
         except Exception as e:
             return False, f"Restore failed: {e}"
 
+    def reload_data(self):
+        """Reload users, scores and quizzes from the data files after a restore"""
+        # Journal entries belong to the replaced snapshot, and copied quiz
+        # files keep their old mtimes, so cached quizzes can't be trusted
+        self.storage.clear_journal()
+        shared_cache.invalidate()
+        self.storage.rebuild_catalog()
+
+        # Anything still in memory would be written over the restored stats and ratings files
+        self.quiz_game.answer_stats.clear()
+        self.quiz_game.question_ratings.clear()
+
+        self.auth_system.users = self.auth_system.load_users()
+        self.quiz_game.reload_scores()
+
     def export_quiz(self, quiz_path, export_path=None):
         """Export a quiz to a specified location"""
         if not os.path.exists(quiz_path):
@@ -108,21 +145,16 @@ class AdminManager:
 
         try:
             # Load quiz to validate
-            with open(quiz_path, 'r') as f:
-                quiz_data = json.load(f)
-
-            # Create export directory
-            os.makedirs(os.path.dirname(export_path), exist_ok=True)
+            quiz_data = shared_cache.load(quiz_path)
 
             # Save with pretty formatting
-            with open(export_path, 'w') as f:
-                json.dump(quiz_data, f, indent=2, ensure_ascii=False)
+            write_json_atomic(export_path, quiz_data, ensure_ascii=False)
 
             return True, f"Quiz exported to {export_path}"
         except Exception as e:
             return False, f"Export failed: {e}"
 
-    def import_quiz(self, import_path, target_dir="data/quizzes/custom"):
+    def import_quiz(self, import_path):
         """Import a quiz from external file"""
         if not os.path.exists(import_path):
             return False, "Import file not found"
@@ -157,15 +189,10 @@ class AdminManager:
             safe_name = "".join(c for c in quiz_name if c.isalnum() or c in (' ', '-', '_')).strip()
             safe_name = safe_name.replace(' ', '_').lower()
 
-            filename = f"{safe_name}_imported.json"
-            filepath = os.path.join(target_dir, filename)
+            filename = f"{safe_name}_imported"
 
-            # Ensure target directory exists
-            os.makedirs(target_dir, exist_ok=True)
-
-            # Save imported quiz
-            with open(filepath, 'w') as f:
-                json.dump(quiz_data, f, indent=2)
+            # Save imported quiz as a custom quiz
+            self.quiz_manager.save_quiz(filename, quiz_data, is_custom=True)
 
             return True, f"Quiz imported successfully as {filename}"
         except json.JSONDecodeError:
@@ -180,14 +207,26 @@ class AdminManager:
         # User stats
         stats["total_users"] = len(self.auth_system.users)
         stats["total_games_played"] = sum(
-            user_data.get("games_played", 0)
-            for user_data in self.auth_system.users.values()
+            user_stats.get("total_games", 0)
+            for user_stats in self.quiz_game.scores.get("user_stats", {}).values()
         )
 
-        # Score stats
-        leaderboard = self.quiz_game.scores.get("leaderboard", [])
-        stats["total_score_entries"] = len(leaderboard)
-        stats["total_points_scored"] = sum(entry.get("score", 0) for entry in leaderboard)
+        # Score stats, streamed over the full game history
+        stats["total_score_entries"] = 0
+        stats["total_points_scored"] = 0
+        quiz_stats = {}
+        for entry in self.storage.iter_games():
+            stats["total_score_entries"] += entry.get("games", 1)
+            stats["total_points_scored"] += entry.get("score", 0)
+
+            # Carry-over records from before the history have no quiz
+            quiz_name = entry.get("quiz")
+            if quiz_name is None:
+                continue
+            if quiz_name not in quiz_stats:
+                quiz_stats[quiz_name] = {"total_score": 0, "count": 0}
+            quiz_stats[quiz_name]["total_score"] += entry.get("score", 0)
+            quiz_stats[quiz_name]["count"] += 1
 
         # Quiz stats
         quizzes = self.quiz_manager.get_available_quizzes()
@@ -196,14 +235,6 @@ class AdminManager:
         stats["custom_quizzes"] = sum(1 for q in quizzes if q[2])
 
         # Calculate average scores per quiz
-        quiz_stats = {}
-        for entry in leaderboard:
-            quiz_name = entry.get("quiz", "Unknown")
-            if quiz_name not in quiz_stats:
-                quiz_stats[quiz_name] = {"total_score": 0, "count": 0}
-            quiz_stats[quiz_name]["total_score"] += entry.get("score", 0)
-            quiz_stats[quiz_name]["count"] += 1
-
         stats["quiz_averages"] = {
             quiz: data["total_score"] / data["count"] if data["count"] > 0 else 0
             for quiz, data in quiz_stats.items()
@@ -224,60 +255,89 @@ class AdminManager:
 
         return stats
 
+    def get_users_page(self, offset=0, limit=50, sort_key="username", descending=False):
+        """Get one page of registered users with their stats and the total number of users"""
+        users = self.auth_system.users
+        user_stats = self.quiz_game.scores.get("user_stats", {})
+
+        if sort_key == "username":
+            names = sorted_page(users, None, descending, offset, limit)
+        else:
+            names = sorted_page(users, lambda name: user_stats.get(name, {}).get(sort_key, 0),
+                                descending, offset, limit)
+
+        rows = []
+        for username in names:
+            stats = user_stats.get(username, {})
+            rows.append({
+                "username": username,
+                "total_games": stats.get("total_games", 0),
+                "total_score": stats.get("total_score", 0)
+            })
+        return rows, len(users)
+
+    def get_question_report(self, quiz_name, is_custom=False):
+        """Get a quiz's per-question answer report, or None if it has no answers for this version"""
+        # Callers flush pending answer stats first, on the thread that runs the save timer
+        questions = self.storage.load_questions(quiz_name, is_custom)
+        if questions is None:
+            return None
+        stats = self.quiz_game.answer_stats.load_current(quiz_name, is_custom, questions)
+        if stats is None:
+            return None
+
+        report = stats.report()
+        report["questions"] = questions
+        report["played"] = [i for i, answered in enumerate(report["answered"]) if answered]
+        report["total_answers"] = sum(report["answered"])
+        report["unused_distractors"] = sum(1 for never in report["never_chosen"] if never)
+        report["low_discrimination"] = sum(1 for r in report["discrimination"]
+                                           if r is not None and r < LOW_DISCRIMINATION)
+        return report
+
+    def get_question_page(self, report, offset=0, limit=50, sort_key="number", descending=False):
+        """Get one page of the played questions of a question report and their number"""
+        played = report["played"]
+        if sort_key == "number":
+            indexes = sorted_page(played, None, descending, offset, limit)
+        else:
+            values = report[sort_key]
+
+            # Questions without a value yet always come last
+            def key(i):
+                if values[i] is None:
+                    return (0, 0) if descending else (1, 0)
+                return (1, values[i]) if descending else (0, values[i])
+
+            indexes = sorted_page(played, key, descending, offset, limit)
+
+        rows = []
+        for i in indexes:
+            question = report["questions"][i]
+            rows.append({
+                "number": i + 1,
+                "question": question.question,
+                "answered": report["answered"][i],
+                "correct_rate": report["correct_rate"][i],
+                "discrimination": report["discrimination"][i],
+                "answer_ms": report["answer_ms"][i],
+                "never_chosen": ", ".join(question.options[option] for option in report["never_chosen"][i])
+            })
+        return rows, len(played)
+
     def cleanup_orphaned_scores(self):
         """Remove scores for users that no longer exist"""
         try:
-            original_count = len(self.quiz_game.scores.get("leaderboard", []))
-
-            # Filter leaderboard
-            self.quiz_game.scores["leaderboard"] = [
-                entry for entry in self.quiz_game.scores.get("leaderboard", [])
-                if entry.get("username") in self.auth_system.users
-            ]
-
-            removed_count = original_count - len(self.quiz_game.scores["leaderboard"])
+            # Filter game history
+            removed_count = self.storage.remove_games(
+                lambda entry: entry.get("username") not in self.auth_system.users
+            )
 
             # Recalculate stats
-            self._recalculate_all_stats()
+            self.quiz_game.recalculate_user_stats()
 
             self.quiz_game.save_scores()
 
             return True, f"Removed {removed_count} orphaned score entries"
         except Exception as e:
             return False, f"Cleanup failed: {e}"
-
-    def _recalculate_all_stats(self):
-        """Recalculate all user statistics"""
-        # Reset user stats
-        self.quiz_game.scores["user_stats"] = {}
-
-        # Aggregate from leaderboard
-        for entry in self.quiz_game.scores.get("leaderboard", []):
-            username = entry.get("username")
-            if not username:
-                continue
-
-            if username not in self.quiz_game.scores["user_stats"]:
-                self.quiz_game.scores["user_stats"][username] = {
-                    "total_games": 0,
-                    "total_score": 0,
-                    "average_score": 0
-                }
-
-            stats = self.quiz_game.scores["user_stats"][username]
-            stats["total_games"] += 1
-            stats["total_score"] += entry.get("score", 0)
-
-        # Calculate averages
-        for username, stats in self.quiz_game.scores["user_stats"].items():
-            if stats["total_games"] > 0:
-                stats["average_score"] = stats["total_score"] / stats["total_games"]
-
-        # Update auth system
-        for username in self.auth_system.users:
-            if username in self.quiz_game.scores["user_stats"]:
-                stats = self.quiz_game.scores["user_stats"][username]
-                self.auth_system.users[username]["games_played"] = stats["total_games"]
-                self.auth_system.users[username]["total_score"] = stats["total_score"]
-
-        self.auth_system.save_users()
\ No newline at end of file
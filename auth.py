@@ -3,42 +3,84 @@ Authentication module for GameMaster Quiz
 Handles user registration and login with password hashing
 """
 
-import json
-import hashlib
-import os
-
-DATA_FILE = "data/users.json"
+import threading
+from passwords import hash_password, hash_pool, needs_rehash, verify_password
+from storage import JSONStorage
+from tokens import TokenManager
 
 class UserAuth:
     """Handles user authentication and registration"""
     
-    def __init__(self):
+    def __init__(self, storage=None, persistence=None, tokens=None):
         """Initialize authentication system"""
-        self.users = self.load_users()
+        self.storage = storage or JSONStorage()
+        self.tokens = tokens or TokenManager()
+        self._users = None
+        self.users_lock = threading.Lock()
+        self.dirty_users = set()
+        self.stats_source = None
+        self.persistence = persistence
+        if persistence:
+            persistence.register("users", self.flush_users)
+    
+    @property
+    def users(self):
+        """All users, loaded on first use"""
+        if self._users is None:
+            with self.users_lock:
+                if self._users is None:
+                    self._users = self.load_users()
+        return self._users
+    
+    @users.setter
+    def users(self, users):
+        """Replace all users"""
+        self._users = users
     
     def load_users(self):
-        """Load users from JSON file"""
-        if os.path.exists(DATA_FILE):
-            try:
-                with open(DATA_FILE, 'r') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, FileNotFoundError):
-                return {}
-        return {}
+        """Load users from storage"""
+        users = self.storage.load_users()
+        
+        # Stats live in the scores store; drop copies written by older versions
+        for user_data in users.values():
+            user_data.pop("games_played", None)
+            user_data.pop("total_score", None)
+        return users
     
     def save_users(self):
-        """Save users to JSON file"""
-        os.makedirs(os.path.dirname(DATA_FILE), exist_ok=True)
-        with open(DATA_FILE, 'w') as f:
-            json.dump(self.users, f, indent=2)
+        """Save all users to storage"""
+        self.dirty_users.clear()
+        self.storage.save_users(self.users)
+    
+    def save_user(self, username):
+        """Save a single user to storage"""
+        self.storage.save_user(username, self.users)
+    
+    def mark_dirty(self, username):
+        """Record a changed user; it is saved on the next flush"""
+        self.dirty_users.add(username)
+        if self.persistence:
+            self.persistence.mark_dirty("users")
+        else:
+            self.flush_users()
+    
+    def flush_users(self):
+        """Save the users changed since the last flush"""
+        changed, self.dirty_users = self.dirty_users, set()
+        if changed:
+            # Copy so a flush from a timer thread never sees the dict resize
+            self.storage.save_users(dict(self.users), changed)
     
     def hash_password(self, password):
-        """Hash password using SHA-256 with salt"""
-        salt = "gamesalt2024"
-        return hashlib.sha256((password + salt).encode()).hexdigest()
+        """Hash password with a per-user salt and the configured KDF"""
+        return hash_password(password)
     
-    def register(self, username, password):
-        """Register a new user"""
+    def hash_password_async(self, password):
+        """Hash password in the worker pool; returns a Future of the hash"""
+        return hash_pool().submit(hash_password, password)
+    
+    def validate_registration(self, username, password):
+        """Check a new username and password before hashing"""
         if username in self.users:
             return False, "Username already exists"
         
@@ -48,37 +90,89 @@ class UserAuth:
         if len(password) < 4:
             return False, "Password must be at least 4 characters"
         
-        # Hash the password before storing
-        hashed_password = self.hash_password(password)
+        return True, ""
+    
+    def create_user(self, username, password_hash):
+        """Store a new user with an already computed password hash"""
+        # Checked again: another registration may have finished while hashing
+        if username in self.users:
+            return False, "Username already exists"
+        
         self.users[username] = {
-            "password_hash": hashed_password,
-            "games_played": 0,
-            "total_score": 0
+            "password_hash": password_hash
         }
         
-        self.save_users()
+        self.save_user(username)
         return True, "Registration successful"
     
-    def login(self, username, password):
-        """Authenticate a user"""
+    def register(self, username, password):
+        """Register a new user"""
+        valid, message = self.validate_registration(username, password)
+        if not valid:
+            return False, message
+        
+        # Hash the password before storing
+        return self.create_user(username, self.hash_password(password))
+    
+    def check_password(self, username, password):
+        """Verify a password without changing state; returns (matches, upgraded_hash)"""
+        user_data = self.users.get(username)
+        if user_data is None:
+            return False, None
+        
+        stored_hash = user_data["password_hash"]
+        if not verify_password(password, stored_hash):
+            return False, None
+        
+        # Legacy and outdated hashes are replaced while the password is at hand
+        if needs_rehash(stored_hash):
+            return True, hash_password(password)
+        return True, None
+    
+    def check_password_async(self, username, password):
+        """Verify a password in the worker pool; returns a Future for finish_login"""
+        return hash_pool().submit(self.check_password, username, password)
+    
+    def finish_login(self, username, result):
+        """Complete a login from a check_password result"""
         if username not in self.users:
             return False, "User not found"
         
-        hashed_password = self.hash_password(password)
-        if self.users[username]["password_hash"] == hashed_password:
-            return True, "Login successful"
+        matches, upgraded_hash = result
+        if not matches:
+            return False, "Incorrect password"
         
-        return False, "Incorrect password"
+        if upgraded_hash:
+            self.users[username]["password_hash"] = upgraded_hash
+            self.mark_dirty(username)
+        return True, "Login successful"
     
-    def get_user_stats(self, username):
-        """Get user statistics"""
+    def login(self, username, password):
+        """Authenticate a user"""
+        return self.finish_login(username, self.check_password(username, password))
+    
+    def create_session(self, username):
+        """Issue a session token for a user who just logged in"""
+        return self.tokens.issue(username)
+    
+    def authenticate(self, token):
+        """Get the user of a session token without hashing, or None"""
+        username = self.tokens.verify(token)
         if username in self.users:
-            return self.users[username]
+            return username
         return None
     
-    def update_user_stats(self, username, games_played, total_score):
-        """Update user statistics"""
-        if username in self.users:
-            self.users[username]["games_played"] = games_played
-            self.users[username]["total_score"] = total_score
-            self.save_users()
\ No newline at end of file
+    def logout(self, token):
+        """Revoke a session token"""
+        self.tokens.revoke(token)
+    
+    def get_user_stats(self, username):
+        """Get user statistics, read through from the scores store"""
+        if username not in self.users:
+            return None
+        
+        stats = (self.stats_source(username) if self.stats_source else None) or {}
+        return {
+            "games_played": stats.get("total_games", 0),
+            "total_score": stats.get("total_score", 0)
+        }
\ No newline at end of file
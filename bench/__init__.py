@@ -0,0 +1,4 @@
+"""
+Benchmarks for GameMaster Quiz
+Run from the project root, e.g. python -m bench.password_hash
+"""
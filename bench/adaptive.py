@@ -0,0 +1,61 @@
+"""
+Adaptive difficulty benchmark
+Times building the rating index and picking and rating questions in it, for a small and a 100k-question bank
+"""
+
+import argparse
+import random
+import sys
+import time
+from array import array
+
+from adaptive import AdaptivePlay, RatingIndex
+from bench.common import add_baseline_arguments, report, summarize
+
+
+def play_games(index, games, per_game, rng):
+    """Play adaptive games against random-skill players; returns (pick, update) latencies"""
+    pick_times, update_times = [], []
+    for _ in range(games):
+        play = AdaptivePlay(index, rng, 10)
+        skill = rng.gauss(1500, 200)
+        for _ in range(per_game):
+            start = time.perf_counter()
+            question = play.next_question()
+            pick_times.append(time.perf_counter() - start)
+
+            # The player beats a question as often as Elo says they should against its hidden difficulty
+            difficulty = 1000 + 1000 * question / len(index)
+            is_correct = rng.random() < 1 / (1 + 10 ** ((difficulty - skill) / 400))
+            start = time.perf_counter()
+            play.answer(question, is_correct)
+            update_times.append(time.perf_counter() - start)
+    return pick_times, update_times
+
+
+def main(argv=None):
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark the adaptive difficulty index")
+    parser.add_argument("--questions", type=int, nargs="+", default=[1000, 100000])
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--per-game", type=int, default=10)
+    add_baseline_arguments(parser)
+    args = parser.parse_args(argv)
+
+    results = []
+    for questions in args.questions:
+        rng = random.Random(1)
+        ratings = array('d', (rng.gauss(1500, 250) for _ in range(questions)))
+        start = time.perf_counter()
+        index = RatingIndex(ratings)
+        build_time = time.perf_counter() - start
+        print(f"{questions:,} questions in {len(index.keys)} buckets, index built in {build_time * 1000:.0f} ms")
+
+        pick_times, update_times = play_games(index, args.games, args.per_game, rng)
+        results.append(summarize(f"adaptive.pick_{questions}", pick_times))
+        results.append(summarize(f"adaptive.update_{questions}", update_times))
+    return report("adaptive", vars(args), results, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""
+Shared helpers for the benchmarks
+Synthetic data directories, latency summaries and JSON baselines
+"""
+
+import hashlib
+import json
+import os
+import platform
+import random
+import time
+
+from durable import write_json_atomic
+from passwords import LEGACY_SALT
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+
+def make_dataset(data_dir, users=1000, quizzes=10, questions=10, games_per_user=2, seed=1):
+    """Fill data_dir with synthetic users, score stats and custom quizzes"""
+    rng = random.Random(seed)
+    os.makedirs(os.path.join(data_dir, "quizzes", "custom"), exist_ok=True)
+
+    # Legacy-format hashes: one SHA-256 each keeps generating a million users cheap
+    user_names = [f"player{i}" for i in range(users)]
+    hashed = hashlib.sha256(("password" + LEGACY_SALT).encode()).hexdigest()
+    write_json_atomic(os.path.join(data_dir, "users.json"),
+                      {name: {"password_hash": hashed} for name in user_names}, indent=None)
+
+    user_stats = {}
+    for name in user_names:
+        total = sum(rng.randrange(0, questions + 1) * 10 for _ in range(games_per_user))
+        user_stats[name] = {"total_games": games_per_user, "total_score": total,
+                            "average_score": total / games_per_user}
+    write_json_atomic(os.path.join(data_dir, "scores.json"),
+                      {"leaderboard": [], "user_stats": user_stats}, indent=None)
+
+    quiz_names = []
+    for q in range(quizzes):
+        name = f"bench_quiz_{q}"
+        quiz_names.append(name)
+        write_json_atomic(os.path.join(data_dir, "quizzes", "custom", f"{name}.json"), {
+            "category": "CUSTOM",
+            "description": f"Synthetic quiz {q}",
+            "created_by": "bench",
+            "questions": [
+                {
+                    "question": f"Synthetic question {q}-{i}?",
+                    "options": [f"Option {o}" for o in range(4)],
+                    "correct_answer": rng.randrange(4)
+                }
+                for i in range(questions)
+            ]
+        })
+    return user_names, quiz_names
+
+
+def bytes_written():
+    """Get the bytes this process has written so far, or None if unknown"""
+    try:
+        with open("/proc/self/io", "r") as f:
+            for line in f:
+                if line.startswith("wchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def summarize(name, latencies, elapsed=None, extra=None):
+    """Summarize per-operation latencies in seconds; throughput defaults to their sum"""
+    if elapsed is None:
+        elapsed = sum(latencies)
+    ordered = sorted(latencies)
+    count = len(ordered)
+
+    def percentile(p):
+        return ordered[min(count - 1, int(p / 100 * count))] * 1000 if count else 0
+
+    result = {
+        "name": name,
+        "ops": count,
+        "ops_per_sec": count / elapsed if elapsed > 0 else 0,
+        "p50_ms": percentile(50),
+        "p99_ms": percentile(99)
+    }
+    result.update(extra or {})
+    return result
+
+
+def print_result(result):
+    """Print one result line"""
+    line = (f"{result['name']:<28} {result['ops_per_sec']:>10.1f} ops/s   "
+            f"p50 {result['p50_ms']:8.3f} ms   p99 {result['p99_ms']:8.3f} ms")
+    if result.get("bytes_per_op") is not None:
+        line += f"   {result['bytes_per_op']:,.0f} B/op"
+    print(line)
+
+
+def save_baseline(name, config, results, path=None):
+    """Write results to a JSON baseline file"""
+    path = path or os.path.join(BASELINE_DIR, f"{name}.json")
+    write_json_atomic(path, {
+        "benchmark": name,
+        "recorded": time.strftime("%Y-%m-%d %H:%M"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "config": config,
+        "results": results
+    })
+    print(f"Baseline saved to {path}")
+
+
+def compare_baseline(name, results, path=None, tolerance=0.2):
+    """Print changes against a saved baseline; returns False on a regression"""
+    path = path or os.path.join(BASELINE_DIR, f"{name}.json")
+    try:
+        with open(path, "r") as f:
+            baseline = {r["name"]: r for r in json.load(f)["results"]}
+    except (OSError, json.JSONDecodeError, KeyError):
+        print(f"No baseline at {path}")
+        return True
+
+    ok = True
+    for result in results:
+        old = baseline.get(result["name"])
+        if not old or not old["ops_per_sec"]:
+            continue
+        change = result["ops_per_sec"] / old["ops_per_sec"] - 1
+        flag = ""
+        if change < -tolerance:
+            flag = "  REGRESSION"
+            ok = False
+        print(f"{result['name']:<28} {change:+7.1%} ops/s vs baseline{flag}")
+    return ok
+
+
+def add_baseline_arguments(parser):
+    """Add the --save-baseline and --compare options"""
+    parser.add_argument("--save-baseline", action="store_true", help="record results in bench/baselines/")
+    parser.add_argument("--compare", action="store_true", help="compare results with the saved baseline")
+
+
+def report(name, config, results, args):
+    """Print results and handle baseline options; returns the exit code"""
+    for result in results:
+        print_result(result)
+    if args.save_baseline:
+        config = {key: value for key, value in config.items() if key not in ("save_baseline", "compare")}
+        save_baseline(name, config, results)
+    if args.compare and not compare_baseline(name, results):
+        return 1
+    return 0
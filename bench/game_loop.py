@@ -0,0 +1,132 @@
+"""
+Game loop benchmark
+Drives synthetic players through load_quiz -> submit_answer -> save_score
+"""
+
+import argparse
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from bench.common import add_baseline_arguments, bytes_written, make_dataset, report, summarize
+from game_sessions import SessionManager
+from persistence import PersistenceManager
+from quiz_cache import QuizCache
+from quiz_logic import QuizGame
+from storage import JSONStorage, SQLiteStorage, migrate
+
+
+def open_bench_storage(backend, data_dir):
+    """Open the dataset with its own quiz cache, converting it to SQLite if asked"""
+    storage = JSONStorage(data_dir, quiz_cache=QuizCache())
+    if backend == "sqlite":
+        target = SQLiteStorage(f"{data_dir}/bench.db")
+        migrate(storage, target)
+        storage = target
+    return storage
+
+
+def run_single(game, users, quizzes, games, rng):
+    """Play games one after another through the QuizGame API the GUI uses"""
+    load_times, answer_times, game_times = [], [], []
+    for _ in range(games):
+        start = time.perf_counter()
+        game.current_user = rng.choice(users)
+        game.load_quiz("custom", rng.choice(quizzes))
+        load_times.append(time.perf_counter() - start)
+
+        # The last answer also saves the score
+        while not game.is_quiz_complete():
+            answer_start = time.perf_counter()
+            game.submit_answer(rng.randrange(4))
+            answer_times.append(time.perf_counter() - answer_start)
+        game_times.append(time.perf_counter() - start)
+    return load_times, answer_times, game_times
+
+
+def run_concurrent(game, users, quizzes, games, concurrency, rng):
+    """Keep concurrency games in flight, answering one question per game in turn"""
+    sessions = SessionManager(game)
+    load_times, answer_times, game_times = [], [], []
+    started = 0
+    active = []
+
+    while active or started < games:
+        while len(active) < concurrency and started < games:
+            start = time.perf_counter()
+            session = sessions.start(rng.choice(users), "custom", rng.choice(quizzes))
+            load_times.append(time.perf_counter() - start)
+            active.append((session, start))
+            started += 1
+
+        still_active = []
+        for session, game_start in active:
+            answer_start = time.perf_counter()
+            sessions.answer(session.session_id, rng.randrange(4))
+            answer_times.append(time.perf_counter() - answer_start)
+            if session.is_complete():
+                game_times.append(time.perf_counter() - game_start)
+            else:
+                still_active.append((session, game_start))
+        active = still_active
+    return load_times, answer_times, game_times
+
+
+def main(argv=None):
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark the quiz game loop")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--quizzes", type=int, default=10)
+    parser.add_argument("--questions", type=int, default=10, help="questions per quiz")
+    parser.add_argument("--games", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=1, help="games in flight at once")
+    parser.add_argument("--backend", choices=["json", "sqlite"], default="json")
+    parser.add_argument("--coalesce", action="store_true", help="defer snapshots with a PersistenceManager")
+    parser.add_argument("--seed", type=int, default=1)
+    add_baseline_arguments(parser)
+    args = parser.parse_args(argv)
+
+    data_dir = tempfile.mkdtemp(prefix="gamemaster-bench-")
+    try:
+        print(f"Generating {args.users} users and {args.quizzes} quizzes in {data_dir}")
+        users, quizzes = make_dataset(data_dir, args.users, args.quizzes, args.questions, seed=args.seed)
+        storage = open_bench_storage(args.backend, data_dir)
+
+        start = time.perf_counter()
+        persistence = PersistenceManager() if args.coalesce else None
+        game = QuizGame(storage=storage, persistence=persistence)
+        game.scores
+        startup = time.perf_counter() - start
+
+        rng = random.Random(args.seed)
+        written = bytes_written()
+        start = time.perf_counter()
+        if args.concurrency > 1:
+            load_times, answer_times, game_times = run_concurrent(
+                game, users, quizzes, args.games, args.concurrency, rng)
+        else:
+            load_times, answer_times, game_times = run_single(game, users, quizzes, args.games, rng)
+        if persistence:
+            persistence.shutdown()
+        elapsed = time.perf_counter() - start
+
+        bytes_per_game = None
+        if written is not None:
+            bytes_per_game = (bytes_written() - written) / args.games
+        storage.close()
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    print(f"Startup (load scores, build indexes): {startup * 1000:.1f} ms")
+    results = [
+        summarize("game_loop.load_quiz", load_times),
+        summarize("game_loop.submit_answer", answer_times),
+        summarize("game_loop.full_game", game_times, elapsed, {"bytes_per_op": bytes_per_game})
+    ]
+    return report(f"game_loop_{args.backend}", vars(args), results, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+Registration and login benchmark
+Runs UserAuth register/login through the password hashing pool at a given concurrency
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from auth import UserAuth
+from bench.common import add_baseline_arguments, make_dataset, report, summarize
+from storage import JSONStorage
+
+
+def timed(func, *args):
+    """Call func and return its latency in seconds"""
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def run(func, arguments, concurrency):
+    """Call func for every argument tuple with concurrency callers; returns (latencies, elapsed)"""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as callers:
+        latencies = list(callers.map(lambda call_args: timed(func, *call_args), arguments))
+    return latencies, time.perf_counter() - start
+
+
+def main(argv=None):
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark registration and login")
+    parser.add_argument("--users", type=int, default=1000, help="existing users in the dataset")
+    parser.add_argument("--ops", type=int, default=50, help="registrations and logins to run")
+    parser.add_argument("--concurrency", type=int, default=4, help="simultaneous callers")
+    add_baseline_arguments(parser)
+    args = parser.parse_args(argv)
+
+    data_dir = tempfile.mkdtemp(prefix="gamemaster-bench-")
+    try:
+        make_dataset(data_dir, args.users, quizzes=0)
+        auth = UserAuth(JSONStorage(data_dir))
+
+        # Callers block on the pool the way the GUI and the server wait on its futures
+        def register(username):
+            valid, _ = auth.validate_registration(username, "password")
+            if valid:
+                auth.create_user(username, auth.hash_password_async("password").result())
+
+        def login(username):
+            result = auth.check_password_async(username, "password").result()
+            auth.finish_login(username, result)
+
+        def session_check(token):
+            auth.authenticate(token)
+
+        names = [f"newplayer{i}" for i in range(args.ops)]
+        register_times, register_elapsed = run(register, [(n,) for n in names], args.concurrency)
+        login_times, login_elapsed = run(login, [(n,) for n in names], args.concurrency)
+        tokens = [(auth.create_session(n),) for n in names] * 100
+        token_times, token_elapsed = run(session_check, tokens, 1)
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    results = [
+        summarize("auth.register", register_times, register_elapsed),
+        summarize("auth.login", login_times, login_elapsed),
+        summarize("auth.session_token", token_times, token_elapsed)
+    ]
+    return report("login", vars(args), results, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+"""
+Password hashing benchmark
+Reports hashes per second on one thread and through the shared worker pool
+"""
+
+import argparse
+import os
+import time
+
+import passwords
+
+
+def measure(hash_count, workers):
+    """Hash hash_count passwords with the given number of workers; returns hashes per second"""
+    start = time.perf_counter()
+    if workers == 1:
+        for i in range(hash_count):
+            passwords.hash_password(f"password{i}")
+    else:
+        futures = [passwords.hash_pool().submit(passwords.hash_password, f"password{i}")
+                   for i in range(hash_count)]
+        for future in futures:
+            future.result()
+    return hash_count / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    """Run the benchmark and print the results"""
+    parser = argparse.ArgumentParser(description="Benchmark password hashing")
+    parser.add_argument("--count", type=int, default=20, help="hashes per measurement")
+    args = parser.parse_args(argv)
+
+    cores = os.cpu_count() or 1
+    print(f"Scheme: {passwords.hash_password('x').split('$')[0]}, cores: {cores}, "
+          f"pool workers: {passwords.HASH_WORKERS}")
+
+    single = measure(args.count, 1)
+    print(f"1 thread:   {single:8.1f} hashes/s  ({1000 / single:.1f} ms per hash)")
+
+    pooled = measure(args.count * passwords.HASH_WORKERS, passwords.HASH_WORKERS)
+    print(f"pool:       {pooled:8.1f} hashes/s  ({pooled / cores:.1f} per core)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Question bank benchmark
+Times game starts that sample a few questions from a very large bank, and the memory they use
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from bench.common import add_baseline_arguments, report, summarize
+from question_bank import add_bank
+from quiz_cache import QuizCache
+from quiz_logic import QuizGame
+from storage import JSONStorage
+
+
+def write_bank(path, questions, record_bytes, seed=1):
+    """Write a synthetic bank with records of roughly record_bytes each"""
+    rng = random.Random(seed)
+    padding = "x" * max(0, record_bytes - 120)
+    with open(path, 'w') as f:
+        for i in range(questions):
+            f.write(json.dumps({
+                "question": f"Bank question {i}? {padding}",
+                "options": [f"Answer {i}-{o}" for o in range(4)],
+                "correct_answer": rng.randrange(4)
+            }) + "\n")
+
+
+def main(argv=None):
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark game starts from a large question bank")
+    parser.add_argument("--questions", type=int, default=200000)
+    parser.add_argument("--record-bytes", type=int, default=1000)
+    parser.add_argument("--per-game", type=int, default=10)
+    parser.add_argument("--games", type=int, default=2000)
+    add_baseline_arguments(parser)
+    args = parser.parse_args(argv)
+
+    data_dir = tempfile.mkdtemp(prefix="gamemaster-bench-")
+    try:
+        source = os.path.join(data_dir, "source.jsonl")
+        write_bank(source, args.questions, args.record_bytes)
+        print(f"Generated a {os.path.getsize(source) / 1e6:.0f} MB bank of {args.questions} questions")
+
+        storage = JSONStorage(data_dir, quiz_cache=QuizCache())
+        start = time.perf_counter()
+        add_bank(storage, "bench_bank", source, args.per_game)
+        index_time = time.perf_counter() - start
+        os.remove(source)
+
+        game = QuizGame(storage=storage)
+        game.load_quiz("custom", "bench_bank")  # maps the bank and its index once
+
+        start_times = []
+        peaks = []
+        tracemalloc.start()
+        for _ in range(args.games):
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            start = time.perf_counter()
+            game.load_quiz("custom", "bench_bank")
+            questions = [game.current_questions[i] for i in game.question_order]
+            start_times.append(time.perf_counter() - start)
+            peaks.append(tracemalloc.get_traced_memory()[1] - base)
+            assert len(questions) == args.per_game
+        tracemalloc.stop()
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    print(f"Index build (one-off, on add): {index_time * 1000:.0f} ms")
+    peaks.sort()
+    median_peak = peaks[len(peaks) // 2] / 1024
+    print(f"Peak Python allocations per game start: median {median_peak:.1f} KiB, max {peaks[-1] / 1024:.1f} KiB")
+    results = [
+        summarize("question_bank.game_start", start_times, extra={"peak_alloc_kib": median_peak})
+    ]
+    return report("question_bank", vars(args), results, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+Question stats benchmark
+Times folding batches of answers into per-question counters and computing the admin report over them
+"""
+
+import argparse
+import random
+import sys
+import time
+
+import question_stats
+from bench.common import add_baseline_arguments, report, summarize
+from question_stats import AnswerBatch, QuizStats
+
+
+def make_batch(questions, games, per_game, rng):
+    """Build a batch of games answered by players of random skill"""
+    batch = AnswerBatch()
+    for _ in range(games):
+        skill = rng.random()
+        answers = []
+        for question in rng.sample(range(questions), per_game):
+            correct = question % 4
+            option = correct if rng.random() < skill else rng.randrange(3)
+            answers.append((question, option, correct, 4, rng.uniform(1000, 15000)))
+        batch.add_game(answers)
+    return batch
+
+
+def main(argv=None):
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark per-question answer stats")
+    parser.add_argument("--questions", type=int, default=100000)
+    parser.add_argument("--answers", type=int, default=2000000, help="answers folded in before the report")
+    parser.add_argument("--batch-games", type=int, default=5000)
+    parser.add_argument("--per-game", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    add_baseline_arguments(parser)
+    args = parser.parse_args(argv)
+
+    backend = "numpy" if question_stats.np is not None else "array (NumPy not installed)"
+    print(f"Counters backend: {backend}")
+    rng = random.Random(1)
+    batch = make_batch(args.questions, args.batch_games, args.per_game, rng)
+
+    stats = QuizStats(args.questions)
+    add_times = []
+    while len(add_times) * len(batch) < args.answers:
+        start = time.perf_counter()
+        stats.add(batch)
+        add_times.append(time.perf_counter() - start)
+    print(f"Folded {len(add_times) * len(batch):,} answers into {args.questions:,} questions")
+
+    report_times = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        result = stats.report()
+        report_times.append(time.perf_counter() - start)
+    flagged = sum(1 for never in result["never_chosen"] if never)
+    print(f"{flagged:,} questions have a distractor nobody chose")
+
+    answers_per_batch = len(batch)
+    results = [
+        summarize("question_stats.add_batch", add_times,
+                  extra={"answers_per_sec": answers_per_batch * len(add_times) / sum(add_times)}),
+        summarize("question_stats.report", report_times)
+    ]
+    return report("question_stats", dict(vars(args), backend=backend), results, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
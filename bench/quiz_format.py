@@ -0,0 +1,120 @@
+"""
+Quiz format benchmark
+Compares loading a large quiz from JSON against the compiled format: load time and resident memory
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench.common import add_baseline_arguments, report, summarize
+from durable import write_json_atomic
+from quiz_compiler import CompiledQuiz, decompile_quiz, write_compiled
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Each child loads the quiz once and plays one game's worth of questions; it prints the
+# load time and how much its resident set grew, in total and in private (anonymous) pages
+LOAD_GAME = """
+import json, sys, time
+from questions import compact_questions, question_order
+from quiz_compiler import CompiledQuiz
+
+def rss_kib():
+    with open("/proc/self/status") as f:
+        fields = dict(line.split(":", 1) for line in f)
+    return int(fields["VmRSS"].split()[0]), int(fields["RssAnon"].split()[0])
+
+fmt, path, per_game = sys.argv[1], sys.argv[2], int(sys.argv[3])
+before = rss_kib()
+start = time.perf_counter()
+if fmt == "json":
+    with open(path, "r") as f:
+        questions = compact_questions(json.load(f)["questions"])
+else:
+    questions = CompiledQuiz(path)
+played = [questions[i] for i in question_order(len(questions), sample=per_game)]
+elapsed = time.perf_counter() - start
+after = rss_kib()
+print(json.dumps({"seconds": elapsed, "rss_kib": after[0] - before[0], "anon_kib": after[1] - before[1]}))
+"""
+
+
+def make_quiz(questions, seed=1):
+    """Build a synthetic quiz in the JSON schema"""
+    rng = random.Random(seed)
+    return {
+        "category": "CUSTOM",
+        "description": "Synthetic quiz for the format benchmark",
+        "created_by": "bench",
+        "questions": [
+            {
+                "question": f"Synthetic question {i} about topic {rng.randrange(1000)}?",
+                "options": [f"Answer {i}-{o}" for o in range(3)] + ["None of the above"],
+                "correct_answer": rng.randrange(4)
+            }
+            for i in range(questions)
+        ]
+    }
+
+
+def load_in_child(fmt, path, per_game):
+    """Load a quiz in a fresh interpreter; returns (seconds, RSS growth, private RSS growth) in KiB"""
+    env = dict(os.environ, PYTHONPATH=PROJECT_DIR)
+    output = subprocess.run([sys.executable, "-c", LOAD_GAME, fmt, path, str(per_game)],
+                            env=env, check=True, capture_output=True, text=True).stdout
+    result = json.loads(output)
+    return result["seconds"], result["rss_kib"], result["anon_kib"]
+
+
+def main(argv=None):
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark the compiled quiz format against JSON")
+    parser.add_argument("--questions", type=int, default=50000)
+    parser.add_argument("--per-game", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    add_baseline_arguments(parser)
+    args = parser.parse_args(argv)
+
+    data_dir = tempfile.mkdtemp(prefix="gamemaster-bench-")
+    try:
+        json_path = os.path.join(data_dir, "bench_quiz.json")
+        quiz_data = make_quiz(args.questions)
+        write_json_atomic(json_path, quiz_data)
+        start = time.perf_counter()
+        compiled_path = write_compiled(json_path, quiz_data)
+        compile_time = time.perf_counter() - start
+
+        compiled = CompiledQuiz(compiled_path)
+        assert decompile_quiz(compiled) == quiz_data, "compile/decompile round trip changed the quiz"
+        compiled.close()
+
+        print(f"{args.questions} questions: JSON {os.path.getsize(json_path) / 1e6:.1f} MB, "
+              f"compiled {os.path.getsize(compiled_path) / 1e6:.1f} MB "
+              f"(compiled in {compile_time * 1000:.0f} ms)")
+
+        results = []
+        for fmt, path in (("json", json_path), ("compiled", compiled_path)):
+            runs = [load_in_child(fmt, path, args.per_game) for _ in range(args.repeat)]
+            rss = sorted(run[1] for run in runs)[len(runs) // 2]
+            anon = sorted(run[2] for run in runs)[len(runs) // 2]
+            results.append(summarize(f"quiz_format.load_{fmt}", [run[0] for run in runs],
+                                     extra={"rss_growth_kib": rss, "private_growth_kib": anon}))
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    # Mapped pages of the compiled file are shared page cache; private growth is what each process pays
+    for result in results:
+        print(f"{result['name']:<28} p50 {result['p50_ms']:8.2f} ms, RSS growth {result['rss_growth_kib']:.0f} KiB "
+              f"({result['private_growth_kib']:.0f} KiB private)")
+    return report("quiz_format", vars(args), results, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
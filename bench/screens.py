@@ -0,0 +1,174 @@
+"""
+Screen transition benchmark
+Times question-to-question transitions in the real Tk GUI and counts the widgets each one creates
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench.common import add_baseline_arguments, make_dataset, report, summarize
+
+XVFB_DISPLAY = ":99"
+
+
+def start_display():
+    """Make sure Tk has a display; returns (ok, Xvfb process or None)"""
+    if os.environ.get("DISPLAY"):
+        return True, None
+    if not shutil.which("Xvfb"):
+        return False, None
+
+    process = subprocess.Popen(["Xvfb", XVFB_DISPLAY, "-screen", "0", "1024x768x24", "-nolisten", "tcp"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    socket_path = f"/tmp/.X11-unix/X{XVFB_DISPLAY[1:]}"
+    deadline = time.monotonic() + 5
+    while not os.path.exists(socket_path):
+        if process.poll() is not None or time.monotonic() > deadline:
+            process.kill()
+            return False, None
+        time.sleep(0.05)
+    os.environ["DISPLAY"] = XVFB_DISPLAY
+    return True, process
+
+
+def widget_names(widget):
+    """Get the path names of a widget and all its descendants"""
+    names = {str(widget)}
+    for child in widget.winfo_children():
+        names |= widget_names(child)
+    return names
+
+
+def drop_screens(app):
+    """Destroy the cached screens so the next show rebuilds them, like before caching"""
+    for frame, _ in app.screens.values():
+        frame.destroy()
+    app.screens.clear()
+
+
+def run_transitions(app, quiz, transitions, rebuild):
+    """Answer questions and time each redraw of the question screen"""
+    latencies = []
+    created = 0
+    app.quiz_game.load_quiz("custom", quiz)
+    app.show_quiz_question()
+    app.root.update()
+
+    for _ in range(transitions):
+        answered, total = app.quiz_game.get_progress()
+        if answered + 1 >= total:
+            # Restart before the last answer so no score is saved mid-run
+            app.quiz_game.load_quiz("custom", quiz)
+        else:
+            app.quiz_game.submit_answer(0)
+
+        before = widget_names(app.root)
+        start = time.perf_counter()
+        if rebuild:
+            drop_screens(app)
+        app.show_quiz_question()
+        app.root.update()
+        latencies.append(time.perf_counter() - start)
+        created += len(widget_names(app.root) - before)
+    return latencies, created
+
+
+def run_answers(app, quiz, answers):
+    """Time answering through the GUI: inline feedback, then the swap to the pre-rendered next question"""
+    latencies = []
+    created = 0
+    app.quiz_game.load_quiz("custom", quiz)
+    app.show_quiz_question()
+    app.root.update()
+
+    for _ in range(answers):
+        answered, total = app.quiz_game.get_progress()
+        if answered + 1 >= total:
+            app.quiz_game.load_quiz("custom", quiz)
+            app.show_quiz_question()
+            app.root.update()
+
+        before = widget_names(app.root)
+        start = time.perf_counter()
+        app.submit_answer(0)
+        app.root.update()
+        app.advance_question()
+        app.root.update()
+        latencies.append(time.perf_counter() - start)
+        created += len(widget_names(app.root) - before)
+    return latencies, created
+
+
+def run_navigation(app, rounds, rebuild):
+    """Time main menu <-> leaderboard selection round trips"""
+    latencies = []
+    created = 0
+    for _ in range(rounds):
+        for show in (app.show_leaderboard_selection, app.show_main_menu):
+            before = widget_names(app.root)
+            start = time.perf_counter()
+            if rebuild:
+                drop_screens(app)
+            show()
+            app.root.update()
+            latencies.append(time.perf_counter() - start)
+            created += len(widget_names(app.root) - before)
+    return latencies, created
+
+
+def main(argv=None):
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark GUI screen transitions (needs a display or Xvfb)")
+    parser.add_argument("--transitions", type=int, default=500)
+    parser.add_argument("--questions", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=100)
+    add_baseline_arguments(parser)
+    args = parser.parse_args(argv)
+
+    ok, xvfb = start_display()
+    if not ok:
+        print("No DISPLAY and Xvfb is not installed; skipping the screen benchmark")
+        return 0
+
+    data_dir = tempfile.mkdtemp(prefix="gamemaster-bench-")
+    cwd = os.getcwd()
+    try:
+        _, quiz_names = make_dataset(os.path.join(data_dir, "data"), users=10, quizzes=1,
+                                     questions=args.questions)
+        os.chdir(data_dir)
+        from interface import GameMasterApp
+
+        app = GameMasterApp()
+        app.current_user = app.quiz_game.current_user = "player0"
+        app.root.update()
+
+        results = []
+        for name, rebuild in (("cached", False), ("rebuild", True)):
+            latencies, created = run_transitions(app, quiz_names[0], args.transitions, rebuild)
+            results.append(summarize(f"screens.question_{name}", latencies,
+                                     extra={"widgets_created_per_op": created / len(latencies)}))
+            latencies, created = run_navigation(app, args.rounds, rebuild)
+            results.append(summarize(f"screens.menu_{name}", latencies,
+                                     extra={"widgets_created_per_op": created / len(latencies)}))
+        latencies, created = run_answers(app, quiz_names[0], args.transitions)
+        results.append(summarize("screens.answer_to_next", latencies,
+                                 extra={"widgets_created_per_op": created / len(latencies)}))
+        app.on_close()
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(data_dir, ignore_errors=True)
+        if xvfb:
+            xvfb.terminate()
+
+    for result in results:
+        print(f"{result['name']:<28} {result['widgets_created_per_op']:.1f} widgets created per transition")
+    return report("screens", vars(args), results, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
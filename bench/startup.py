@@ -0,0 +1,115 @@
+"""
+Startup benchmark
+Times a cold launch up to the login screen on a large data directory, plus -X importtime
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench.common import add_baseline_arguments, make_dataset, report, summarize
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TARGET_MS = 150
+
+# Everything GameMasterApp does before the login screen, minus the window itself
+HEADLESS_LAUNCH = """
+from storage import open_storage
+from auth import UserAuth
+from quiz_manager import QuizManager
+from quiz_logic import QuizGame
+from persistence import PersistenceManager
+storage = open_storage()
+persistence = PersistenceManager()
+auth = UserAuth(storage, persistence)
+QuizManager(storage)
+QuizGame(auth, storage, persistence=persistence)
+"""
+
+GUI_LAUNCH = """
+from interface import GameMasterApp
+app = GameMasterApp()
+app.root.update()
+app.root.destroy()
+"""
+
+FIRST_USE = HEADLESS_LAUNCH + """
+auth.users
+QuizGame(auth, storage).get_best_player()
+"""
+
+
+def time_launch(code, data_dir):
+    """Run code in a fresh interpreter inside data_dir; returns wall time in seconds"""
+    env = dict(os.environ, PYTHONPATH=PROJECT_DIR)
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], cwd=data_dir, env=env, check=True,
+                   stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def import_times(module, data_dir, top=8):
+    """Get the modules with the largest self import time as (name, microseconds)"""
+    env = dict(os.environ, PYTHONPATH=PROJECT_DIR)
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=data_dir, env=env, capture_output=True, text=True).stderr
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    total = max((cumulative for _, _, cumulative in rows), default=0)
+    return total, sorted(rows, key=lambda row: row[1], reverse=True)[:top]
+
+
+def main(argv=None):
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark application startup")
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--quizzes", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    add_baseline_arguments(parser)
+    args = parser.parse_args(argv)
+
+    data_dir = tempfile.mkdtemp(prefix="gamemaster-bench-")
+    try:
+        print(f"Generating {args.users} users and {args.quizzes} quizzes in {data_dir}")
+        make_dataset(os.path.join(data_dir, "data"), args.users, args.quizzes)
+
+        # The first launch seeds the default quizzes once
+        seeding = time_launch(HEADLESS_LAUNCH, data_dir)
+        print(f"First launch (default quiz migration): {seeding * 1000:.1f} ms")
+
+        results = [
+            summarize("startup.headless", [time_launch(HEADLESS_LAUNCH, data_dir) for _ in range(args.repeat)]),
+            summarize("startup.first_data_use", [time_launch(FIRST_USE, data_dir) for _ in range(args.repeat)])
+        ]
+        gui_module = "quiz_logic"
+        if os.environ.get("DISPLAY"):
+            results.append(summarize("startup.login_screen",
+                                     [time_launch(GUI_LAUNCH, data_dir) for _ in range(args.repeat)]))
+            gui_module = "interface"
+        else:
+            print("DISPLAY is not set; skipping the login screen measurement (try xvfb-run)")
+
+        total, slowest = import_times(gui_module, data_dir)
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    print(f"import {gui_module}: {total / 1000:.1f} ms; slowest modules (self time):")
+    for name, self_us, cumulative_us in slowest:
+        print(f"  {name:<30} {self_us / 1000:6.1f} ms  (cumulative {cumulative_us / 1000:.1f} ms)")
+
+    launch = results[-1] if results[-1]["name"] == "startup.login_screen" else results[0]
+    verdict = "within" if launch["p50_ms"] <= TARGET_MS else "over"
+    print(f"{launch['name']} p50 {launch['p50_ms']:.1f} ms is {verdict} the {TARGET_MS} ms target")
+    return report("startup", vars(args), results, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
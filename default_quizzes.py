@@ -0,0 +1,100 @@
+"""
+Default quizzes for GameMaster Quiz
+Seeded once into a new data directory
+"""
+
+DEFAULT_QUIZZES = {
+    "history": {
+        "category": "HISTORY",
+        "description": "Test your knowledge of gaming history",
+        "questions": [
+            {
+                "question": "Which company created the first commercially successful video game 'Pong'?",
+                "options": ["Nintendo", "Atari", "Sega", "Microsoft"],
+                "correct_answer": 1
+            },
+            {
+                "question": "What year was the original PlayStation released?",
+                "options": ["1992", "1994", "1996", "1998"],
+                "correct_answer": 1
+            },
+            {
+                "question": "Which game is credited with popularizing the battle royale genre?",
+                "options": ["Fortnite", "PUBG", "Apex Legends", "Call of Duty: Warzone"],
+                "correct_answer": 1
+            },
+            {
+                "question": "What was the first video game to feature a save function?",
+                "options": ["The Legend of Zelda", "Super Mario Bros.", "Final Fantasy", "Metroid"],
+                "correct_answer": 0
+            },
+            {
+                "question": "Which console was the first to use CDs instead of cartridges?",
+                "options": ["Sega Saturn", "PlayStation", "Sega CD", "Nintendo 64"],
+                "correct_answer": 2
+            }
+        ]
+    },
+    "characters": {
+        "category": "CHARACTERS",
+        "description": "How well do you know gaming characters?",
+        "questions": [
+            {
+                "question": "Which character is known for saying 'It's-a me!'?",
+                "options": ["Sonic", "Mario", "Link", "Pikachu"],
+                "correct_answer": 1
+            },
+            {
+                "question": "What is the name of the protagonist in The Legend of Zelda series?",
+                "options": ["Zelda", "Link", "Ganon", "Epona"],
+                "correct_answer": 1
+            },
+            {
+                "question": "Which character is a blue hedgehog?",
+                "options": ["Mario", "Sonic", "Crash Bandicoot", "Spyro"],
+                "correct_answer": 1
+            },
+            {
+                "question": "What is the name of the main character in the Halo series?",
+                "options": ["Master Chief", "Commander Shepard", "Samus Aran", "Gordon Freeman"],
+                "correct_answer": 0
+            },
+            {
+                "question": "Which character uses a crowbar as their primary weapon?",
+                "options": ["Duke Nukem", "Gordon Freeman", "Solid Snake", "Lara Croft"],
+                "correct_answer": 1
+            }
+        ]
+    },
+    "mechanics": {
+        "category": "MECHANICS",
+        "description": "Test your knowledge of game mechanics",
+        "questions": [
+            {
+                "question": "What does 'DPS' stand for in gaming?",
+                "options": ["Damage Per Second", "Defense Point System", "Digital Play Style", "Double Player Score"],
+                "correct_answer": 0
+            },
+            {
+                "question": "What is a 'speedrun'?",
+                "options": ["Completing a game as fast as possible", "Playing with increased movement speed", "A type of racing game", "A game bug"],
+                "correct_answer": 0
+            },
+            {
+                "question": "What does 'NPC' stand for?",
+                "options": ["Non-Player Character", "New Player Character", "Network Play Control", "Non-Playable Content"],
+                "correct_answer": 0
+            },
+            {
+                "question": "What is 'respawning' in games?",
+                "options": ["Repeating a level", "A character coming back to life after death", "Saving the game", "A type of power-up"],
+                "correct_answer": 1
+            },
+            {
+                "question": "What does 'MMO' stand for?",
+                "options": ["Massive Multiplayer Online", "Multiple Mode Operation", "Main Mission Objective", "Multiplayer Match Online"],
+                "correct_answer": 0
+            }
+        ]
+    }
+}
@@ -0,0 +1,166 @@
+"""
+Durable file writes for GameMaster Quiz
+Crash-safe file replacement and fsynced appends with optional group commit
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+
+
+def _fsync_directory(directory):
+    """Persist a rename or file creation inside directory"""
+    if os.name != "posix":
+        return
+    fd = os.open(directory or ".", os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_path(path):
+    """Flush a file's data to disk through a fresh descriptor"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _replace_atomic(path, mode, write):
+    """Write a temp file with write(f), fsync it and rename it over path"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    # A crash leaves either the old file or the new one, never a truncated mix
+    fd, temp_path = tempfile.mkstemp(dir=directory or ".", prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode) as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    _fsync_directory(directory)
+
+
+def write_json_atomic(path, data, indent=2, **dump_options):
+    """Write JSON to a temp file, fsync it and rename it over path"""
+    _replace_atomic(path, 'w', lambda f: json.dump(data, f, indent=indent, **dump_options))
+
+
+def write_bytes_atomic(path, data):
+    """Write bytes to a temp file, fsync it and rename it over path"""
+    _replace_atomic(path, 'wb', lambda f: f.write(data))
+
+
+class GroupCommit:
+    """Coalesces fsyncs of appends that arrive within a short window"""
+
+    def __init__(self, window=0.01):
+        """Initialize group commit with a window in seconds"""
+        self.window = window
+        self.cond = threading.Condition()
+        self.dirty = set()
+        self.new_files = set()
+        self.next_generation = 1
+        self.completed_generation = 0
+        self.thread = None
+
+    def append(self, path, text):
+        """Append text and return once a group fsync has covered it"""
+        with self.cond:
+            created = not os.path.exists(path)
+            with open(path, 'a') as f:
+                f.write(text)
+            self.dirty.add(path)
+            if created:
+                self.new_files.add(path)
+            target = self.next_generation
+
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="group-commit", daemon=True)
+                self.thread.start()
+            self.cond.notify_all()
+
+            while self.completed_generation < target:
+                self.cond.wait()
+
+    def _run(self):
+        """Background loop that fsyncs each batch of dirty files once"""
+        while True:
+            with self.cond:
+                while not self.dirty:
+                    self.cond.wait()
+
+            # Let more writers join this commit
+            time.sleep(self.window)
+
+            with self.cond:
+                generation = self.next_generation
+                self.next_generation += 1
+                batch, self.dirty = self.dirty, set()
+                created, self.new_files = self.new_files, set()
+
+            for path in batch:
+                try:
+                    _fsync_path(path)
+                except FileNotFoundError:
+                    continue
+            for directory in {os.path.dirname(path) for path in created}:
+                _fsync_directory(directory)
+
+            with self.cond:
+                self.completed_generation = generation
+                self.cond.notify_all()
+
+
+_group_commit = None
+
+
+def enable_group_commit(window_ms=10):
+    """Share fsyncs between appends arriving within window_ms"""
+    global _group_commit
+    _group_commit = GroupCommit(window_ms / 1000.0)
+
+
+def disable_group_commit():
+    """Fsync every append on its own"""
+    global _group_commit
+    _group_commit = None
+
+
+def append_line(path, line):
+    """Durably append one line of text to path"""
+    append_lines(path, [line])
+
+
+def append_lines(path, lines):
+    """Durably append lines of text to path with a single fsync"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    text = "".join(line + "\n" for line in lines)
+
+    if _group_commit is not None:
+        _group_commit.append(path, text)
+        return
+
+    created = not os.path.exists(path)
+    with open(path, 'a') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    if created:
+        _fsync_directory(directory)
+
+
+if os.environ.get("GAMEMASTER_GROUP_COMMIT_MS"):
+    enable_group_commit(float(os.environ["GAMEMASTER_GROUP_COMMIT_MS"]))
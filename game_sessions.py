@@ -0,0 +1,165 @@
+"""
+Game sessions for GameMaster Quiz
+Many concurrent games in one process on top of a shared QuizGame score store
+"""
+
+import itertools
+import threading
+import time
+from collections import OrderedDict
+
+from adaptive import AdaptivePlay
+from questions import empty_order, question_order, question_rng
+from quiz_logic import POINTS_PER_QUESTION, quiz_label
+
+MAX_SESSIONS = 100000
+SESSION_IDLE_TIMEOUT = 1800
+
+
+class GameSession:
+    """One player's game in progress"""
+
+    # Sessions only hold a reference to the shared question tuple and their own order
+    __slots__ = ("session_id", "username", "quiz", "quiz_key", "questions", "order", "position", "score",
+                 "answers", "adaptive", "last_active")
+
+    def __init__(self, session_id, username, quiz, questions, order, quiz_key=None, adaptive=None):
+        """Initialize game session; adaptive games fill in their order as they go"""
+        self.session_id = session_id
+        self.username = username
+        self.quiz = quiz
+        self.quiz_key = quiz_key
+        self.questions = questions
+        self.order = order
+        self.position = 0
+        self.score = 0
+        self.answers = []
+        self.adaptive = adaptive
+        self.last_active = time.monotonic()
+
+    def current_question(self):
+        """Get the current question, or None when the game is over"""
+        if self.position < len(self.order):
+            return self.questions[self.order[self.position]]
+        return None
+
+    def is_complete(self):
+        """Check if every question has been answered"""
+        return self.position >= len(self.order)
+
+    def progress(self):
+        """Get (answered, total) questions"""
+        return self.position, len(self.order)
+
+    def answer(self, answer_index):
+        """Answer the current question; returns (is_correct, correct_answer)"""
+        question = self.current_question()
+        if question is None:
+            return False, None
+
+        is_correct = answer_index == question.correct_answer
+        question_index = self.order[self.position]
+        if self.adaptive:
+            self.score += self.adaptive.answer(question_index, is_correct)
+        elif is_correct:
+            self.score += POINTS_PER_QUESTION
+
+        # Time to answer is measured from the previous answer, or the start of the game
+        now = time.monotonic()
+        self.answers.append((question_index, answer_index, question.correct_answer,
+                             len(question.options), (now - self.last_active) * 1000))
+        self.position += 1
+        if self.adaptive and not self.is_complete():
+            self.order[self.position] = self.adaptive.next_question()
+        self.last_active = now
+        return is_correct, question.correct_answer
+
+
+class SessionManager:
+    """Hands out game sessions and records finished games in the shared QuizGame"""
+
+    def __init__(self, quiz_game, max_sessions=MAX_SESSIONS, idle_timeout=SESSION_IDLE_TIMEOUT):
+        """Initialize session manager"""
+        self.quiz_game = quiz_game
+        self.storage = quiz_game.storage
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.sessions = OrderedDict()
+        self.lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def start(self, username, category, custom_quiz=None, sample=None, seed=None, adaptive=False):
+        """Start a game for username; returns the session or None if the quiz can't be loaded"""
+        quiz_name = custom_quiz if custom_quiz else category.lower()
+        questions = self.storage.load_questions(quiz_name, is_custom=bool(custom_quiz))
+        if questions is None:
+            return None
+        if sample is None:
+            sample = getattr(questions, "per_game", None)
+
+        if adaptive:
+            length = len(questions) if sample is None else min(sample, len(questions))
+            index = self.quiz_game.question_ratings.index(quiz_name, bool(custom_quiz), questions)
+            play = AdaptivePlay(index, question_rng(seed), POINTS_PER_QUESTION)
+            # Picks are written into the order one answer ahead of the player
+            order = empty_order(len(questions), length)
+            if length:
+                order[0] = play.next_question()
+        else:
+            play = None
+            order = question_order(len(questions), question_rng(seed), sample)
+        session = GameSession(next(self._ids), username, quiz_label(category, custom_quiz), questions, order,
+                              (quiz_name, bool(custom_quiz)), play)
+
+        with self.lock:
+            self.sessions[session.session_id] = session
+            self._expire_idle()
+            # Bounded memory: drop the least recently active games
+            while len(self.sessions) > self.max_sessions:
+                self.sessions.popitem(last=False)
+        return session
+
+    def get(self, session_id):
+        """Get an active session, or None"""
+        with self.lock:
+            session = self.sessions.get(session_id)
+            if session:
+                self.sessions.move_to_end(session_id)
+            return session
+
+    def answer(self, session_id, answer_index):
+        """Answer the current question of a session; returns (is_correct, correct_answer)"""
+        session = self.get(session_id)
+        if session is None:
+            return False, None
+
+        result = session.answer(answer_index)
+        if session.is_complete():
+            self.end(session_id)
+            self.record_answers(session)
+            self.quiz_game.record_game(session.username, session.quiz, session.score)
+        return result
+
+    def record_answers(self, session):
+        """Hand a finished session's answers to the answer stats"""
+        self.quiz_game.answer_stats.record_game(*session.quiz_key, session.questions, session.answers)
+        if session.adaptive:
+            self.quiz_game.question_ratings.changed(*session.quiz_key)
+
+    def end(self, session_id):
+        """Drop a session without recording it"""
+        with self.lock:
+            return self.sessions.pop(session_id, None)
+
+    def _expire_idle(self):
+        """Drop sessions idle for longer than the timeout; the caller holds the lock"""
+        cutoff = time.monotonic() - self.idle_timeout
+        while self.sessions:
+            session = next(iter(self.sessions.values()))
+            if session.last_active > cutoff:
+                break
+            self.sessions.popitem(last=False)
+
+    def __len__(self):
+        """Get the number of active sessions"""
+        return len(self.sessions)
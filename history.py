@@ -0,0 +1,135 @@
+"""
+Game history for GameMaster Quiz
+Keeps every finished game in append-only, per-day segment files
+"""
+
+import json
+import os
+from datetime import datetime
+
+from durable import append_line, append_lines
+
+HISTORY_DIR = "data/history"
+
+
+class GameHistory:
+    """Append-only log of every game, partitioned into one JSON-lines file per day"""
+
+    def __init__(self, history_dir=HISTORY_DIR):
+        """Initialize game history"""
+        self.history_dir = history_dir
+
+    def _segment_path(self, day):
+        """Get the segment file of a day (YYYY-MM-DD)"""
+        return os.path.join(self.history_dir, f"{day}.jsonl")
+
+    def segments(self, start_day=None, end_day=None):
+        """List (day, path) of all segments in date order, optionally within a day range"""
+        if not os.path.exists(self.history_dir):
+            return []
+        result = []
+        for filename in sorted(os.listdir(self.history_dir)):
+            if not filename.endswith('.jsonl'):
+                continue
+            day = filename[:-6]
+            if start_day and day < start_day:
+                continue
+            if end_day and day > end_day:
+                continue
+            result.append((day, os.path.join(self.history_dir, filename)))
+        return result
+
+    def append(self, entry):
+        """Append one game to the segment of its day"""
+        day = (entry.get("date") or datetime.now().strftime("%Y-%m-%d"))[:10]
+        append_line(self._segment_path(day), json.dumps(entry, separators=(',', ':')))
+
+    def append_many(self, entries):
+        """Append games in bulk with one fsync per day segment"""
+        by_day = {}
+        for entry in entries:
+            day = (entry.get("date") or datetime.now().strftime("%Y-%m-%d"))[:10]
+            by_day.setdefault(day, []).append(json.dumps(entry, separators=(',', ':')))
+        for day, lines in by_day.items():
+            append_lines(self._segment_path(day), lines)
+
+    def iter_games(self, start_day=None, end_day=None):
+        """Stream games one at a time without loading whole segments"""
+        for _, path in self.segments(start_day, end_day):
+            with open(path, 'r') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+
+    def has_games(self):
+        """Check if any game has been recorded"""
+        return any(os.path.getsize(path) > 0 for _, path in self.segments())
+
+    def remove(self, predicate):
+        """Rewrite segments without the games matching predicate; returns the number removed"""
+        removed = 0
+        for _, path in self.segments():
+            temp_path = path + ".tmp"
+            kept = 0
+            with open(path, 'r') as src, open(temp_path, 'w') as dst:
+                for line in src:
+                    stripped = line.strip()
+                    if not stripped:
+                        continue
+                    try:
+                        entry = json.loads(stripped)
+                    except json.JSONDecodeError:
+                        continue
+                    if predicate(entry):
+                        removed += 1
+                    else:
+                        dst.write(stripped + "\n")
+                        kept += 1
+                dst.flush()
+                os.fsync(dst.fileno())
+            if kept:
+                os.replace(temp_path, path)
+            else:
+                os.remove(temp_path)
+                os.remove(path)
+        return removed
+
+    def clear(self):
+        """Delete all segments"""
+        for _, path in self.segments():
+            os.remove(path)
+
+
+def legacy_records(scores, date=None):
+    """Build history records for stats that predate the game history"""
+    # Leaderboard entries are kept as they are; games that only survive as
+    # totals in user_stats become one carry-over record per user (quiz None,
+    # with a "games" count) so a rebuild from history keeps the current totals
+    date = date or datetime.now().strftime("%Y-%m-%d %H:%M")
+    records = []
+    covered = {}
+
+    for entry in scores.get("leaderboard", []):
+        records.append(dict(entry))
+        games, total = covered.get(entry["username"], (0, 0))
+        covered[entry["username"]] = (games + 1, total + entry["score"])
+
+    for username, stats in scores.get("user_stats", {}).items():
+        games, total = covered.get(username, (0, 0))
+        missing_games = stats.get("total_games", 0) - games
+        missing_score = stats.get("total_score", 0) - total
+        if missing_games > 0 or missing_score > 0:
+            records.append({
+                "username": username,
+                "score": missing_score,
+                "quiz": None,
+                "date": date,
+                "games": max(missing_games, 0)
+            })
+
+    return records
@@ -3,14 +3,20 @@ Graphical user interface for GameMaster Quiz
 Built with tkinter
 """
 
-import tkinter as tk
-import json
 import os
-from tkinter import ttk, messagebox, simpledialog
+import tkinter as tk
+from tkinter import ttk, messagebox, simpledialog, filedialog
 from auth import UserAuth
 from quiz_logic import QuizGame
 from quiz_manager import QuizManager
 from admin import AdminManager
+from persistence import PersistenceManager
+from tasks import TaskRunner
+from paged_table import PagedTable
+from ranking import sorted_page
+from storage import open_storage
+
+RAPID_FEEDBACK_MS = 600
 
 class GameMasterApp:
     """Main application class for GameMaster Quiz"""
@@ -30,13 +36,24 @@ class GameMasterApp:
         # Configure root window
         self.root.configure(bg=self.bg_color)
 
-        # Initialize components
-        self.auth = UserAuth()
-        self.quiz_manager = QuizManager()
-        self.quiz_game = QuizGame(self.auth)  # Pass auth system to quiz game
+        # Initialize components on the configured storage backend
+        self.storage = open_storage()
+        self.persistence = PersistenceManager(scheduler=self.schedule)
+        self.tasks = TaskRunner(self.root)
+        self.screen_generation = 0
+        self.screens = {}
+        self.front_card = 0
+        self.awaiting_next = False
+        self.rapid_mode = tk.BooleanVar(value=False)
+        self.adaptive_mode = tk.BooleanVar(value=False)
+        self.auth = UserAuth(self.storage, self.persistence)
+        self.quiz_manager = QuizManager(self.storage)
+        self.quiz_game = QuizGame(self.auth, self.storage, persistence=self.persistence)  # Pass auth system to quiz game
 
         # Current user
         self.current_user = None
+        self.session_token = None
+        self.auth_pending = False
 
         # Start with login screen
         self.show_login_screen()
@@ -101,7 +118,8 @@ class GameMasterApp:
             ("Reset Quiz Scores", self.reset_quiz_scores),
             ("Backup & Restore", self.show_backup_restore),
             ("View All Users", self.view_all_users),
-            ("View Statistics", self.view_statistics)
+            ("View Statistics", self.view_statistics),
+            ("Question Analytics", self.view_question_analytics)
         ]
 
         for i, (text, command) in enumerate(admin_functions):
@@ -156,8 +174,8 @@ class GameMasterApp:
         )
         warning_label.pack(pady=10, padx=20, fill="x")
 
-        # Get all quizzes
-        quizzes = self.quiz_manager.get_available_quizzes()
+        # Get all quizzes with their metadata from the catalog index
+        quizzes = self.quiz_manager.get_catalog()
 
         if not quizzes:
             tk.Label(
@@ -190,7 +208,8 @@ class GameMasterApp:
         scrollbar.pack(side="right", fill="y")
 
         # Display each quiz
-        for quiz_name, filepath, is_custom in quizzes:
+        for entry in quizzes:
+            quiz_name, filepath, is_custom = entry["name"], entry["location"], entry["is_custom"]
             quiz_frame = tk.Frame(
                 scrollable_frame,
                 bg="#f0e6ff",
@@ -203,17 +222,10 @@ class GameMasterApp:
             display_name = quiz_name.replace("_", " ").title()
             quiz_type = "Custom" if is_custom else "Default"
 
-            # Load quiz data to show details
-            try:
-                with open(filepath, 'r') as f:
-                    quiz_data = json.load(f)
-                question_count = len(quiz_data.get("questions", []))
-                description = quiz_data.get("description", "No description")
-                created_by = quiz_data.get("created_by", "System")
-            except:
-                question_count = 0
-                description = "Error loading quiz"
-                created_by = "Unknown"
+            # Quiz details
+            question_count = entry["question_count"]
+            description = entry["description"] or "No description"
+            created_by = entry["created_by"] or "System"
 
             # Quiz header
             header_frame = tk.Frame(quiz_frame, bg="#f0e6ff")
@@ -302,12 +314,21 @@ class GameMasterApp:
         """Edit an existing quiz"""
         # Load quiz data
         try:
-            with open(filepath, 'r') as f:
-                quiz_data = json.load(f)
+            quiz_data = self.quiz_manager.load_quiz(quiz_name, is_custom)
+            if quiz_data is None:
+                raise ValueError("quiz not found")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load quiz: {e}")
             return
 
+        # Bank questions live in a JSONL file too large for the editor
+        if quiz_data.get("question_bank"):
+            messagebox.showinfo("Question Bank",
+                                f"{quiz_name} is a question bank with {quiz_data.get('question_count', 0)} questions.\n\n"
+                                f"Edit data/banks/{quiz_data['question_bank']} directly; "
+                                "its index is rebuilt automatically on the next game.")
+            return
+
         # Create edit window
         edit_window = tk.Toplevel(self.root)
         edit_window.title(f"Edit Quiz: {quiz_name}")
@@ -554,16 +575,18 @@ class GameMasterApp:
 
             new_quiz_data["questions"] = questions
 
-            # Save to file
-            try:
-                with open(filepath, 'w') as f:
-                    json.dump(new_quiz_data, f, indent=2)
-
+            # Save to storage in the background
+            def saved(location):
                 messagebox.showinfo("Success", "Quiz saved successfully!")
-                edit_window.destroy()
+                if edit_window.winfo_exists():
+                    edit_window.destroy()
                 self.manage_quizzes()  # Refresh the list
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to save quiz: {e}")
+
+            def save_failed(error):
+                messagebox.showerror("Error", f"Failed to save quiz: {error}")
+
+            self.tasks.submit(self.quiz_manager.save_quiz, quiz_name, new_quiz_data, is_custom,
+                              on_done=saved, on_error=save_failed)
 
         tk.Button(
             buttons_frame,
@@ -617,13 +640,8 @@ class GameMasterApp:
 
         if response:
             try:
-                # Delete the file
-                os.remove(filepath)
-
-                # Also delete from quiz_manager's cache if it exists
-                if hasattr(self.quiz_manager, 'quizzes_cache'):
-                    # Refresh the available quizzes cache
-                    self.quiz_manager.get_available_quizzes = self.quiz_manager.get_available_quizzes.__func__
+                # Delete the quiz
+                self.quiz_manager.delete_quiz(quiz_name, is_custom)
 
                 # Show success message
                 messagebox.showinfo("Success", f"Quiz '{display_name}' deleted successfully!")
@@ -650,11 +668,8 @@ class GameMasterApp:
         safe_name = "".join(c for c in quiz_name if c.isalnum() or c in (' ', '-', '_')).strip()
         safe_name = safe_name.replace(' ', '_').lower()
 
-        # Save in DEFAULT quizzes directory
-        filepath = f"data/quizzes/{safe_name}.json"
-
-        # Check if already exists
-        if os.path.exists(filepath):
+        # Check if already exists among DEFAULT quizzes
+        if self.quiz_manager.quiz_exists(safe_name):
             messagebox.showerror("Error", f"A quiz named '{quiz_name}' already exists!")
             return
 
@@ -672,8 +687,7 @@ class GameMasterApp:
         }
 
         try:
-            with open(filepath, 'w') as f:
-                json.dump(new_quiz, f, indent=2)
+            filepath = self.quiz_manager.save_quiz(safe_name, new_quiz)
 
             # Now edit the new quiz (False = not custom)
             self.edit_quiz(safe_name, filepath, False)
@@ -692,16 +706,11 @@ class GameMasterApp:
 
         if response:
             try:
-                # Reset scores.json
+                # Reset scores.json and the game history
+                self.storage.clear_games()
                 self.quiz_game.scores = {"leaderboard": [], "user_stats": {}}
                 self.quiz_game.save_scores()
 
-                # Reset user stats in auth system
-                for username in self.auth.users:
-                    self.auth.users[username]["games_played"] = 0
-                    self.auth.users[username]["total_score"] = 0
-                self.auth.save_users()
-
                 messagebox.showinfo("Success", "All scores have been reset successfully!")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to reset scores: {e}")
@@ -769,18 +778,16 @@ class GameMasterApp:
             response = messagebox.askyesno(
                 "Confirm Reset",
                 f"Reset all scores for '{selected_quiz[0].replace('_', ' ').title()}'?\n\n"
-                "This will remove all score entries for this quiz from the leaderboard."
+                "This will remove all score entries for this quiz from the leaderboard and game history."
             )
 
             if response:
                 try:
-                    # Filter out scores for this quiz
-                    original_count = len(self.quiz_game.scores["leaderboard"])
-                    self.quiz_game.scores["leaderboard"] = [
-                        entry for entry in self.quiz_game.scores["leaderboard"]
-                        if entry["quiz"] != selected_quiz[0]
-                    ]
-                    removed_count = original_count - len(self.quiz_game.scores["leaderboard"])
+                    # Remove every game of this quiz from the history
+                    quiz_name = selected_quiz[0].lower()
+                    removed_count = self.storage.remove_games(
+                        lambda entry: (entry.get("quiz") or "").lower() == quiz_name
+                    )
 
                     # Recalculate user stats
                     self.recalculate_user_stats()
@@ -820,38 +827,8 @@ class GameMasterApp:
 
     def recalculate_user_stats(self):
         """Recalculate all user stats after score changes"""
-        # Reset user stats
-        self.quiz_game.scores["user_stats"] = {}
-
-        # Aggregate scores from leaderboard
-        for entry in self.quiz_game.scores["leaderboard"]:
-            username = entry["username"]
-            score = entry["score"]
-
-            if username not in self.quiz_game.scores["user_stats"]:
-                self.quiz_game.scores["user_stats"][username] = {
-                    "total_games": 0,
-                    "total_score": 0,
-                    "average_score": 0
-                }
-
-            stats = self.quiz_game.scores["user_stats"][username]
-            stats["total_games"] += 1
-            stats["total_score"] += score
-
-        # Calculate averages
-        for username, stats in self.quiz_game.scores["user_stats"].items():
-            if stats["total_games"] > 0:
-                stats["average_score"] = stats["total_score"] / stats["total_games"]
-
-        # Update auth system
-        for username in self.auth.users:
-            if username in self.quiz_game.scores["user_stats"]:
-                stats = self.quiz_game.scores["user_stats"][username]
-                self.auth.users[username]["games_played"] = stats["total_games"]
-                self.auth.users[username]["total_score"] = stats["total_score"]
-
-        self.auth.save_users()
+        # Rebuild from the full game history, not just the top of the leaderboard
+        self.quiz_game.recalculate_user_stats()
 
     def view_all_users(self):
         """Display all registered users"""
@@ -888,76 +865,20 @@ class GameMasterApp:
             ).pack(pady=100)
             return
 
-        # Create table
-        table_frame = tk.Frame(self.root, bg=self.bg_color)
-        table_frame.pack(pady=20, padx=20, fill="both", expand=True)
-
-        # Headers
-        headers = ["Username", "Games Played", "Total Score", "Joined"]
-
-        for col, header in enumerate(headers):
-            tk.Label(
-                table_frame,
-                text=header,
-                font=("Arial", 12, "bold"),
-                bg="#800080",
-                fg="white",
-                width=20,
-                height=2
-            ).grid(row=0, column=col, padx=2, pady=2, sticky="nsew")
-
-        # User rows
-        for row, (username, user_data) in enumerate(self.auth.users.items(), start=1):
-            # Get stats from scores if available
-            user_stats = self.quiz_game.scores.get("user_stats", {}).get(username, {})
-
-            # Username
-            tk.Label(
-                table_frame,
-                text=username,
-                font=("Arial", 11, "bold"),
-                bg="#f0e6ff" if row % 2 == 0 else self.bg_color,
-                fg=self.text_color,
-                width=20,
-                height=2
-            ).grid(row=row, column=0, padx=2, pady=2, sticky="nsew")
-
-            # Games Played
-            tk.Label(
-                table_frame,
-                text=user_stats.get("total_games", user_data.get("games_played", 0)),
-                font=("Arial", 11),
-                bg="#f0e6ff" if row % 2 == 0 else self.bg_color,
-                fg=self.text_color,
-                width=20,
-                height=2
-            ).grid(row=row, column=1, padx=2, pady=2, sticky="nsew")
-
-            # Total Score
-            tk.Label(
-                table_frame,
-                text=user_stats.get("total_score", user_data.get("total_score", 0)),
-                font=("Arial", 11),
-                bg="#f0e6ff" if row % 2 == 0 else self.bg_color,
-                fg=self.text_color,
-                width=20,
-                height=2
-            ).grid(row=row, column=2, padx=2, pady=2, sticky="nsew")
-
-            # Since we don't have join date, show games played from auth
-            tk.Label(
-                table_frame,
-                text="Active User",
-                font=("Arial", 10),
-                bg="#f0e6ff" if row % 2 == 0 else self.bg_color,
-                fg="#666666",
-                width=20,
-                height=2
-            ).grid(row=row, column=3, padx=2, pady=2, sticky="nsew")
-
-        # Configure grid weights
-        for i in range(4):
-            table_frame.columnconfigure(i, weight=1)
+        # Users are paged from the store, so 100k users cost the same as 50
+        table = PagedTable(
+            self.root,
+            [("username", "Username", 200), ("total_games", "Games Played", 150),
+             ("total_score", "Total Score", 150), ("joined", "Joined", 150)],
+            self.admin_manager.get_users_page,
+            sort_key="username",
+            descending=False,
+            sortable=("username", "total_games", "total_score"),
+            formatters={"joined": lambda value: "Active User"},  # No join date is stored
+            bg=self.bg_color
+        )
+        table.pack(pady=20, padx=20, fill="both", expand=True)
+        table.refresh()
 
     def view_statistics(self):
         """Display system statistics"""
@@ -1037,14 +958,165 @@ class GameMasterApp:
                 justify="left"
             ).pack(side="left", padx=10)
 
+    def view_question_analytics(self):
+        """Display per-question answer analytics of a quiz"""
+        self.clear_window()
+
+        # Title
+        title_label = tk.Label(
+            self.root,
+            text="Question Analytics",
+            font=("Arial", 24, "bold"),
+            bg=self.bg_color,
+            fg="#800080"
+        )
+        title_label.pack(pady=20)
+
+        # Back button
+        back_btn = tk.Button(
+            self.root,
+            text="← Back to Admin Panel",
+            font=("Arial", 10),
+            bg=self.secondary_color,
+            fg=self.text_color,
+            command=self.show_admin_panel
+        )
+        back_btn.place(x=10, y=10)
+
+        quizzes = {
+            f"{entry['name'].replace('_', ' ').title()} ({'Custom' if entry['is_custom'] else 'Default'})":
+                (entry["name"], entry["is_custom"])
+            for entry in self.quiz_manager.get_catalog()
+        }
+        if not quizzes:
+            tk.Label(
+                self.root,
+                text="No quizzes found.",
+                font=("Arial", 14),
+                bg=self.bg_color,
+                fg=self.text_color
+            ).pack(pady=100)
+            return
+
+        # Quiz picker
+        picker_frame = tk.Frame(self.root, bg=self.bg_color)
+        picker_frame.pack(pady=5)
+        tk.Label(
+            picker_frame,
+            text="Quiz:",
+            font=("Arial", 12, "bold"),
+            bg=self.bg_color,
+            fg=self.text_color
+        ).pack(side="left", padx=5)
+        quiz_var = tk.StringVar(value=next(iter(quizzes)))
+        picker = ttk.Combobox(picker_frame, textvariable=quiz_var, values=list(quizzes),
+                              state="readonly", width=40)
+        picker.pack(side="left", padx=5)
+
+        summary_label = tk.Label(
+            self.root,
+            font=("Arial", 11),
+            bg=self.bg_color,
+            fg=self.text_color,
+            wraplength=700
+        )
+        summary_label.pack(pady=10)
+
+        table_frame = tk.Frame(self.root, bg=self.bg_color)
+        table_frame.pack(pady=10, padx=20, fill="both", expand=True)
+
+        def percent(value):
+            return "-" if value is None else f"{value:.0%}"
+
+        def show_report(report):
+            for widget in table_frame.winfo_children():
+                widget.destroy()
+            if report is None:
+                summary_label.config(text="Nobody has answered this version of the quiz yet.")
+                return
+
+            summary_label.config(text=(
+                f"{report['total_answers']:,} answers to {len(report['played']):,} questions. "
+                f"{report['low_discrimination']} questions barely separate strong from weak players; "
+                f"{report['unused_distractors']} have wrong options nobody picks."
+            ))
+            table = PagedTable(
+                table_frame,
+                [("number", "#", 50), ("question", "Question", 280), ("answered", "Answers", 80),
+                 ("correct_rate", "Correct", 80), ("discrimination", "Discrimination", 110),
+                 ("answer_ms", "Avg Time", 80), ("never_chosen", "Never Chosen", 180)],
+                lambda offset, limit, sort_key, descending: self.admin_manager.get_question_page(
+                    report, offset, limit, sort_key, descending),
+                sort_key="number",
+                descending=False,
+                sortable=("number", "answered", "correct_rate", "discrimination", "answer_ms"),
+                ascending_keys=("number", "correct_rate", "discrimination"),
+                formatters={
+                    "correct_rate": percent,
+                    "discrimination": lambda value: "-" if value is None else f"{value:+.2f}",
+                    "answer_ms": lambda value: "-" if value is None else f"{value / 1000:.1f}s"
+                },
+                bg=self.bg_color
+            )
+            table.pack(fill="both", expand=True)
+            table.refresh()
+
+        def load_report(event=None):
+            selected = quiz_var.get()
+            summary_label.config(text="Computing...")
+
+            def report_ready(report):
+                # A report for a quiz that is no longer selected arrived late
+                if quiz_var.get() == selected:
+                    show_report(report)
+
+            # Games still waiting to be written belong in the report; pending saves are
+            # timer callbacks on this thread, so write them out here
+            self.persistence.flush("answer_stats")
+            self.run_in_background(self.admin_manager.get_question_report, *quizzes[selected],
+                                   on_done=report_ready)
+
+        picker.bind("<<ComboboxSelected>>", load_report)
+        load_report()
+
+    def schedule(self, delay, callback):
+        """Run callback on the Tk thread after delay seconds; returns a cancel function"""
+        after_id = self.root.after(int(delay * 1000), callback)
+        return lambda: self.root.after_cancel(after_id)
+
+    def on_close(self):
+        """Save pending changes and close the window"""
+        self.tasks.shutdown()
+        self.persistence.shutdown()
+        self.root.destroy()
+
     def run(self):
         """Run the application"""
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         self.root.mainloop()
 
     def clear_window(self):
         """Clear all widgets from the window"""
+        # Background results meant for the old screen are dropped
+        self.screen_generation += 1
+
+        # Cached screens are only hidden; everything else is rebuilt next time
+        cached = {frame for frame, _ in self.screens.values()}
         for widget in self.root.winfo_children():
-            widget.destroy()
+            if widget in cached:
+                widget.pack_forget()
+            else:
+                widget.destroy()
+
+    def show_screen(self, name, build):
+        """Show a screen that is built once by build(frame) and then reused; returns its widgets"""
+        self.clear_window()
+        if name not in self.screens:
+            frame = tk.Frame(self.root, bg=self.bg_color)
+            self.screens[name] = (frame, build(frame))
+        frame, widgets = self.screens[name]
+        frame.pack(fill="both", expand=True)
+        return widgets
 
     def show_login_screen(self):
         """Display login/registration screen"""
@@ -1152,10 +1224,17 @@ class GameMasterApp:
             messagebox.showerror("Error", "Please enter both username and password")
             return
 
-        success, message = self.auth.login(username, password)
+        # Password hashing runs in the background so the window stays responsive
+        self.run_auth(self.auth.check_password_async, username, password,
+                      on_done=lambda result: self.finish_login(username, result))
+
+    def finish_login(self, username, result):
+        """Complete a login once the password check has finished"""
+        success, message = self.auth.finish_login(username, result)
 
         if success:
             self.current_user = username
+            self.session_token = self.auth.create_session(username)
             self.quiz_game.current_user = username
             messagebox.showinfo("Success", f"Welcome back, {username}!")
             self.show_main_menu()
@@ -1171,7 +1250,17 @@ class GameMasterApp:
             messagebox.showerror("Error", "Please enter both username and password")
             return
 
-        success, message = self.auth.register(username, password)
+        valid, message = self.auth.validate_registration(username, password)
+        if not valid:
+            messagebox.showerror("Registration Failed", message)
+            return
+
+        self.run_auth(self.auth.hash_password_async, password,
+                      on_done=lambda password_hash: self.finish_register(username, password_hash))
+
+    def finish_register(self, username, password_hash):
+        """Complete a registration once the password has been hashed"""
+        success, message = self.auth.create_user(username, password_hash)
 
         if success:
             messagebox.showinfo("Success", message)
@@ -1180,19 +1269,107 @@ class GameMasterApp:
         else:
             messagebox.showerror("Registration Failed", message)
 
-    def show_main_menu(self):
-        """Display the main menu after login"""
-        self.clear_window()
+    def run_auth(self, submit, *args, on_done):
+        """Run a password check or hash in the hashing pool, one at a time; failures are shown to the user"""
+        if self.auth_pending:
+            return
+        self.auth_pending = True
 
-        # Title
-        title_label = tk.Label(
-            self.root,
-            text=f"Welcome, {self.current_user}! 🎮",
-            font=("Arial", 24, "bold"),
+        def finished(result):
+            # Saving the user may fail too, and Login and Register must never stay disabled
+            try:
+                on_done(result)
+            except Exception as e:
+                messagebox.showerror("Error", f"Could not complete the request: {e}")
+            finally:
+                self.auth_pending = False
+
+        def failed(error):
+            self.auth_pending = False
+            messagebox.showerror("Error", f"Could not complete the request: {error}")
+
+        # A task thread waits for the hashing pool, so the result and any error come back here;
+        # not run_in_background, as the result must arrive even if the screen changed meanwhile
+        self.tasks.submit(lambda: submit(*args).result(), on_done=finished, on_error=failed)
+
+    def run_in_background(self, func, *args, on_done=None, on_error=None):
+        """Run func off the Tk thread; results arriving after the user left the screen are dropped"""
+        generation = self.screen_generation
+        self.root.config(cursor="watch")
+
+        def deliver(callback, value):
+            self.root.config(cursor="")
+            if generation == self.screen_generation and callback:
+                callback(value)
+
+        def failed(error):
+            messagebox.showerror("Error", f"Operation failed: {error}")
+
+        return self.tasks.submit(
+            func, *args,
+            on_done=lambda result: deliver(on_done, result),
+            on_error=lambda error: deliver(on_error or failed, error)
+        )
+
+    def run_with_progress(self, title, func, *args, on_done=None):
+        """Run a long, cancellable operation behind a progress dialog"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title(title)
+        dialog.geometry("420x170")
+        dialog.configure(bg=self.bg_color)
+        dialog.transient(self.root)
+        dialog.grab_set()
+
+        status_label = tk.Label(
+            dialog,
+            text="Starting...",
+            font=("Arial", 10),
             bg=self.bg_color,
-            fg=self.main_color
+            fg=self.text_color,
+            wraplength=380
         )
-        title_label.pack(pady=20)
+        status_label.pack(pady=(20, 10))
+
+        progress_bar = ttk.Progressbar(dialog, length=360, mode="determinate")
+        progress_bar.pack(pady=5)
+
+        def update_progress(done, total, message):
+            if dialog.winfo_exists():
+                progress_bar.config(maximum=max(total, 1), value=done)
+                status_label.config(text=message)
+
+        def finished(result):
+            dialog.destroy()
+            if on_done:
+                on_done(result)
+
+        def failed(error):
+            dialog.destroy()
+            messagebox.showerror("Error", f"{title} failed: {error}")
+
+        task = self.tasks.submit(func, *args, on_done=finished, on_error=failed,
+                                 on_progress=update_progress, cancellable=True)
+
+        def cancel():
+            task.cancel()
+            cancel_button.config(state="disabled", text="Cancelling...")
+
+        cancel_button = tk.Button(
+            dialog,
+            text="Cancel",
+            font=("Arial", 10),
+            bg=self.secondary_color,
+            fg=self.text_color,
+            command=cancel
+        )
+        cancel_button.pack(pady=15)
+        dialog.protocol("WM_DELETE_WINDOW", cancel)
+        return task
+
+    def show_main_menu(self):
+        """Display the main menu after login"""
+        widgets = self.show_screen("main_menu", self.build_main_menu)
+        widgets["title"].config(text=f"Welcome, {self.current_user}! 🎮")
 
         # User stats
         stats = self.quiz_game.scores.get("user_stats", {}).get(self.current_user, {})
@@ -1203,17 +1380,32 @@ class GameMasterApp:
             rank_text = f"Global Rank: #{user_rank}" if user_rank else ""
 
             stats_text = f"Games Played: {stats.get('total_games', 0)} | Total Score: {stats.get('total_score', 0)} | {rank_text}"
-            stats_label = tk.Label(
-                self.root,
-                text=stats_text,
-                font=("Arial", 12),
-                bg=self.bg_color,
-                fg=self.text_color
-            )
-            stats_label.pack(pady=10)
+            widgets["stats"].config(text=stats_text)
+            widgets["stats"].pack(pady=10, before=widgets["menu"])
+        else:
+            widgets["stats"].pack_forget()
+
+    def build_main_menu(self, frame):
+        """Build the main menu screen once"""
+        # Title
+        title_label = tk.Label(
+            frame,
+            font=("Arial", 24, "bold"),
+            bg=self.bg_color,
+            fg=self.main_color
+        )
+        title_label.pack(pady=20)
+
+        # User stats, shown once the user has played
+        stats_label = tk.Label(
+            frame,
+            font=("Arial", 12),
+            bg=self.bg_color,
+            fg=self.text_color
+        )
 
         # Menu buttons
-        menu_frame = tk.Frame(self.root, bg=self.bg_color)
+        menu_frame = tk.Frame(frame, bg=self.bg_color)
         menu_frame.pack(pady=30)
 
         buttons = [
@@ -1237,13 +1429,17 @@ class GameMasterApp:
             )
             btn.pack(pady=10)
 
+        return {"title": title_label, "stats": stats_label, "menu": menu_frame}
+
     def show_leaderboard_selection(self):
         """Display leaderboard type selection"""
-        self.clear_window()
+        self.show_screen("leaderboard_selection", self.build_leaderboard_selection)
 
+    def build_leaderboard_selection(self, frame):
+        """Build the leaderboard type selection screen once"""
         # Title
         title_label = tk.Label(
-            self.root,
+            frame,
             text="Leaderboards",
             font=("Arial", 24, "bold"),
             bg=self.bg_color,
@@ -1253,7 +1449,7 @@ class GameMasterApp:
 
         # Back button
         back_btn = tk.Button(
-            self.root,
+            frame,
             text="← Back",
             font=("Arial", 10),
             bg=self.secondary_color,
@@ -1263,7 +1459,7 @@ class GameMasterApp:
         back_btn.place(x=10, y=10)
 
         # Leaderboard buttons frame
-        lb_frame = tk.Frame(self.root, bg=self.bg_color)
+        lb_frame = tk.Frame(frame, bg=self.bg_color)
         lb_frame.pack(pady=40)
 
         # Recent Scores button
@@ -1292,6 +1488,8 @@ class GameMasterApp:
         )
         total_btn.pack(pady=15)
 
+        return {}
+
     def show_quiz_selection(self):
         """Display quiz category selection"""
         self.clear_window()
@@ -1317,12 +1515,38 @@ class GameMasterApp:
         )
         back_btn.place(x=10, y=10)
 
-        # Get ALL quizzes
-        all_quizzes = self.quiz_manager.get_available_quizzes()
+        adaptive_check = tk.Checkbutton(
+            self.root,
+            text="Adaptive difficulty (questions follow your level, harder ones score more)",
+            variable=self.adaptive_mode,
+            font=("Arial", 10),
+            bg=self.bg_color,
+            fg=self.text_color,
+            activebackground=self.bg_color
+        )
+        adaptive_check.pack()
 
+        loading_label = tk.Label(
+            self.root,
+            text="Loading quizzes...",
+            font=("Arial", 12),
+            bg=self.bg_color,
+            fg=self.text_color
+        )
+        loading_label.pack(pady=40)
+
+        # Read the catalog off the Tk thread
+        def show_catalog(all_quizzes):
+            loading_label.destroy()
+            self.show_quiz_catalog(all_quizzes)
+
+        self.run_in_background(self.quiz_manager.get_catalog, on_done=show_catalog)
+
+    def show_quiz_catalog(self, all_quizzes):
+        """Display the quiz buttons of the selection screen"""
         # Separate quizzes
-        default_quizzes = [q for q in all_quizzes if not q[2]]  # Non-custom
-        custom_quizzes = [q for q in all_quizzes if q[2]]  # Custom
+        default_quizzes = [q for q in all_quizzes if not q["is_custom"]]  # Non-custom
+        custom_quizzes = [q for q in all_quizzes if q["is_custom"]]  # Custom
 
         # Create main container
         main_container = tk.Frame(self.root, bg=self.bg_color)
@@ -1377,16 +1601,10 @@ class GameMasterApp:
             scrollbar.pack(side="right", fill="y")
 
             # DISPLAY DEFAULT QUIZZES AS CENTERED RECTANGLES
-            for quiz_name, filepath, is_custom in default_quizzes:
-                # Load quiz to get description
-                try:
-                    with open(filepath, 'r') as f:
-                        quiz_data = json.load(f)
-                    description = quiz_data.get("description", "Test your knowledge")
-                    display_name = quiz_data.get("category", quiz_name.replace("_", " ").title())
-                except:
-                    description = "Quiz description"
-                    display_name = quiz_name.replace("_", " ").title()
+            for entry in default_quizzes:
+                quiz_name = entry["name"]
+                description = entry["description"] or "Test your knowledge"
+                display_name = entry["category"] or quiz_name.replace("_", " ").title()
 
                 # QUIZ FRAME - FIXED SIZE RECTANGLE (like original)
                 category_frame = tk.Frame(
@@ -1464,7 +1682,8 @@ class GameMasterApp:
             custom_frame = tk.Frame(main_container, bg=self.bg_color)
             custom_frame.pack()
 
-            for quiz_name, _, _ in custom_quizzes:
+            for entry in custom_quizzes:
+                quiz_name = entry["name"]
                 display_name = quiz_name.replace("_", " ").title()
                 # Remove username prefix for display
                 if "_" in display_name and self.current_user and display_name.startswith(self.current_user.title()):
@@ -1483,18 +1702,22 @@ class GameMasterApp:
 
     def start_quiz(self, category, custom_quiz=None):
         """Start a quiz"""
-        success = self.quiz_game.load_quiz(category, custom_quiz)
+        def quiz_loaded(success):
+            if not success:
+                messagebox.showerror("Error", f"Failed to load quiz. The quiz file may be empty or corrupted.\n\nCategory: {category}\nCustom: {custom_quiz}")
+                return
 
-        if not success:
-            messagebox.showerror("Error", f"Failed to load quiz. The quiz file may be empty or corrupted.\n\nCategory: {category}\nCustom: {custom_quiz}")
-            return
+            self.show_quiz_question()
 
-        self.show_quiz_question()
+        # Tk variables are read here, on the Tk thread, and an unfinished game's answers are
+        # handed over here too: queuing them may schedule a save timer, which only this thread can
+        adaptive = self.adaptive_mode.get()
+        self.quiz_game.record_answers()
+        self.run_in_background(lambda: self.quiz_game.load_quiz(category, custom_quiz, adaptive=adaptive),
+                               on_done=quiz_loaded)
 
     def show_quiz_question(self):
         """Display the current quiz question"""
-        self.clear_window()
-
         # Get current question
         question_data = self.quiz_game.get_current_question()
 
@@ -1502,11 +1725,22 @@ class GameMasterApp:
             self.show_quiz_results()
             return
 
+        # The question screen is built once; each question only updates its texts
+        widgets = self.show_screen("question", self.build_quiz_question)
+        self.awaiting_next = False
+        self.clear_feedback(widgets)
+
+        card = widgets["cards"][self.front_card]
+        self.render_question_card(card, question_data)
+        card["frame"].pack()
+        self.update_question_header(widgets)
+        self.quiz_game.start_question_timer()
+
+    def build_quiz_question(self, frame):
+        """Build the quiz question screen once"""
         # Progress
-        current, total = self.quiz_game.get_progress()
         progress_label = tk.Label(
-            self.root,
-            text=f"Question {current + 1} of {total}",
+            frame,
             font=("Arial", 12),
             bg=self.bg_color,
             fg=self.text_color
@@ -1515,83 +1749,224 @@ class GameMasterApp:
 
         # Score
         score_label = tk.Label(
-            self.root,
-            text=f"Score: {self.quiz_game.score}",
+            frame,
             font=("Arial", 12, "bold"),
             bg=self.bg_color,
             fg=self.main_color
         )
         score_label.pack(pady=5)
 
-        # Question
-        question_label = tk.Label(
-            self.root,
-            text=question_data["question"],
-            font=("Arial", 16, "bold"),
+        # Two question cards: one is shown while the next question is drawn on the other
+        cards_frame = tk.Frame(frame, bg=self.bg_color)
+        cards_frame.pack()
+        cards = []
+        for _ in range(2):
+            card_frame = tk.Frame(cards_frame, bg=self.bg_color)
+
+            question_label = tk.Label(
+                card_frame,
+                font=("Arial", 16, "bold"),
+                bg=self.bg_color,
+                fg=self.text_color,
+                wraplength=600,
+                justify="center"
+            )
+            question_label.pack(pady=30, padx=20)
+
+            options_frame = tk.Frame(card_frame, bg=self.bg_color)
+            options_frame.pack(pady=10)
+
+            cards.append({"frame": card_frame, "question": question_label,
+                          "options_frame": options_frame, "options": []})
+
+        # Inline answer feedback
+        feedback_frame = tk.Frame(frame, bg=self.bg_color)
+        feedback_frame.pack(pady=5)
+
+        feedback_label = tk.Label(
+            feedback_frame,
+            font=("Arial", 13, "bold"),
             bg=self.bg_color,
-            fg=self.text_color,
-            wraplength=600,
-            justify="center"
+            wraplength=600
         )
-        question_label.pack(pady=30, padx=20)
+        feedback_label.pack()
 
-        # Options frame
-        options_frame = tk.Frame(self.root, bg=self.bg_color)
-        options_frame.pack(pady=20)
+        next_btn = tk.Button(
+            feedback_frame,
+            font=("Arial", 12, "bold"),
+            bg=self.main_color,
+            fg="white",
+            width=20,
+            command=self.advance_question
+        )
 
-        # Create option buttons
-        for i, option in enumerate(question_data["options"]):
-            btn = tk.Button(
-                options_frame,
-                text=option,
-                font=("Arial", 14),
-                bg=self.secondary_color,
-                fg=self.text_color,
-                width=40,
-                height=2,
-                wraplength=500,
-                command=lambda idx=i: self.submit_answer(idx)
-            )
-            btn.pack(pady=10)
+        # Bottom bar
+        bottom_frame = tk.Frame(frame, bg=self.bg_color)
+        bottom_frame.pack(pady=15)
+
+        rapid_check = tk.Checkbutton(
+            bottom_frame,
+            text="Rapid mode (next question follows automatically)",
+            variable=self.rapid_mode,
+            font=("Arial", 10),
+            bg=self.bg_color,
+            fg=self.text_color,
+            activebackground=self.bg_color
+        )
+        rapid_check.pack(side="left", padx=10)
 
         # Quit button
         quit_btn = tk.Button(
-            self.root,
+            bottom_frame,
             text="Quit Quiz",
             font=("Arial", 10),
             bg="#ffcccc",
             fg="red",
             command=self.show_main_menu
         )
-        quit_btn.pack(pady=20)
+        quit_btn.pack(side="left", padx=10)
+
+        return {"progress": progress_label, "score": score_label, "cards": cards,
+                "feedback": feedback_label, "next": next_btn}
+
+    def render_question_card(self, card, question_data):
+        """Draw a question onto one of the question cards"""
+        card["question"].config(text=question_data.question)
+
+        # Option buttons, added when a question has more options than any before it
+        buttons = card["options"]
+        options = question_data.options
+        while len(buttons) < len(options):
+            buttons.append(tk.Button(
+                card["options_frame"],
+                font=("Arial", 14),
+                width=40,
+                height=2,
+                wraplength=500,
+                command=lambda idx=len(buttons): self.submit_answer(idx)
+            ))
+
+        for i, btn in enumerate(buttons):
+            if i < len(options):
+                btn.config(text=options[i], state="normal", bg=self.secondary_color,
+                           fg=self.text_color, disabledforeground=self.text_color)
+                if not btn.winfo_manager():
+                    btn.pack(pady=8)
+            else:
+                btn.pack_forget()
+
+    def update_question_header(self, widgets):
+        """Show the current progress and score"""
+        current, total = self.quiz_game.get_progress()
+        widgets["progress"].config(text=f"Question {current + 1} of {total}")
+        widgets["score"].config(text=f"Score: {self.quiz_game.score}")
+
+    def clear_feedback(self, widgets):
+        """Hide the answer feedback"""
+        widgets["feedback"].config(text="")
+        widgets["next"].pack_forget()
 
     def submit_answer(self, answer_index):
-        """Submit answer and show feedback"""
+        """Submit answer and show feedback inline without blocking"""
+        if self.awaiting_next:
+            return
+        self.awaiting_next = True
+
+        question_data = self.quiz_game.get_current_question()
+        score_before = self.quiz_game.score
         is_correct, correct_answer = self.quiz_game.submit_answer(answer_index)
 
-        # Get the correct answer text
-        question_data = self.quiz_game.current_questions[self.quiz_game.current_question_index - 1]
-        correct_answer_text = question_data["options"][correct_answer]
+        widgets = self.screens["question"][1]
+        card = widgets["cards"][self.front_card]
+
+        # Mark the answers on the card itself
+        for btn in card["options"]:
+            btn.config(state="disabled")
+        card["options"][correct_answer].config(bg="#c8f7c5")
+        if not is_correct:
+            card["options"][answer_index].config(bg="#ffcccc")
 
-        # Show feedback
         if is_correct:
-            messagebox.showinfo("Correct!", "Well done! +10 points")
+            widgets["feedback"].config(text=f"Correct! +{self.quiz_game.score - score_before} points",
+                                       fg="#2e7d32")
+        else:
+            correct_answer_text = question_data.options[correct_answer]
+            widgets["feedback"].config(text=f"The correct answer was: {correct_answer_text}", fg="#c62828")
+        widgets["score"].config(text=f"Score: {self.quiz_game.score}")
+
+        # Draw the next question on the hidden card while the feedback is read
+        next_question = self.quiz_game.get_current_question()
+        if next_question:
+            self.render_question_card(widgets["cards"][1 - self.front_card], next_question)
+
+        if self.rapid_mode.get():
+            generation = self.screen_generation
+
+            def advance():
+                # Leaving the quiz during the feedback cancels the advance
+                if generation == self.screen_generation:
+                    self.advance_question()
+
+            self.root.after(RAPID_FEEDBACK_MS, advance)
         else:
-            messagebox.showinfo("Incorrect", f"The correct answer was: {correct_answer_text}")
+            widgets["next"].config(text="Next Question →" if next_question else "See Results →")
+            widgets["next"].pack(pady=8)
 
-        # Move to next question or show results
+    def advance_question(self):
+        """Swap in the pre-rendered next question, or show the results"""
+        if not self.awaiting_next:
+            return
         if self.quiz_game.is_quiz_complete():
             self.show_quiz_results()
-        else:
-            self.show_quiz_question()
+            return
+
+        widgets = self.screens["question"][1]
+        widgets["cards"][self.front_card]["frame"].pack_forget()
+        self.front_card = 1 - self.front_card
+        widgets["cards"][self.front_card]["frame"].pack()
+
+        self.awaiting_next = False
+        self.clear_feedback(widgets)
+        self.update_question_header(widgets)
+        # Time to answer starts when the question is on screen, not when it was pre-rendered
+        self.quiz_game.start_question_timer()
 
     def show_quiz_results(self):
         """Display quiz results"""
-        self.clear_window()
+        widgets = self.show_screen("results", self.build_quiz_results)
+
+        # Score
+        widgets["score"].config(text=f"Your Score: {self.quiz_game.score}")
 
+        # Get updated stats
+        stats = self.quiz_game.scores.get("user_stats", {}).get(self.current_user, {})
+        user_rank = self.quiz_game.get_user_rank(self.current_user)
+
+        # Stats info
+        stats_text = f"Games Played: {stats.get('total_games', 0)} | Total Score: {stats.get('total_score', 0)}"
+        if user_rank:
+            stats_text += f" | Global Rank: #{user_rank}"
+        widgets["stats"].config(text=stats_text)
+
+        # Message based on correct answers; adaptive games score by difficulty, not per answer
+        _, total_questions = self.quiz_game.get_progress()
+        percentage = (self.quiz_game.correct_count / total_questions) * 100 if total_questions > 0 else 0
+
+        if percentage >= 80:
+            message = "Excellent! You're a true gaming master!"
+        elif percentage >= 60:
+            message = "Great job! You know your games well!"
+        elif percentage >= 40:
+            message = "Good effort! Keep practicing!"
+        else:
+            message = "Keep playing to improve your knowledge!"
+        widgets["message"].config(text=message)
+
+    def build_quiz_results(self, frame):
+        """Build the quiz results screen once"""
         # Title
         title_label = tk.Label(
-            self.root,
+            frame,
             text="Quiz Complete! 🎉",
             font=("Arial", 28, "bold"),
             bg=self.bg_color,
@@ -1601,26 +1976,16 @@ class GameMasterApp:
 
         # Score
         score_label = tk.Label(
-            self.root,
-            text=f"Your Score: {self.quiz_game.score}",
+            frame,
             font=("Arial", 36, "bold"),
             bg=self.bg_color,
             fg="#4CAF50"  # Green for score
         )
         score_label.pack(pady=20)
 
-        # Get updated stats
-        stats = self.quiz_game.scores.get("user_stats", {}).get(self.current_user, {})
-        user_rank = self.quiz_game.get_user_rank(self.current_user)
-
         # Stats info
-        stats_text = f"Games Played: {stats.get('total_games', 0)} | Total Score: {stats.get('total_score', 0)}"
-        if user_rank:
-            stats_text += f" | Global Rank: #{user_rank}"
-
         stats_label = tk.Label(
-            self.root,
-            text=stats_text,
+            frame,
             font=("Arial", 12),
             bg=self.bg_color,
             fg=self.text_color
@@ -1628,22 +1993,8 @@ class GameMasterApp:
         stats_label.pack(pady=10)
 
         # Message based on score
-        total_questions = len(self.quiz_game.current_questions)
-        max_score = total_questions * 10
-        percentage = (self.quiz_game.score / max_score) * 100 if max_score > 0 else 0
-
-        if percentage >= 80:
-            message = "Excellent! You're a true gaming master!"
-        elif percentage >= 60:
-            message = "Great job! You know your games well!"
-        elif percentage >= 40:
-            message = "Good effort! Keep practicing!"
-        else:
-            message = "Keep playing to improve your knowledge!"
-
         message_label = tk.Label(
-            self.root,
-            text=message,
+            frame,
             font=("Arial", 14),
             bg=self.bg_color,
             fg=self.text_color,
@@ -1652,7 +2003,7 @@ class GameMasterApp:
         message_label.pack(pady=20)
 
         # Buttons frame
-        buttons_frame = tk.Frame(self.root, bg=self.bg_color)
+        buttons_frame = tk.Frame(frame, bg=self.bg_color)
         buttons_frame.pack(pady=30)
 
         # Play again button
@@ -1679,6 +2030,8 @@ class GameMasterApp:
         )
         menu_btn.grid(row=0, column=1, padx=10)
 
+        return {"score": score_label, "stats": stats_label, "message": message_label}
+
     def show_leaderboard(self, lb_type="recent"):
         """Display the leaderboard"""
         self.clear_window()
@@ -1709,15 +2062,30 @@ class GameMasterApp:
         )
         back_btn.place(x=10, y=10)
 
-        # Get leaderboard data based on type
+        # Only one page of rows is ever materialized, however many users there are
         if lb_type == "recent":
-            leaderboard = self.quiz_game.get_leaderboard(limit=20)
-            headers = ["Rank", "Username", "Score", "Quiz", "Date"]
-        else:
-            leaderboard = self.quiz_game.get_user_stats_leaderboard(limit=20)
-            headers = ["Rank", "Username", "Total Score", "Games Played", "Avg. Score"]
+            entries = [dict(entry, rank=rank) for rank, entry in
+                       enumerate(self.quiz_game.get_leaderboard(limit=self.quiz_game.leaderboard_size), start=1)]
+
+            def fetch(offset, limit, sort_key, descending):
+                rows = sorted_page(entries, lambda entry: entry[sort_key], descending, offset, limit)
+                return rows, len(entries)
 
-        if not leaderboard:
+            columns = [("rank", "Rank", 70), ("username", "Username", 150), ("score", "Score", 90),
+                       ("quiz", "Quiz", 200), ("date", "Date", 150)]
+            table_options = {"sort_key": "rank", "descending": False,
+                             "ascending_keys": ("rank", "username", "quiz")}
+        else:
+            entries = self.quiz_game.scores.get("user_stats", {})
+            fetch = self.quiz_game.get_user_stats_page
+            columns = [("rank", "Rank", 70), ("username", "Username", 150),
+                       ("total_score", "Total Score", 110), ("total_games", "Games Played", 110),
+                       ("average_score", "Avg. Score", 100)]
+            table_options = {"sort_key": "total_score", "sortable": ("username", "total_score",
+                                                                      "total_games", "average_score"),
+                             "formatters": {"average_score": lambda value: f"{value:.1f}"}}
+
+        if not entries:
             no_data_label = tk.Label(
                 self.root,
                 text="No scores yet. Be the first to play!",
@@ -1728,126 +2096,33 @@ class GameMasterApp:
             no_data_label.pack(pady=100)
             return
 
-        # Create table frame
-        table_frame = tk.Frame(self.root, bg=self.bg_color)
-        table_frame.pack(pady=20, padx=20, fill="both", expand=True)
-
-        # Table headers
-        for col, header in enumerate(headers):
-            header_label = tk.Label(
-                table_frame,
-                text=header,
-                font=("Arial", 12, "bold"),
-                bg=self.main_color,
-                fg="white",
-                width=15 if col != 3 else 20,
-                height=2
-            )
-            header_label.grid(row=0, column=col, padx=2, pady=2, sticky="nsew")
-
-        # Table rows
-        for row, entry in enumerate(leaderboard, start=1):
-            # Rank
-            rank_label = tk.Label(
-                table_frame,
-                text=f"#{row}",
-                font=("Arial", 12, "bold"),
-                bg=self.secondary_color if row % 2 == 0 else self.bg_color,
-                fg=self.main_color if row <= 3 else self.text_color,
-                width=15,
-                height=2
-            )
-            rank_label.grid(row=row, column=0, padx=2, pady=2, sticky="nsew")
-
-            # Username (highlight current user)
-            is_current_user = entry["username"] == self.current_user
-            username_bg = "#ffd9ec" if is_current_user else (self.secondary_color if row % 2 == 0 else self.bg_color)
-            username_fg = self.main_color if is_current_user else self.text_color
-
-            username_label = tk.Label(
-                table_frame,
-                text=entry["username"],
-                font=("Arial", 12, "bold" if is_current_user else "normal"),
-                bg=username_bg,
-                fg=username_fg,
-                width=15,
-                height=2
-            )
-            username_label.grid(row=row, column=1, padx=2, pady=2, sticky="nsew")
-
-            # Score or Total Score
-            if lb_type == "recent":
-                score_text = entry["score"]
-            else:
-                score_text = entry["total_score"]
-
-            score_label = tk.Label(
-                table_frame,
-                text=score_text,
-                font=("Arial", 12, "bold"),
-                bg=self.secondary_color if row % 2 == 0 else self.bg_color,
-                fg=self.text_color,
-                width=15,
-                height=2
-            )
-            score_label.grid(row=row, column=2, padx=2, pady=2, sticky="nsew")
-
-            # Third column (Quiz/Date or Games Played)
-            if lb_type == "recent":
-                col3_text = entry["quiz"]
-                col3_width = 20
-            else:
-                col3_text = entry["total_games"]
-                col3_width = 15
-
-            col3_label = tk.Label(
-                table_frame,
-                text=col3_text,
-                font=("Arial", 10 if lb_type == "recent" else 12),
-                bg=self.secondary_color if row % 2 == 0 else self.bg_color,
-                fg=self.text_color,
-                width=col3_width,
-                height=2,
-                wraplength=150 if lb_type == "recent" else None
-            )
-            col3_label.grid(row=row, column=3, padx=2, pady=2, sticky="nsew")
-
-            # Fourth column (Date or Avg. Score)
-            if lb_type == "recent":
-                col4_text = entry["date"]
-            else:
-                col4_text = f"{entry['average_score']:.1f}"
-
-            col4_label = tk.Label(
-                table_frame,
-                text=col4_text,
-                font=("Arial", 10),
-                bg=self.secondary_color if row % 2 == 0 else self.bg_color,
-                fg=self.text_color,
-                width=15,
-                height=2
-            )
-            col4_label.grid(row=row, column=4, padx=2, pady=2, sticky="nsew")
-
-        # Configure grid weights
-        for i in range(len(headers)):
-            table_frame.columnconfigure(i, weight=1)
+        table_options.setdefault("formatters", {})["rank"] = lambda rank: f"#{rank}"
+        table = PagedTable(
+            self.root,
+            columns,
+            fetch,
+            row_tag=lambda row: "current" if row["username"] == self.current_user else None,
+            bg=self.bg_color,
+            **table_options
+        )
+        table.tree.tag_configure("current", background="#ffd9ec", foreground=self.main_color)
+        table.pack(pady=10, padx=20, fill="both", expand=True)
+        table.refresh()
 
-        # Add current user info if not in top 20
+        # Add current user info if not on the first page
         if lb_type == "total":
             user_rank = self.quiz_game.get_user_rank(self.current_user)
-            if user_rank and user_rank > 20:
-                user_stats = self.quiz_game.scores.get("user_stats", {}).get(self.current_user, {})
-                if user_stats:
-                    user_info = tk.Label(
-                        self.root,
-                        text=f"Your rank: #{user_rank} | Total Score: {user_stats.get('total_score', 0)} | Games: {user_stats.get('total_games', 0)}",
-                        font=("Arial", 11, "bold"),
-                        bg="#ffd9ec",
-                        fg=self.main_color,
-                        pady=10
-                    )
-                    user_info.pack(pady=10, fill="x")
+            if user_rank and user_rank > table.page_size:
+                user_stats = self.quiz_game.get_user_stats(self.current_user)
+                user_info = tk.Label(
+                    self.root,
+                    text=f"Your rank: #{user_rank} | Total Score: {user_stats.get('total_score', 0)} | Games: {user_stats.get('total_games', 0)}",
+                    font=("Arial", 11, "bold"),
+                    bg="#ffd9ec",
+                    fg=self.main_color,
+                    pady=10
+                )
+                user_info.pack(pady=10, fill="x", before=table)
 
     def show_custom_quiz_creator(self):
         """Display custom quiz creator"""
@@ -2080,6 +2355,9 @@ class GameMasterApp:
 
     def logout(self):
         """Logout the current user"""
+        if self.session_token:
+            self.auth.logout(self.session_token)
+            self.session_token = None
         self.current_user = None
         self.quiz_game.current_user = None
         self.show_login_screen()
@@ -2093,6 +2371,7 @@ class GameMasterApp:
         best_username, best_score = self.quiz_game.get_best_player()
         user_score, user_rank = self.quiz_game.get_user_score_and_rank(self.current_user)
         score_difference = self.quiz_game.get_score_difference(self.current_user)
+        points_to_next_rank = self.quiz_game.get_points_to_next_rank(self.current_user)
 
         # Check if current user is the best
         is_best_player = (self.current_user == best_username)
@@ -2128,7 +2407,8 @@ class GameMasterApp:
         else:
             # Show encouragement message
             self.show_encouragement_message(content_frame, best_username, best_score,
-                                          user_score, user_rank, score_difference)
+                                          user_score, user_rank, score_difference,
+                                          points_to_next_rank)
 
         # Buttons frame
         buttons_frame = tk.Frame(self.root, bg=self.bg_color)
@@ -2269,7 +2549,8 @@ class GameMasterApp:
         ).pack(pady=20)
 
     def show_encouragement_message(self, parent_frame, best_username, best_score,
-                                 user_score, user_rank, score_difference):
+                                 user_score, user_rank, score_difference,
+                                 points_to_next_rank=0):
         """Display encouragement message for non-best players"""
         # Current stats frame
         stats_frame = tk.Frame(parent_frame, bg=self.bg_color, relief="groove", bd=2)
@@ -2318,6 +2599,9 @@ class GameMasterApp:
             message += f"You need {score_difference:,} more points\n"
             message += f"to beat {best_username} and become the champion!\n\n"
 
+        if 0 < points_to_next_rank < score_difference and user_rank:
+            message += f"Just {points_to_next_rank:,} points will move you up from rank #{user_rank}!\n\n"
+
         message += "Every quiz you play brings you closer to victory.\n"
         message += "Test your gaming knowledge and claim the throne!"
 
@@ -2387,15 +2671,21 @@ class GameMasterApp:
             if not backup_name:
                 backup_name = None
 
-            # Create backup
-            success, message = self.admin_manager.backup_data(backup_name)
+            export_window.destroy()
 
-            if success:
-                messagebox.showinfo("Export Successful", message)
-            else:
-                messagebox.showerror("Export Failed", message)
+            def backup_finished(result):
+                success, message = result
+                if success:
+                    messagebox.showinfo("Export Successful", message)
+                else:
+                    messagebox.showerror("Export Failed", message)
 
-            export_window.destroy()
+            # Pending saves are timer callbacks on this thread, so write them out here
+            self.persistence.flush()
+
+            # Create backup
+            self.run_with_progress("Creating Backup", self.admin_manager.backup_data, backup_name,
+                                   on_done=backup_finished)
 
         button_frame = tk.Frame(export_window, bg=self.bg_color)
         button_frame.pack(pady=20)
@@ -2418,6 +2708,41 @@ class GameMasterApp:
             command=export_window.destroy
         ).pack(side="left", padx=10)
 
+    def restore_data(self):
+        """Restore data from a backup directory"""
+        backup_dir = filedialog.askdirectory(
+            title="Select Backup to Restore",
+            initialdir="backups" if os.path.isdir("backups") else "."
+        )
+        if not backup_dir:
+            return
+
+        response = messagebox.askyesno(
+            "Confirm Restore",
+            "Restoring replaces the current users, scores and quizzes with the backup.\n\n"
+            "Continue?"
+        )
+        if not response:
+            return
+
+        def restore_finished(result):
+            success, message = result
+            if success:
+                # Only a finished restore replaced the snapshot the score journal belongs to;
+                # otherwise the storage simply reopens on its next use
+                self.admin_manager.reload_data()
+                messagebox.showinfo("Restore Successful", message)
+            else:
+                messagebox.showerror("Restore Failed", message)
+
+        # Write pending saves before the restore, not over it, and release the
+        # database; it reopens here when the data is reloaded or next used
+        self.persistence.flush()
+        self.storage.close()
+
+        self.run_with_progress("Restoring Backup", self.admin_manager.restore_backup, backup_dir,
+                               on_done=restore_finished)
+
     def cleanup_data(self):
         """Clean up orphaned data"""
         response = messagebox.askyesno(
@@ -2496,4 +2821,16 @@ class GameMasterApp:
             height=2,
             command=self.cleanup_data
         )
-        cleanup_btn.pack(pady=15)
\ No newline at end of file
+        cleanup_btn.pack(pady=15)
+
+        restore_btn = tk.Button(
+            buttons_frame,
+            text="Restore Backup",
+            font=("Arial", 14),
+            bg="#9370DB",
+            fg="white",
+            width=25,
+            height=2,
+            command=self.restore_data
+        )
+        restore_btn.pack(pady=15)
\ No newline at end of file
@@ -4,21 +4,34 @@ GameMaster Quiz - Main Application Entry Point
 A gaming quiz platform for video game enthusiasts
 """
 
+import argparse
 import sys
 import os
 import traceback
-from interface import GameMasterApp
 
 def main():
     """Main function to run the GameMaster Quiz application"""
+    parser = argparse.ArgumentParser(description="GameMaster Quiz")
+    parser.add_argument("--serve", action="store_true", help="run the headless HTTP/JSON server")
+    parser.add_argument("--host", default="127.0.0.1", help="server address (with --serve)")
+    parser.add_argument("--port", type=int, default=8080, help="server port (with --serve)")
+    args = parser.parse_args()
+    
+    # Create necessary directories
+    os.makedirs("data/quizzes/custom", exist_ok=True)
+    
+    if args.serve:
+        # Headless mode never imports tkinter
+        from server import serve
+        serve(args.host, args.port)
+        return
+    
     try:
         print("Starting GameMaster Quiz...")
-        
-        # Create necessary directories
-        os.makedirs("data/quizzes/custom", exist_ok=True)
         print("✓ Directories created/verified")
         
         # Initialize and run the application
+        from interface import GameMasterApp
         app = GameMasterApp()
         print("✓ Application initialized successfully")
         print("✓ GUI loaded. Enjoy the game!")
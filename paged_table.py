@@ -0,0 +1,120 @@
+"""
+Paged table widget for GameMaster Quiz
+A ttk.Treeview that only ever holds one page of rows, fetched from the store on demand
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+PAGE_SIZE = 50
+VISIBLE_ROWS = 15
+
+
+class PagedTable(tk.Frame):
+    """Sortable table showing one page at a time, so its size doesn't depend on the row count"""
+
+    # columns is a list of (key, heading, width) and rows are dicts keyed by column key.
+    # Columns in ascending_keys sort A-Z on first click, the others highest first.
+
+    def __init__(self, parent, columns, fetch, page_size=PAGE_SIZE, sort_key=None, descending=True,
+                 sortable=None, ascending_keys=("username",), formatters=None, row_tag=None, bg=None):
+        """Initialize paged table; fetch(offset, limit, sort_key, descending) returns (rows, total)"""
+        super().__init__(parent, bg=bg)
+        self.columns = columns
+        self.fetch = fetch
+        self.page_size = page_size
+        self.sort_key = sort_key or columns[0][0]
+        self.descending = descending
+        self.sortable = set(sortable) if sortable is not None else {key for key, _, _ in columns}
+        self.ascending_keys = set(ascending_keys)
+        self.formatters = formatters or {}
+        self.row_tag = row_tag
+        self.offset = 0
+        self.total = 0
+
+        keys = [key for key, _, _ in columns]
+        self.tree = ttk.Treeview(self, columns=keys, show="headings", height=VISIBLE_ROWS,
+                                 selectmode="browse")
+        for key, heading, width in columns:
+            self.tree.column(key, width=width, anchor="center")
+            if key in self.sortable:
+                self.tree.heading(key, text=heading, command=lambda k=key: self.sort_by(k))
+            else:
+                self.tree.heading(key, text=heading)
+        self.tree.tag_configure("odd", background="white")
+        if bg:
+            self.tree.tag_configure("even", background=bg)
+
+        scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+
+        # Pager
+        pager = tk.Frame(self, bg=bg)
+        self.prev_btn = tk.Button(pager, text="◀ Prev", font=("Arial", 10), width=8,
+                                  command=self.prev_page)
+        self.prev_btn.pack(side="left", padx=5)
+        self.page_label = tk.Label(pager, font=("Arial", 10), bg=bg)
+        self.page_label.pack(side="left", padx=10)
+        self.next_btn = tk.Button(pager, text="Next ▶", font=("Arial", 10), width=8,
+                                  command=self.next_page)
+        self.next_btn.pack(side="left", padx=5)
+
+        pager.pack(side="bottom", pady=(10, 0))
+        scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+    def refresh(self):
+        """Fetch and show the current page"""
+        rows, self.total = self.fetch(self.offset, self.page_size, self.sort_key, self.descending)
+
+        # Only the rows of this page exist in the tree
+        self.tree.delete(*self.tree.get_children())
+        for index, row in enumerate(rows):
+            values = []
+            for key, _, _ in self.columns:
+                value = row.get(key, "")
+                formatter = self.formatters.get(key)
+                values.append(formatter(value) if formatter else value)
+            tag = self.row_tag(row) if self.row_tag else None
+            self.tree.insert("", "end", values=values, tags=(tag or ("odd" if index % 2 else "even"),))
+
+        last = self.offset + len(rows)
+        self.page_label.config(
+            text=f"{self.offset + 1 if rows else 0:,}–{last:,} of {self.total:,}")
+        self.prev_btn.config(state="normal" if self.offset > 0 else "disabled")
+        self.next_btn.config(state="normal" if last < self.total else "disabled")
+        self._update_headings()
+
+    def _update_headings(self):
+        """Mark the sorted column's heading with the sort direction"""
+        for key, heading, _ in self.columns:
+            if key == self.sort_key:
+                heading = f"{heading} {'▼' if self.descending else '▲'}"
+            self.tree.heading(key, text=heading)
+
+    def sort_by(self, key):
+        """Sort by a column; choosing the same column again flips the direction"""
+        if key == self.sort_key:
+            self.descending = not self.descending
+        else:
+            self.sort_key = key
+            self.descending = key not in self.ascending_keys
+        self.offset = 0
+        self.refresh()
+
+    def show_page_of(self, index):
+        """Jump to the page containing the row at index"""
+        self.offset = max(0, index) // self.page_size * self.page_size
+        self.refresh()
+
+    def next_page(self):
+        """Show the next page"""
+        if self.offset + self.page_size < self.total:
+            self.offset += self.page_size
+            self.refresh()
+
+    def prev_page(self):
+        """Show the previous page"""
+        if self.offset > 0:
+            self.offset = max(0, self.offset - self.page_size)
+            self.refresh()
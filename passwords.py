@@ -0,0 +1,97 @@
+"""
+Password hashing for GameMaster Quiz
+Salted scrypt hashes with tunable cost, verified off the UI thread in a worker pool
+"""
+
+import base64
+import hashlib
+import hmac
+import os
+import threading
+
+# Cost parameters; raising them upgrades each user's hash at their next login
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+PBKDF2_ITERATIONS = 600000
+SALT_BYTES = 16
+
+# Hashes written before per-user salts: SHA-256 over password + this salt
+LEGACY_SALT = "gamesalt2024"
+
+# hashlib releases the GIL while deriving keys, so threads use every core
+HASH_WORKERS = os.cpu_count() or 1
+
+
+def _b64(raw):
+    """Encode bytes without padding"""
+    return base64.b64encode(raw).decode().rstrip("=")
+
+
+def _unb64(text):
+    """Decode bytes encoded by _b64"""
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+def _scrypt(password, salt, n, r, p):
+    """Derive a scrypt key"""
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, maxmem=256 * r * n, dklen=32)
+
+
+def _pbkdf2(password, salt, iterations):
+    """Derive a PBKDF2-SHA256 key"""
+    return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+
+
+def hash_password(password):
+    """Hash a password with a fresh salt; returns the encoded hash string"""
+    salt = os.urandom(SALT_BYTES)
+    if hasattr(hashlib, "scrypt"):
+        key = _scrypt(password, salt, SCRYPT_N, SCRYPT_R, SCRYPT_P)
+        return f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${_b64(salt)}${_b64(key)}"
+
+    # Python builds without OpenSSL scrypt
+    key = _pbkdf2(password, salt, PBKDF2_ITERATIONS)
+    return f"pbkdf2_sha256${PBKDF2_ITERATIONS}${_b64(salt)}${_b64(key)}"
+
+
+def verify_password(password, encoded):
+    """Check a password against an encoded hash of any supported scheme"""
+    parts = encoded.split("$")
+    try:
+        if parts[0] == "scrypt" and len(parts) == 6:
+            n, r, p = int(parts[1]), int(parts[2]), int(parts[3])
+            key = _scrypt(password, _unb64(parts[4]), n, r, p)
+            return hmac.compare_digest(key, _unb64(parts[5]))
+
+        if parts[0] == "pbkdf2_sha256" and len(parts) == 4:
+            key = _pbkdf2(password, _unb64(parts[2]), int(parts[1]))
+            return hmac.compare_digest(key, _unb64(parts[3]))
+    except ValueError:
+        # Corrupt hash fields never match
+        return False
+
+    legacy = hashlib.sha256((password + LEGACY_SALT).encode()).hexdigest()
+    return hmac.compare_digest(legacy, encoded)
+
+
+def needs_rehash(encoded):
+    """Check if a hash uses a legacy scheme or outdated cost parameters"""
+    if hasattr(hashlib, "scrypt"):
+        return encoded.split("$")[:4] != ["scrypt", str(SCRYPT_N), str(SCRYPT_R), str(SCRYPT_P)]
+    return encoded.split("$")[:2] != ["pbkdf2_sha256", str(PBKDF2_ITERATIONS)]
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def hash_pool():
+    """Get the shared, bounded pool that runs password hashing"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Imported on first use to keep it off the startup path
+            from concurrent.futures import ThreadPoolExecutor
+            _pool = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="password-hash")
+        return _pool
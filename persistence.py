@@ -0,0 +1,72 @@
+"""
+Write coalescing for GameMaster Quiz
+Tracks which stores changed and saves each one once per burst of changes
+"""
+
+import threading
+
+FLUSH_DELAY = 2.0
+MAX_PENDING_CHANGES = 50
+
+
+def thread_scheduler(delay, callback):
+    """Run callback after delay seconds on a timer thread; returns a cancel function"""
+    timer = threading.Timer(delay, callback)
+    timer.daemon = True
+    timer.start()
+    return timer.cancel
+
+
+class PersistenceManager:
+    """Saves dirty stores on a debounce timer, a change threshold, an explicit flush or shutdown"""
+
+    def __init__(self, delay=FLUSH_DELAY, max_pending=MAX_PENDING_CHANGES, scheduler=thread_scheduler):
+        """Initialize persistence manager"""
+        self.delay = delay
+        self.max_pending = max_pending
+        self.scheduler = scheduler
+        self.stores = {}
+        self.pending = {}
+        self.lock = threading.RLock()
+        self._cancel_timer = None
+
+    def register(self, name, save):
+        """Register a store and the function that saves it"""
+        with self.lock:
+            self.stores[name] = save
+            self.pending.setdefault(name, 0)
+
+    def mark_dirty(self, name):
+        """Record a change to a store"""
+        with self.lock:
+            self.pending[name] = self.pending.get(name, 0) + 1
+            if self.pending[name] >= self.max_pending:
+                self.flush(name)
+                return
+
+            # Debounce: every change pushes the deadline back
+            if self._cancel_timer:
+                self._cancel_timer()
+            self._cancel_timer = self.scheduler(self.delay, self.flush)
+
+    def is_dirty(self, name):
+        """Check if a store has unsaved changes"""
+        with self.lock:
+            return self.pending.get(name, 0) > 0
+
+    def flush(self, name=None):
+        """Save one dirty store, or all of them"""
+        with self.lock:
+            names = [name] if name else list(self.stores)
+            for store in names:
+                if self.pending.get(store, 0) > 0:
+                    self.pending[store] = 0
+                    self.stores[store]()
+
+            if not any(self.pending.values()) and self._cancel_timer:
+                self._cancel_timer()
+                self._cancel_timer = None
+
+    def shutdown(self):
+        """Save everything that is still dirty"""
+        self.flush()
@@ -0,0 +1,239 @@
+"""
+Question banks for GameMaster Quiz
+Very large quizzes kept as one JSON question per line, read record by record through an offset index
+"""
+
+import argparse
+import json
+import mmap
+import os
+import shutil
+import struct
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+
+from durable import write_bytes_atomic
+from questions import compact_question
+
+BANKS_DIR = "banks"
+DEFAULT_QUESTIONS_PER_GAME = 10
+INDEX_SUFFIX = ".idx"
+OPEN_BANKS_SIZE = 16  # banks kept mapped; each holds two file descriptors
+
+# Index file: magic, then size, mtime_ns and record count of the bank it was built
+# from, then count + 1 little-endian uint64 offsets (the last one is the file size)
+INDEX_MAGIC = b"GMQBIDX1"
+INDEX_HEADER = struct.Struct("<8sQQQ")
+RECORD_RANGE = struct.Struct("<QQ")
+
+
+def bank_signature(path):
+    """Get (size, mtime_ns) of a bank file"""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def build_index(path):
+    """Scan a bank file and write its offset index; returns the number of questions"""
+    size, mtime_ns = bank_signature(path)
+    offsets = array('Q')
+    position = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            # Blank lines stay attached to the record before them
+            if line.strip():
+                offsets.append(position)
+            position += len(line)
+    count = len(offsets)
+    offsets.append(position)
+
+    if sys.byteorder != "little":
+        offsets.byteswap()
+    write_bytes_atomic(path + INDEX_SUFFIX,
+                       INDEX_HEADER.pack(INDEX_MAGIC, size, mtime_ns, count) + offsets.tobytes())
+    return count
+
+
+def _map_file(path):
+    """Map a file read-only, or get None for an empty file"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class QuestionBank:
+    """Read-only sequence of Questions that parses only the records it is asked for"""
+
+    def __init__(self, path, per_game=None):
+        """Open a bank, building its index if it is missing or stale"""
+        self.path = path
+        self.per_game = per_game or DEFAULT_QUESTIONS_PER_GAME
+        self.signature = bank_signature(path)
+        self.lock = threading.Lock()
+
+        self.index = self._open_index()
+        if self.index is None:
+            build_index(path)
+            self.index = self._open_index()
+        self.count = INDEX_HEADER.unpack_from(self.index)[3]
+        self.data = _map_file(path) if self.count else None
+        self.closed = False
+
+    def _open_index(self):
+        """Map the index file if it matches the bank, else None"""
+        try:
+            index = _map_file(self.path + INDEX_SUFFIX)
+        except FileNotFoundError:
+            return None
+        if index is None or len(index) < INDEX_HEADER.size:
+            return None
+        magic, size, mtime_ns, count = INDEX_HEADER.unpack_from(index)
+        if (magic != INDEX_MAGIC or (size, mtime_ns) != self.signature
+                or len(index) != INDEX_HEADER.size + 8 * (count + 1)):
+            index.close()
+            return None
+        return index
+
+    def is_current(self):
+        """Check if the bank file is unchanged since it was opened"""
+        try:
+            return bank_signature(self.path) == self.signature
+        except OSError:
+            return False
+
+    def close(self):
+        """Unmap the bank and its index; they are mapped again on the next read"""
+        with self.lock:
+            for mapping in (self.index, self.data):
+                if mapping is not None:
+                    mapping.close()
+            self.index = self.data = None
+            self.closed = True
+
+    def _reopen(self):
+        """Map a closed bank again; raises ValueError if the file changed since it was opened"""
+        if not self.is_current():
+            raise ValueError(f"{self.path} changed after it was closed")
+        index = self._open_index()
+        if index is None:
+            raise ValueError(f"{self.path} has no usable index")
+        self.index = index
+        self.data = _map_file(self.path) if self.count else None
+        self.closed = False
+
+    def __len__(self):
+        """Number of questions in the bank"""
+        return self.count
+
+    def __getitem__(self, position):
+        """Read and parse one question"""
+        if position < 0:
+            position += self.count
+        if not 0 <= position < self.count:
+            raise IndexError("question index out of range")
+        with self.lock:
+            if self.closed:
+                self._reopen()
+            start, end = RECORD_RANGE.unpack_from(self.index, INDEX_HEADER.size + 8 * position)
+            record = self.data[start:end]
+        return compact_question(json.loads(record))
+
+
+# One bank per file, whatever quiz plays it; evicted banks are unmapped and mapped again
+# by a game still playing them. Changed banks are only dropped: games holding the old
+# version keep reading their own mapping until they end
+_open_banks = OrderedDict()
+_open_banks_lock = threading.Lock()
+
+
+def open_bank(path, per_game=None):
+    """Get an open QuestionBank for path, reopening it if the file changed"""
+    with _open_banks_lock:
+        bank = _open_banks.get(path)
+        if bank is not None and bank.is_current():
+            # Questions per game is a setting of the quiz, not of the file
+            bank.per_game = per_game or DEFAULT_QUESTIONS_PER_GAME
+            _open_banks.move_to_end(path)
+            return bank
+
+    bank = QuestionBank(path, per_game)
+    with _open_banks_lock:
+        _open_banks[path] = bank
+        _open_banks.move_to_end(path)
+        evicted = [_open_banks.popitem(last=False)[1] for _ in range(len(_open_banks) - OPEN_BANKS_SIZE)]
+    for old in evicted:
+        if old.is_current():
+            old.close()
+    return bank
+
+
+def bank_path(data_dir, quiz_data):
+    """Get the bank file a quiz refers to; banks are always looked up in data/banks"""
+    return os.path.join(data_dir, BANKS_DIR, os.path.basename(quiz_data["question_bank"]))
+
+
+def bank_files(data_dir):
+    """Get the bank files of a data directory (their indexes are rebuilt on demand)"""
+    banks_dir = os.path.join(data_dir, BANKS_DIR)
+    if not os.path.isdir(banks_dir):
+        return []
+    return sorted(os.path.join(banks_dir, name) for name in os.listdir(banks_dir) if name.endswith(".jsonl"))
+
+
+def add_bank(storage, name, source, per_game=DEFAULT_QUESTIONS_PER_GAME, category=None,
+             description="", is_custom=True):
+    """Copy a JSONL file into the banks directory and register it as a quiz"""
+    banks_dir = os.path.join(storage.data_dir, BANKS_DIR)
+    os.makedirs(banks_dir, exist_ok=True)
+    target = os.path.join(banks_dir, f"{name}.jsonl")
+    if os.path.abspath(source) != os.path.abspath(target):
+        shutil.copyfile(source, target)
+
+    count = build_index(target)
+    storage.save_quiz(name, {
+        "category": category or name.upper(),
+        "description": description or f"Bank of {count} questions, {per_game} per game",
+        "created_by": "Admin",
+        "question_bank": os.path.basename(target),
+        "questions_per_game": per_game,
+        "question_count": count,
+        "questions": []
+    }, is_custom)
+    return count
+
+
+def main(argv=None):
+    """Question bank command line tool"""
+    parser = argparse.ArgumentParser(description="Manage GameMaster Quiz question banks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="add a JSONL file of questions as a quiz")
+    add.add_argument("name")
+    add.add_argument("source", help="one {question, options, correct_answer} object per line")
+    add.add_argument("--per-game", type=int, default=DEFAULT_QUESTIONS_PER_GAME)
+    add.add_argument("--category")
+    add.add_argument("--description", default="")
+    add.add_argument("--default", action="store_true", help="add as a default quiz instead of a custom one")
+
+    index = commands.add_parser("index", help="rebuild the offset index of a bank file")
+    index.add_argument("path")
+
+    args = parser.parse_args(argv)
+    if args.command == "index":
+        print(f"Indexed {build_index(args.path)} questions in {args.path}")
+        return 0
+
+    from storage import open_storage
+    storage = open_storage()
+    count = add_bank(storage, args.name, args.source, args.per_game, args.category,
+                     args.description, is_custom=not args.default)
+    print(f"Added question bank {args.name} with {count} questions ({args.per_game} per game)")
+    storage.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,430 @@
+"""
+Per-question answer statistics for GameMaster Quiz
+Counters per quiz in flat arrays, updated from batches of finished games and reported in vectorized passes
+"""
+
+import math
+import os
+import struct
+import sys
+import threading
+import zlib
+from array import array
+
+from durable import write_bytes_atomic
+from persistence import MAX_PENDING_CHANGES
+
+try:
+    import numpy as np
+except ImportError:  # Same results through the array module, one answer at a time
+    np = None
+
+STATS_DIR = "stats"
+STATS_SUFFIX = ".stats"
+MIN_ANSWERS = 20  # answers a question needs before its discrimination and distractors are reported
+
+# Stats file: magic, question count, histogram width and quiz version, then every counter
+# array in field order, the option histogram (questions x width) and two byte arrays
+# with each question's option count and correct answer
+STATS_MAGIC = b"GMQSTAT1"
+STATS_HEADER = struct.Struct("<8sIII")
+COUNT_FIELDS = ("shown", "answered", "correct", "scored", "scored_correct")
+SUM_FIELDS = ("answer_ms", "rest", "rest_correct", "rest_sq")
+
+
+def quiz_version(questions):
+    """Get a checksum of a quiz's questions; stats kept for another version start over"""
+    # Banks are only replaced as a whole, and checksumming 100k records isn't worth it
+    signature = getattr(questions, "signature", None)
+    if signature is not None:
+        return zlib.crc32(repr(signature).encode())
+    version = 0
+    for question in questions:
+        version = zlib.crc32(repr(tuple(question)).encode(), version)
+    return version
+
+
+def _zeros(typecode, size):
+    """Get a zero-filled counter array"""
+    if np is not None:
+        return np.zeros(size, dtype={"Q": "<u8", "d": "<f8", "B": "u1"}[typecode])
+    return array(typecode, bytes(array(typecode).itemsize * size))
+
+
+def _read(typecode, data, offset, size):
+    """Read a counter array of the stats file; returns (array, next offset)"""
+    itemsize = array(typecode).itemsize
+    end = offset + itemsize * size
+    if np is not None:
+        values = np.frombuffer(data, dtype={"Q": "<u8", "d": "<f8", "B": "u1"}[typecode],
+                               count=size, offset=offset).copy()
+    else:
+        values = array(typecode)
+        values.frombytes(data[offset:end])
+        if sys.byteorder != "little":
+            values.byteswap()
+    return values, end
+
+
+def _to_bytes(values):
+    """Get the little-endian bytes of a counter array"""
+    if np is not None:
+        return values.tobytes()
+    if sys.byteorder != "little" and values.itemsize > 1:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+class QuizStats:
+    """Answer counters for every question of one quiz version"""
+
+    def __init__(self, count, width=4, version=0):
+        """Create empty counters for count questions with up to width options"""
+        self.count = count
+        self.width = width
+        self.version = version
+        self.counts = {field: _zeros("Q", count) for field in COUNT_FIELDS}
+        self.sums = {field: _zeros("d", count) for field in SUM_FIELDS}
+        self.options = _zeros("Q", count * width)
+        self.option_count = _zeros("B", count)
+        self.correct_answer = _zeros("B", count)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Decode a stats file; raises ValueError if it is not one"""
+        if len(data) < STATS_HEADER.size:
+            raise ValueError("Not a stats file")
+        magic, count, width, version = STATS_HEADER.unpack_from(data)
+        if magic != STATS_MAGIC:
+            raise ValueError("Not a stats file")
+        expected = STATS_HEADER.size + 8 * count * (len(COUNT_FIELDS) + len(SUM_FIELDS) + width) + 2 * count
+        if len(data) != expected:
+            raise ValueError("Truncated stats file")
+
+        stats = cls(0, width, version)
+        stats.count = count
+        offset = STATS_HEADER.size
+        for field in COUNT_FIELDS:
+            stats.counts[field], offset = _read("Q", data, offset, count)
+        for field in SUM_FIELDS:
+            stats.sums[field], offset = _read("d", data, offset, count)
+        stats.options, offset = _read("Q", data, offset, count * width)
+        stats.option_count, offset = _read("B", data, offset, count)
+        stats.correct_answer, offset = _read("B", data, offset, count)
+        return stats
+
+    def to_bytes(self):
+        """Encode the counters as a stats file"""
+        parts = [STATS_HEADER.pack(STATS_MAGIC, self.count, self.width, self.version)]
+        parts.extend(_to_bytes(self.counts[field]) for field in COUNT_FIELDS)
+        parts.extend(_to_bytes(self.sums[field]) for field in SUM_FIELDS)
+        parts.extend(_to_bytes(values) for values in (self.options, self.option_count, self.correct_answer))
+        return b"".join(parts)
+
+    def widen(self, width):
+        """Make room in the option histogram for questions with up to width options"""
+        if width <= self.width:
+            return
+        options = _zeros("Q", self.count * width)
+        for question in range(self.count):
+            start = question * self.width
+            options[question * width:question * width + self.width] = self.options[start:start + self.width]
+        self.options = options
+        self.width = width
+
+    def add(self, batch):
+        """Add a batch of answers, given as parallel arrays (see AnswerBatch)"""
+        self.widen(max(batch.option_count, default=0))
+        if np is not None:
+            self._add_vectorized(batch)
+            return
+
+        for i, question in enumerate(batch.question):
+            self.counts["shown"][question] += 1
+            option = batch.option[i]
+            if option < 0:
+                continue  # shown, but the game ended before it was answered
+            correct = batch.correct[i]
+            self.counts["answered"][question] += 1
+            self.counts["correct"][question] += correct
+            self.options[question * self.width + option] += 1
+            self.sums["answer_ms"][question] += batch.answer_ms[i]
+            self.option_count[question] = batch.option_count[i]
+            self.correct_answer[question] = batch.correct_answer[i]
+            if batch.scored[i]:
+                rest = batch.rest[i]
+                self.counts["scored"][question] += 1
+                self.counts["scored_correct"][question] += correct
+                self.sums["rest"][question] += rest
+                self.sums["rest_correct"][question] += rest * correct
+                self.sums["rest_sq"][question] += rest * rest
+
+    def _add_vectorized(self, batch):
+        """Add a batch with one bincount per counter"""
+        count = self.count
+        question = np.frombuffer(batch.question, dtype=np.uint32).astype(np.intp)
+        option = np.frombuffer(batch.option, dtype=np.int16).astype(np.intp)
+        self.counts["shown"] += np.bincount(question, minlength=count).astype(np.uint64)
+
+        answered = option >= 0
+        question, option = question[answered], option[answered]
+        correct = np.frombuffer(batch.correct, dtype=np.uint8)[answered].astype(np.float64)
+        rest = np.frombuffer(batch.rest, dtype=np.float64)[answered]
+        scored = np.frombuffer(batch.scored, dtype=np.uint8)[answered].astype(np.float64)
+
+        def total(weights=None):
+            return np.bincount(question, weights=weights, minlength=count)
+
+        self.counts["answered"] += total().astype(np.uint64)
+        self.counts["correct"] += total(correct).astype(np.uint64)
+        self.counts["scored"] += total(scored).astype(np.uint64)
+        self.counts["scored_correct"] += total(scored * correct).astype(np.uint64)
+        self.sums["answer_ms"] += total(np.frombuffer(batch.answer_ms, dtype=np.float64)[answered])
+        self.sums["rest"] += total(scored * rest)
+        self.sums["rest_correct"] += total(scored * rest * correct)
+        self.sums["rest_sq"] += total(scored * rest * rest)
+        self.options += np.bincount(question * self.width + option,
+                                    minlength=count * self.width).astype(np.uint64)
+        self.option_count[question] = np.frombuffer(batch.option_count, dtype=np.uint8)[answered]
+        self.correct_answer[question] = np.frombuffer(batch.correct_answer, dtype=np.uint8)[answered]
+
+    def report(self, min_answers=MIN_ANSWERS):
+        """Get per-question metrics as lists: answered, correct rate, difficulty, discrimination,
+        average answer time and the distractors nobody chose"""
+        if np is not None:
+            return self._report_vectorized(min_answers)
+
+        report = {key: [] for key in ("answered", "correct_rate", "difficulty", "discrimination",
+                                      "answer_ms", "never_chosen")}
+        for question in range(self.count):
+            answered = self.counts["answered"][question]
+            rate = self.counts["correct"][question] / answered if answered else None
+            report["answered"].append(answered)
+            report["correct_rate"].append(rate)
+            report["difficulty"].append(None if rate is None else 1 - rate)
+            report["answer_ms"].append(self.sums["answer_ms"][question] / answered if answered else None)
+            report["discrimination"].append(discrimination(
+                self.counts["scored"][question], self.counts["scored_correct"][question],
+                self.sums["rest"][question], self.sums["rest_correct"][question],
+                self.sums["rest_sq"][question], min_answers))
+
+            never = []
+            if answered >= min_answers:
+                start = question * self.width
+                never = [option for option in range(self.option_count[question])
+                         if option != self.correct_answer[question] and not self.options[start + option]]
+            report["never_chosen"].append(never)
+        return report
+
+    def _report_vectorized(self, min_answers):
+        """Compute the report for every question in a few array passes"""
+        answered = self.counts["answered"].astype(np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rate = np.where(answered > 0, self.counts["correct"] / answered, np.nan)
+            answer_ms = np.where(answered > 0, self.sums["answer_ms"] / answered, np.nan)
+
+            # Point-biserial correlation between answering correctly and the rest of the game
+            scored = self.counts["scored"].astype(np.float64)
+            scored_correct = self.counts["scored_correct"].astype(np.float64)
+            scored_wrong = scored - scored_correct
+            mean_correct = self.sums["rest_correct"] / scored_correct
+            mean_wrong = (self.sums["rest"] - self.sums["rest_correct"]) / scored_wrong
+            mean = self.sums["rest"] / scored
+            spread = np.sqrt(np.maximum(self.sums["rest_sq"] / scored - mean * mean, 0))
+            p = scored_correct / scored
+            r = (mean_correct - mean_wrong) / spread * np.sqrt(p * (1 - p))
+            valid = (scored >= min_answers) & (scored_correct > 0) & (scored_wrong > 0) & (spread > 1e-12)
+            r = np.where(valid, r, np.nan)
+
+        option_index = np.arange(self.width)
+        offered = option_index[None, :] < self.option_count[:, None]
+        distractor = offered & (option_index[None, :] != self.correct_answer[:, None])
+        unused = distractor & (self.options.reshape(self.count, self.width) == 0)
+        unused &= (answered >= min_answers)[:, None]
+
+        def values(column):
+            # NaN is the only value not equal to itself
+            return [value if value == value else None for value in column.tolist()]
+
+        never_chosen = [[] for _ in range(self.count)]
+        for question, option in zip(*(axis.tolist() for axis in np.nonzero(unused))):
+            never_chosen[question].append(option)
+        return {
+            "answered": self.counts["answered"].tolist(),
+            "correct_rate": values(rate),
+            "difficulty": values(1 - rate),
+            "discrimination": values(r),
+            "answer_ms": values(answer_ms),
+            "never_chosen": never_chosen
+        }
+
+
+def discrimination(scored, scored_correct, rest, rest_correct, rest_sq, min_answers=MIN_ANSWERS):
+    """Point-biserial correlation of one question from its sums, or None if it can't be told yet"""
+    scored_wrong = scored - scored_correct
+    if scored < min_answers or not scored_correct or not scored_wrong:
+        return None
+    mean = rest / scored
+    spread = math.sqrt(max(rest_sq / scored - mean * mean, 0))
+    if spread <= 1e-12:
+        return None
+    mean_correct = rest_correct / scored_correct
+    mean_wrong = (rest - rest_correct) / scored_wrong
+    p = scored_correct / scored
+    return (mean_correct - mean_wrong) / spread * math.sqrt(p * (1 - p))
+
+
+class AnswerBatch:
+    """Answers of many games to one quiz, in parallel compact arrays"""
+
+    def __init__(self):
+        """Initialize an empty batch"""
+        self.question = array('I')
+        self.option = array('h')  # -1 for a question shown but not answered
+        self.correct = array('B')
+        self.answer_ms = array('d')
+        self.rest = array('d')  # share of the game's other questions answered correctly
+        self.scored = array('B')  # 1 if the game had other answers to compute rest from
+        self.option_count = array('B')
+        self.correct_answer = array('B')
+
+    def __len__(self):
+        """Number of answers in the batch"""
+        return len(self.question)
+
+    def add_game(self, answers, unanswered=None):
+        """Add one game's (question, option, correct_answer, option_count, answer_ms) answers"""
+        answered = len(answers)
+        total_correct = sum(1 for _, option, correct, _, _ in answers if option == correct)
+        for question, option, correct, option_count, answer_ms in answers:
+            if not 0 <= option < option_count:
+                option = -1  # an answer that isn't one of the options counts as not answered
+            is_correct = option == correct
+            self.question.append(question)
+            self.option.append(option)
+            self.correct.append(is_correct)
+            self.answer_ms.append(answer_ms)
+            self.scored.append(answered > 1)
+            self.rest.append((total_correct - is_correct) / (answered - 1) if answered > 1 else 0.0)
+            self.option_count.append(min(option_count, 255))
+            self.correct_answer.append(min(correct, 255))
+        if unanswered is not None:
+            self.question.append(unanswered)
+            self.option.append(-1)
+            for values in (self.correct, self.scored, self.option_count, self.correct_answer):
+                values.append(0)
+            self.answer_ms.append(0.0)
+            self.rest.append(0.0)
+
+
+class AnswerStats:
+    """Buffers finished games and folds them into per-quiz stats files in batches"""
+
+    def __init__(self, data_dir, persistence=None, batch_games=MAX_PENDING_CHANGES):
+        """Initialize answer stats; without a persistence manager they flush every batch_games games"""
+        self.stats_dir = os.path.join(data_dir, STATS_DIR)
+        self.persistence = persistence
+        self.batch_games = batch_games
+        self.pending = {}
+        self.pending_games = 0
+        self.versions = {}
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        if persistence:
+            persistence.register("answer_stats", self.flush)
+
+    def stats_path(self, quiz_name, is_custom):
+        """Get the stats file of a quiz"""
+        return os.path.join(self.stats_dir, "custom" if is_custom else "default", quiz_name + STATS_SUFFIX)
+
+    def record_game(self, quiz_name, is_custom, questions, answers, unanswered=None):
+        """Queue one game's answers; unanswered is a question that was shown but never answered"""
+        if not answers and unanswered is None:
+            return
+        key = (quiz_name, bool(is_custom))
+        version = self.version(quiz_name, is_custom, questions)
+        with self.lock:
+            entry = self.pending.get(key)
+            if entry is None or entry[0] != version:
+                # A new quiz version gets its own batch; the old one is flushed first
+                if entry is not None:
+                    self.pending.pop(key)
+                    self._write(key, *entry[1:])
+                entry = self.pending[key] = (version, questions, AnswerBatch())
+            entry[2].add_game(answers, unanswered)
+            self.pending_games += 1
+            full = self.pending_games >= self.batch_games
+
+        if self.persistence:
+            self.persistence.mark_dirty("answer_stats")
+        elif full:
+            self.flush()
+
+    def flush(self):
+        """Fold every pending batch into its stats file"""
+        with self.lock:
+            pending, self.pending = self.pending, {}
+            self.pending_games = 0
+        for key, (_, questions, batch) in pending.items():
+            self._write(key, questions, batch)
+
+    def clear(self):
+        """Drop pending answers and cached versions, e.g. after the stats files were replaced"""
+        with self.lock:
+            self.pending = {}
+            self.pending_games = 0
+            self.versions = {}
+
+    def version(self, quiz_name, is_custom, questions):
+        """Get a quiz's version, computed once per loaded copy of the quiz; equal copies get equal versions"""
+        key = (quiz_name, bool(is_custom))
+        cached = self.versions.get(key)
+        if cached is None or cached[0] is not questions:
+            cached = self.versions[key] = (questions, quiz_version(questions))
+        return cached[1]
+
+    def _write(self, key, questions, batch):
+        """Add a batch to a quiz's stats file"""
+        with self.flush_lock:
+            # Stats kept for an older version of the quiz start over: its questions moved
+            stats = self.load_current(*key, questions)
+            if stats is None:
+                stats = QuizStats(len(questions), version=self.version(*key, questions))
+            try:
+                stats.add(batch)
+                path = self.stats_path(*key)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                write_bytes_atomic(path, stats.to_bytes())
+            except (OSError, IndexError) as e:
+                print(f"Warning: could not save answer stats for {key[0]}: {e}")
+
+    def load(self, quiz_name, is_custom):
+        """Load a quiz's stats, or None if there are none"""
+        try:
+            with open(self.stats_path(quiz_name, is_custom), 'rb') as f:
+                return QuizStats.from_bytes(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Warning: ignoring unreadable answer stats for {quiz_name}: {e}")
+            return None
+
+    def load_current(self, quiz_name, is_custom, questions):
+        """Load a quiz's stats if they were kept for this version of its questions"""
+        stats = self.load(quiz_name, is_custom)
+        if stats is None or stats.count != len(questions):
+            return None
+        if stats.version != self.version(quiz_name, is_custom, questions):
+            return None
+        return stats
+
+    def stats_files(self):
+        """Get every stats file, for backups"""
+        files = []
+        for kind in ("default", "custom"):
+            directory = os.path.join(self.stats_dir, kind)
+            if os.path.isdir(directory):
+                files.extend(os.path.join(directory, name) for name in sorted(os.listdir(directory))
+                             if name.endswith(STATS_SUFFIX))
+        return files
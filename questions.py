@@ -0,0 +1,48 @@
+"""
+Compact questions for GameMaster Quiz
+Quizzes are parsed once into immutable tuples; each game only carries an order of indices
+"""
+
+import random
+from array import array
+from collections import namedtuple
+
+# Tuple-sized, read-only and safe to share between every game and thread
+Question = namedtuple("Question", ("question", "options", "correct_answer"))
+
+
+def compact_question(question_data):
+    """Convert one question dict of the JSON schema into a Question"""
+    return Question(question_data["question"], tuple(question_data["options"]),
+                    int(question_data["correct_answer"]))
+
+
+def compact_questions(questions):
+    """Convert a list of question dicts into a tuple of Questions"""
+    return tuple(compact_question(question_data) for question_data in questions)
+
+
+def order_typecode(count):
+    """Get the smallest array typecode that can index count questions"""
+    return 'H' if count <= 0xFFFF else 'I'
+
+
+def question_order(count, rng=random, sample=None):
+    """Get a shuffled order of question indices, or of a sample of them, in a compact array"""
+    typecode = order_typecode(count)
+    if sample is not None and sample < count:
+        # Drawing from a range never builds the full index list
+        return array(typecode, rng.sample(range(count), max(0, sample)))
+    order = array(typecode, range(count))
+    rng.shuffle(order)
+    return order
+
+
+def empty_order(count, length):
+    """Get a zero-filled order of length indices into count questions, to be filled in as a game goes"""
+    return array(order_typecode(count), [0]) * length
+
+
+def question_rng(seed=None):
+    """Get the random source for a game; a seed makes its question order reproducible"""
+    return random if seed is None else random.Random(seed)
@@ -0,0 +1,78 @@
+"""
+Quiz cache for GameMaster Quiz
+Keeps parsed quiz files in memory until they change on disk
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from questions import compact_questions
+
+QUIZ_CACHE_SIZE = 128
+
+
+class QuizCache:
+    """LRU cache of parsed quiz files, validated against file mtime and size"""
+
+    def __init__(self, max_entries=QUIZ_CACHE_SIZE):
+        """Initialize quiz cache"""
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, path):
+        """Get the parsed quiz at path, re-reading it only if the file changed"""
+        # Cached quiz data is shared between all readers and must not be mutated
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with self.lock:
+            cached = self.entries.get(path)
+            if cached and cached[0] == signature:
+                self.entries.move_to_end(path)
+                self.hits += 1
+                return cached[1]
+
+        with open(path, 'r') as f:
+            quiz_data = json.load(f)
+
+        with self.lock:
+            self.misses += 1
+            # [signature, parsed quiz, compact questions built on first use]
+            self.entries[path] = [signature, quiz_data, None]
+            self.entries.move_to_end(path)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+        return quiz_data
+
+    def load_questions(self, path):
+        """Get the compact questions of the quiz at path, built once per file version"""
+        quiz_data = self.load(path)
+        with self.lock:
+            cached = self.entries.get(path)
+            if cached and cached[1] is quiz_data and cached[2] is not None:
+                return cached[2]
+
+        questions = compact_questions(quiz_data.get("questions", []))
+        with self.lock:
+            cached = self.entries.get(path)
+            if cached and cached[1] is quiz_data:
+                cached[2] = questions
+        return questions
+
+    def invalidate(self, path=None):
+        """Forget one cached quiz, or all of them"""
+        with self.lock:
+            if path is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(path, None)
+
+
+# Shared by every quiz reader in the process
+shared_cache = QuizCache()
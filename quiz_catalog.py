@@ -0,0 +1,118 @@
+"""
+Quiz catalog for GameMaster Quiz
+Maintains data/quiz_index.json with the metadata the quiz screens need
+"""
+
+import json
+import os
+
+from durable import write_json_atomic
+
+INDEX_FILENAME = "quiz_index.json"
+LEGACY_INDEX_FILENAME = "index.json"  # kept among the default quizzes before; a quiz may use the name now
+
+
+def catalog_entry(name, location, is_custom, quiz_data):
+    """Build the catalog metadata of a quiz"""
+    return {
+        "name": name,
+        "location": location,
+        "is_custom": bool(is_custom),
+        "category": quiz_data.get("category"),
+        "description": quiz_data.get("description"),
+        "created_by": quiz_data.get("created_by"),
+        "question_count": quiz_data.get("question_count", 0) if quiz_data.get("question_bank")
+                          else len(quiz_data.get("questions", []))
+    }
+
+
+class QuizCatalog:
+    """Index of quiz metadata, kept in one small file outside the quiz directories"""
+
+    def __init__(self, index_file, quizzes_dir, custom_dir, loader):
+        """Initialize quiz catalog; loader(path) parses a quiz file"""
+        self.index_file = index_file
+        self.quizzes_dir = quizzes_dir
+        self.custom_dir = custom_dir
+        self.loader = loader
+        self._entries = None
+        self._indexed_mtime = None
+
+    def _custom_mtime(self):
+        """Get the mtime of the custom quiz directory"""
+        try:
+            return os.stat(self.custom_dir).st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    def entries(self):
+        """Get all catalog entries sorted by (is_custom, name)"""
+        # Custom quiz files copied in by hand change the directory mtime;
+        # delete quiz_index.json to pick up hand-made changes to default quizzes
+        if self._entries is not None and self._indexed_mtime != self._custom_mtime():
+            self._entries = None
+        self._ensure_loaded()
+        return sorted(self._entries.values(), key=lambda e: (e["is_custom"], e["name"]))
+
+    def _read_index(self):
+        """Load the index file if it is still current; returns success"""
+        try:
+            with open(self.index_file, 'r') as f:
+                index = json.load(f)
+        except (json.JSONDecodeError, FileNotFoundError):
+            return False
+
+        if index.get("custom_mtime") != self._custom_mtime():
+            return False
+
+        self._entries = {(e["is_custom"], e["name"]): e for e in index.get("quizzes", [])}
+        self._indexed_mtime = index["custom_mtime"]
+        return True
+
+    def _write_index(self):
+        """Write the index file"""
+        self._indexed_mtime = self._custom_mtime()
+        index = {"custom_mtime": self._indexed_mtime, "quizzes": list(self._entries.values())}
+        write_json_atomic(self.index_file, index, indent=None, separators=(',', ':'))
+
+    def rebuild(self):
+        """Scan both quiz directories and rewrite the index"""
+        self._entries = {}
+        for directory, is_custom in ((self.quizzes_dir, False), (self.custom_dir, True)):
+            if not os.path.exists(directory):
+                continue
+            for filename in os.listdir(directory):
+                if not filename.endswith('.json'):
+                    continue
+                filepath = os.path.join(directory, filename)
+                if not os.path.isfile(filepath) or os.path.getsize(filepath) == 0:
+                    continue
+                try:
+                    quiz_data = self.loader(filepath)
+                except (json.JSONDecodeError, OSError):
+                    print(f"Skipping unreadable quiz file: {filepath}")
+                    continue
+                # The old index, left in place by earlier versions, is not a quiz
+                if not is_custom and filename == LEGACY_INDEX_FILENAME and "custom_mtime" in quiz_data:
+                    os.remove(filepath)
+                    continue
+                name = filename[:-5]
+                self._entries[(is_custom, name)] = catalog_entry(name, filepath, is_custom, quiz_data)
+        self._write_index()
+
+    def _ensure_loaded(self):
+        """Load the index without re-validating entries already in memory"""
+        if self._entries is None and not self._read_index():
+            self.rebuild()
+
+    def update(self, name, location, is_custom, quiz_data):
+        """Add or refresh one quiz in the index"""
+        self._ensure_loaded()
+        self._entries[(bool(is_custom), name)] = catalog_entry(name, location, is_custom, quiz_data)
+        self._write_index()
+
+    def remove(self, name, is_custom):
+        """Drop one quiz from the index"""
+        self._ensure_loaded()
+        self._entries.pop((bool(is_custom), name), None)
+        self._write_index()
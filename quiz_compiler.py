@@ -0,0 +1,295 @@
+"""
+Compiled quizzes for GameMaster Quiz
+A binary quiz format read through mmap: header, fixed-width question records and a string table
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from collections import OrderedDict
+
+from durable import write_bytes_atomic, write_json_atomic
+from questions import Question
+
+COMPILED_SUFFIX = ".gmq"
+OPEN_QUIZZES_SIZE = 64  # compiled quizzes kept mapped; each holds a file descriptor
+COMPILED_DIR = "compiled"  # under the data directory, so compiling never touches the quiz directories
+FORMAT_MAGIC = b"GMQUIZC1"
+FORMAT_VERSION = 1
+
+# magic, version, options per record, question count, records offset, strings offset,
+# metadata string (offset, length), and the size and mtime_ns of the JSON it came from
+HEADER = struct.Struct("<8sHBxIIIIIQQ")
+QUESTION_KEYS = {"question", "options", "correct_answer"}
+
+
+def record_struct(max_options):
+    """Get the record layout: question (offset, length), option count, correct answer, options"""
+    return struct.Struct("<IIBB" + "II" * max_options)
+
+
+def source_signature(path):
+    """Get (size, mtime_ns) of a quiz JSON file"""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def compiled_path(json_path, compiled_dir=None):
+    """Get the compiled file that belongs to a quiz JSON file, in compiled_dir or next to it"""
+    base = os.path.splitext(json_path)[0]
+    if compiled_dir is not None:
+        base = os.path.join(compiled_dir, os.path.basename(base))
+    return base + COMPILED_SUFFIX
+
+
+def compile_quiz(quiz_data, signature=(0, 0)):
+    """Encode a quiz in the JSON schema; raises ValueError for content the format can't hold"""
+    questions = quiz_data.get("questions", [])
+    strings = bytearray()
+    refs = {}
+
+    def add_string(text):
+        # Repeated strings (True/False, common options) are stored once
+        if not isinstance(text, str):
+            raise ValueError(f"Expected a string, got {text!r}")
+        if text not in refs:
+            encoded = text.encode("utf-8")
+            refs[text] = (len(strings), len(encoded))
+            strings.extend(encoded)
+        return refs[text]
+
+    # Everything except the questions goes into one JSON string; the placeholder keeps key order
+    metadata = {key: (None if key == "questions" else value) for key, value in quiz_data.items()}
+    metadata.setdefault("questions", None)
+    meta_ref = add_string(json.dumps(metadata))
+
+    max_options = max((len(q.get("options", [])) for q in questions), default=0)
+    if max_options > 255:
+        raise ValueError("A question has more than 255 options")
+    record = record_struct(max_options)
+
+    records = bytearray(record.size * len(questions))
+    for i, question_data in enumerate(questions):
+        if set(question_data) - QUESTION_KEYS:
+            raise ValueError(f"Question {i + 1} has fields the compiled format does not keep")
+        correct = question_data["correct_answer"]
+        if not isinstance(correct, int) or not 0 <= correct <= 255:
+            raise ValueError(f"Question {i + 1} has an invalid correct_answer")
+
+        options = question_data["options"]
+        option_refs = []
+        for option in options:
+            option_refs.extend(add_string(option))
+        option_refs.extend((0, 0) * (max_options - len(options)))
+        record.pack_into(records, i * record.size, *add_string(question_data["question"]),
+                         len(options), correct, *option_refs)
+
+    records_offset = HEADER.size
+    strings_offset = records_offset + len(records)
+    header = HEADER.pack(FORMAT_MAGIC, FORMAT_VERSION, max_options, len(questions), records_offset,
+                         strings_offset, *meta_ref, *signature)
+    return header + bytes(records) + bytes(strings)
+
+
+class CompiledQuiz:
+    """Read-only sequence of Questions decoded from a memory-mapped compiled quiz"""
+
+    def __init__(self, path):
+        """Map a compiled quiz; raises ValueError if it is not one"""
+        self.path = path
+        self.lock = threading.Lock()
+        self.data = self._map()
+        if len(self.data) < HEADER.size:
+            self.data.close()
+            raise ValueError(f"{path} is not a compiled quiz")
+
+        self.header = self.data[:HEADER.size]
+        (magic, version, max_options, self.count, self.records_offset, self.strings_offset,
+         meta_offset, meta_length, size, mtime_ns) = HEADER.unpack(self.header)
+        if magic != FORMAT_MAGIC or version != FORMAT_VERSION:
+            self.data.close()
+            raise ValueError(f"{path} is not a compiled quiz (version {FORMAT_VERSION})")
+        self.record = record_struct(max_options)
+        self.source = (size, mtime_ns)
+        self.info = json.loads(self._string(self.data, meta_offset, meta_length))
+
+    def _map(self):
+        """Map the compiled file read-only"""
+        with open(self.path, 'rb') as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _mapped(self):
+        """Get the mapping, mapping the file again if the quiz was closed while a game still used it"""
+        if self.data is None:
+            data = self._map()
+            # The header carries the source signature, so the same header means the same quiz
+            if data[:HEADER.size] != self.header:
+                data.close()
+                raise ValueError(f"{self.path} changed after it was closed")
+            self.data = data
+        return self.data
+
+    def close(self):
+        """Unmap the file; it is mapped again on the next read"""
+        with self.lock:
+            if self.data is not None:
+                self.data.close()
+                self.data = None
+
+    def _string(self, data, offset, length):
+        """Decode one string of the string table"""
+        start = self.strings_offset + offset
+        return str(data[start:start + length], "utf-8")
+
+    def metadata(self):
+        """Get the quiz fields other than its questions"""
+        return dict(self.info)
+
+    def __len__(self):
+        """Number of questions"""
+        return self.count
+
+    def __getitem__(self, position):
+        """Decode one question"""
+        if position < 0:
+            position += self.count
+        if not 0 <= position < self.count:
+            raise IndexError("question index out of range")
+        with self.lock:
+            data = self._mapped()
+            fields = self.record.unpack_from(data, self.records_offset + position * self.record.size)
+            options = tuple(self._string(data, fields[4 + 2 * i], fields[5 + 2 * i]) for i in range(fields[2]))
+            return Question(self._string(data, fields[0], fields[1]), options, fields[3])
+
+
+def decompile_quiz(compiled):
+    """Get a CompiledQuiz back in the JSON schema"""
+    quiz_data = compiled.metadata()
+    quiz_data["questions"] = [
+        {"question": q.question, "options": list(q.options), "correct_answer": q.correct_answer}
+        for q in compiled
+    ]
+    return quiz_data
+
+
+def write_compiled(json_path, quiz_data, compiled_dir=None):
+    """Compile a quiz into compiled_dir or next to its JSON file, stamped with the JSON file's signature"""
+    path = compiled_path(json_path, compiled_dir)
+    if compiled_dir is not None:
+        os.makedirs(compiled_dir, exist_ok=True)
+    write_bytes_atomic(path, compile_quiz(quiz_data, source_signature(json_path)))
+    return path
+
+
+# Evicted quizzes are unmapped; a game still playing one maps it again on its next question.
+# Replaced or deleted versions can't be mapped again, so they are only dropped: the mapping
+# closes when the last game playing them ends
+_open_quizzes = OrderedDict()
+_open_quizzes_lock = threading.Lock()
+
+
+def _read_header(path):
+    """Get the header bytes of a compiled file, or None if it can't be read"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(HEADER.size)
+    except OSError:
+        return None
+
+
+def _remember(path, compiled):
+    """Keep a compiled quiz open, closing the least recently used beyond OPEN_QUIZZES_SIZE"""
+    with _open_quizzes_lock:
+        _open_quizzes[path] = compiled
+        _open_quizzes.move_to_end(path)
+        evicted = [_open_quizzes.popitem(last=False) for _ in range(len(_open_quizzes) - OPEN_QUIZZES_SIZE)]
+    for evicted_path, quiz in evicted:
+        if _read_header(evicted_path) == quiz.header:
+            quiz.close()
+
+
+def open_compiled(json_path, compiled_dir=None):
+    """Get the compiled form of a quiz JSON file, or None if it is missing or out of date"""
+    path = compiled_path(json_path, compiled_dir)
+    try:
+        signature = source_signature(json_path)
+    except OSError:
+        return None
+
+    with _open_quizzes_lock:
+        compiled = _open_quizzes.get(path)
+        if compiled is not None and compiled.source == signature:
+            _open_quizzes.move_to_end(path)
+            return compiled
+
+    try:
+        compiled = CompiledQuiz(path)
+    except (OSError, ValueError):
+        return None
+    if compiled.source != signature:
+        compiled.close()
+        return None
+    _remember(path, compiled)
+    return compiled
+
+
+def remove_compiled(json_path, compiled_dir=None):
+    """Delete the compiled file of a quiz, if any"""
+    path = compiled_path(json_path, compiled_dir)
+    with _open_quizzes_lock:
+        _open_quizzes.pop(path, None)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def main(argv=None):
+    """Quiz compiler command line tool"""
+    parser = argparse.ArgumentParser(description="Compile GameMaster Quiz JSON files to the binary format and back")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    compile_cmd = commands.add_parser("compile", help="compile a quiz JSON file")
+    compile_cmd.add_argument("source")
+    compile_cmd.add_argument("target", nargs="?", help=f"defaults to the source with {COMPILED_SUFFIX}")
+
+    decompile_cmd = commands.add_parser("decompile", help="turn a compiled quiz back into JSON")
+    decompile_cmd.add_argument("source")
+    decompile_cmd.add_argument("target", help="JSON file to write")
+
+    all_cmd = commands.add_parser("compile-all", help="compile every quiz in a data directory")
+    all_cmd.add_argument("--data-dir", default="data")
+
+    args = parser.parse_args(argv)
+    if args.command == "compile":
+        with open(args.source, 'r') as f:
+            quiz_data = json.load(f)
+        if args.target:
+            write_bytes_atomic(args.target, compile_quiz(quiz_data, source_signature(args.source)))
+            target = args.target
+        else:
+            target = write_compiled(args.source, quiz_data)
+        print(f"Compiled {len(quiz_data.get('questions', []))} questions to {target}")
+    elif args.command == "decompile":
+        quiz_data = decompile_quiz(CompiledQuiz(args.source))
+        write_json_atomic(args.target, quiz_data)
+        print(f"Decompiled {len(quiz_data['questions'])} questions to {args.target}")
+    else:
+        from storage import JSONStorage
+        storage = JSONStorage(args.data_dir)
+        compiled = 0
+        for name, location, is_custom in storage.list_quizzes():
+            try:
+                with open(location, 'r') as f:
+                    write_compiled(location, json.load(f), storage.compiled_dir(is_custom))
+                compiled += 1
+            except (OSError, ValueError) as e:
+                print(f"Skipped {location}: {e}")
+        print(f"Compiled {compiled} quizzes in {args.data_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
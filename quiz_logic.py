@@ -3,70 +3,203 @@ Quiz logic and scoring system for GameMaster Quiz
 """
 
 import json
-import os
-import random
+import threading
+import time
 from datetime import datetime
+from adaptive import AdaptivePlay, QuestionRatings
+from history import legacy_records
+from question_stats import AnswerStats
+from questions import empty_order, question_order, question_rng
+from ranking import LEADERBOARD_SIZE, Leaderboard, RankIndex, sorted_page
+from storage import JSONStorage
+
+POINTS_PER_QUESTION = 10
+
+
+def quiz_label(category, custom_quiz=None):
+    """Get the name games of a quiz are recorded under: the custom quiz name, or the category in capitals"""
+    return custom_quiz if custom_quiz else category.upper()
 
-SCORES_FILE = "data/scores.json"
 
 class QuizGame:
     """Main quiz game logic"""
     
-    def __init__(self, auth_system=None):
+    def __init__(self, auth_system=None, storage=None, leaderboard_size=LEADERBOARD_SIZE,
+                 persistence=None, answer_stats=None):
         """Initialize quiz game"""
-        self.scores = self.load_scores()
+        self.storage = storage or JSONStorage()
+        self.persistence = persistence
+        self.leaderboard_size = leaderboard_size
+        self._scores = None
+        self._leaderboard = None
+        self._rank_index = None
+        self.scores_lock = threading.RLock()
         self.current_quiz = None
-        self.current_questions = []
+        self.current_quiz_key = None
+        self.current_questions = ()
+        self.question_order = ()
         self.current_question_index = 0
         self.score = 0
+        self.correct_count = 0
+        # Answers of the game in progress: (question, option, correct_answer, option_count, answer_ms)
+        self.answers = []
+        self.question_started = None
+        self.answer_stats = answer_stats or AnswerStats(self.storage.data_dir, persistence)
+        # Adaptive games pick each next question from the ratings as they go
+        self.question_ratings = QuestionRatings(self.answer_stats, persistence)
+        self.adaptive = None
         self.current_user = None
         self.auth_system = auth_system  
+        if auth_system:
+            auth_system.stats_source = self.get_user_stats
+        if persistence:
+            persistence.register("scores", self.save_scores)
+    
+    @property
+    def scores(self):
+        """Leaderboard and user stats, loaded on first use"""
+        self._ensure_loaded()
+        return self._scores
+    
+    @scores.setter
+    def scores(self, scores):
+        """Replace all scores and rebuild the indexes"""
+        with self.scores_lock:
+            self._scores = scores
+            self.rebuild_indexes()
+    
+    @property
+    def leaderboard(self):
+        """Top-K leaderboard index"""
+        self._ensure_loaded()
+        return self._leaderboard
+    
+    @property
+    def rank_index(self):
+        """Rank index over user total scores"""
+        self._ensure_loaded()
+        return self._rank_index
+    
+    def _ensure_loaded(self):
+        """Load scores and build the indexes the first time they are needed"""
+        if self._scores is None:
+            with self.scores_lock:
+                if self._scores is None:
+                    self.scores = self.load_scores()
+                    self.seed_history()
+    
+    def reload_scores(self):
+        """Load scores again from storage, e.g. after a restore, and seed an empty history from them"""
+        with self.scores_lock:
+            self._scores = None
+            self._ensure_loaded()
+    
+    def rebuild_indexes(self):
+        """Rebuild leaderboard and rank index after scores were changed in bulk"""
+        self._leaderboard = Leaderboard(self._scores.get("leaderboard", []), self.leaderboard_size)
+        self._scores["leaderboard"] = self._leaderboard.entries
+        self._rank_index = RankIndex(self._scores.get("user_stats", {}))
     
     def load_scores(self):
-        """Load scores from JSON file"""
-        if os.path.exists(SCORES_FILE):
-            try:
-                with open(SCORES_FILE, 'r') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, FileNotFoundError):
-                return {"leaderboard": [], "user_stats": {}}
-        return {"leaderboard": [], "user_stats": {}}
+        """Load scores snapshot and replay pending journal entries on top of it"""
+        scores, entries = self.storage.load_scores(self.leaderboard_size)
+        if scores is None:
+            scores = {"leaderboard": [], "user_stats": {}}
+        
+        leaderboard = Leaderboard(scores.get("leaderboard", []), self.leaderboard_size)
+        for entry in entries:
+            self._record_score(scores, leaderboard, entry)
+        scores["leaderboard"] = leaderboard.entries
+        
+        return scores
     
     def save_scores(self):
-        """Save scores to JSON file"""
-        os.makedirs(os.path.dirname(SCORES_FILE), exist_ok=True)
-        with open(SCORES_FILE, 'w') as f:
-            json.dump(self.scores, f, indent=2)
+        """Save a full scores snapshot"""
+        self.storage.save_scores(self.scores)
     
-    def load_quiz(self, category, custom_quiz=None):
-        """Load quiz questions from file"""
-        try:
-            if custom_quiz:
-                quiz_file = f"data/quizzes/custom/{custom_quiz}.json"
-            else:
-                quiz_file = f"data/quizzes/{category.lower()}.json"
+    def request_snapshot(self):
+        """Save a scores snapshot now, or on the next flush with a persistence manager"""
+        if self.persistence:
+            self.persistence.mark_dirty("scores")
+        else:
+            self.save_scores()
+    
+    def seed_history(self):
+        """Carry existing scores over into an empty game history"""
+        if self.storage.has_games():
+            return
+        self.storage.append_games(legacy_records(self.scores))
+    
+    def recalculate_user_stats(self):
+        """Rebuild user stats and leaderboard from the full game history in one streaming pass"""
+        user_stats = {}
+        leaderboard = Leaderboard(size=self.leaderboard_size)
+        
+        for entry in self.storage.iter_games():
+            username = entry.get("username")
+            if not username:
+                continue
             
-            # Check if file exists
-            if not os.path.exists(quiz_file):
-                print(f"Quiz file not found: {quiz_file}")
-                return False
+            if username not in user_stats:
+                user_stats[username] = {
+                    "total_games": 0,
+                    "total_score": 0,
+                    "average_score": 0
+                }
+            
+            stats = user_stats[username]
+            stats["total_games"] += entry.get("games", 1)
+            stats["total_score"] += entry.get("score", 0)
             
-            # Check if file is empty
-            if os.path.getsize(quiz_file) == 0:
-                print(f"Quiz file is empty: {quiz_file}")
+            # Carry-over records have no quiz and never place on the leaderboard
+            if entry.get("quiz") is not None:
+                leaderboard.add(entry)
+        
+        # Calculate averages
+        for stats in user_stats.values():
+            if stats["total_games"] > 0:
+                stats["average_score"] = stats["total_score"] / stats["total_games"]
+        
+        self.scores = {"leaderboard": leaderboard.entries, "user_stats": user_stats}
+        return user_stats
+    
+    def load_quiz(self, category, custom_quiz=None, sample=None, seed=None, adaptive=False):
+        """Load quiz questions from storage; sample plays only that many, seed fixes the order, adaptive fits the player"""
+        quiz_name = custom_quiz if custom_quiz else category.lower()
+        try:
+            # Missing or empty quizzes are reported by the storage
+            questions = self.storage.load_questions(quiz_name, is_custom=bool(custom_quiz))
+            if questions is None:
                 return False
             
-            with open(quiz_file, 'r') as f:
-                quiz_data = json.load(f)
+            # A game left unfinished still tells which questions were shown and answered
+            self.record_answers()
             
-            self.current_quiz = category if not custom_quiz else custom_quiz
-            self.current_questions = quiz_data["questions"]
-            random.shuffle(self.current_questions)
+            self.current_quiz = quiz_label(category, custom_quiz)
+            self.current_quiz_key = (quiz_name, bool(custom_quiz))
+            # The questions are shared and immutable; the game only owns its order
+            self.current_questions = questions
+            # Question banks play a sample by default
+            if sample is None:
+                sample = getattr(questions, "per_game", None)
+            if adaptive:
+                # Picks are written into the order one answer ahead of the player
+                length = len(questions) if sample is None else min(sample, len(questions))
+                self.adaptive = AdaptivePlay(self.question_ratings.index(quiz_name, bool(custom_quiz), questions),
+                                             question_rng(seed), POINTS_PER_QUESTION)
+                self.question_order = empty_order(len(questions), length)
+                if length:
+                    self.question_order[0] = self.adaptive.next_question()
+            else:
+                self.adaptive = None
+                self.question_order = question_order(len(questions), question_rng(seed), sample)
             self.current_question_index = 0
             self.score = 0
+            self.correct_count = 0
+            self.start_question_timer()
             return True
         except json.JSONDecodeError as e:
-            print(f"Error loading quiz JSON from {quiz_file}: {e}")
+            print(f"Error loading quiz JSON for {quiz_name}: {e}")
             return False
         except Exception as e:
             print(f"Unexpected error loading quiz: {e}")
@@ -74,133 +207,182 @@ class QuizGame:
     
     def get_current_question(self):
         """Get the current question"""
-        if self.current_question_index < len(self.current_questions):
-            return self.current_questions[self.current_question_index]
+        if self.current_question_index < len(self.question_order):
+            return self.current_questions[self.question_order[self.current_question_index]]
         return None
     
     def submit_answer(self, answer_index):
         """Submit answer for current question and move to next"""
-        if self.current_question_index >= len(self.current_questions):
+        question = self.get_current_question()
+        if question is None:
             return False, "No more questions"
         
-        question = self.current_questions[self.current_question_index]
-        is_correct = (answer_index == question["correct_answer"])
-        
+        is_correct = (answer_index == question.correct_answer)
+        question_index = self.question_order[self.current_question_index]
         if is_correct:
-            self.score += 10
+            self.correct_count += 1
         
+        # Adaptive games score by difficulty; classic games keep a flat score per question
+        if self.adaptive:
+            self.score += self.adaptive.answer(question_index, is_correct)
+        elif is_correct:
+            self.score += POINTS_PER_QUESTION
+        
+        answer_ms = (time.monotonic() - self.question_started) * 1000 if self.question_started else 0.0
+        self.answers.append((question_index, answer_index, question.correct_answer, len(question.options),
+                             answer_ms))
         self.current_question_index += 1
+        if self.adaptive and not self.is_quiz_complete():
+            self.question_order[self.current_question_index] = self.adaptive.next_question()
+        self.start_question_timer()
         
         # If quiz is complete, save score
-        if self.current_question_index >= len(self.current_questions):
+        if self.is_quiz_complete():
+            self.record_answers()
             self.save_score()
         
-        return is_correct, question["correct_answer"]
+        return is_correct, question.correct_answer
+    
+    def start_question_timer(self):
+        """Start timing the answer to the current question, e.g. once it is actually on screen"""
+        self.question_started = time.monotonic()
+    
+    def record_answers(self):
+        """Hand the answers of the current game to the answer stats, once"""
+        if self.current_quiz_key is None or not self.answers:
+            self.answers = []
+            return
+        
+        unanswered = None
+        if not self.is_quiz_complete():
+            unanswered = self.question_order[self.current_question_index]
+        self.answer_stats.record_game(*self.current_quiz_key, self.current_questions, self.answers, unanswered)
+        if self.adaptive:
+            self.question_ratings.changed(*self.current_quiz_key)
+        self.answers = []
     
     def save_score(self):
         """Save the user's score to leaderboard"""
         if not self.current_user:
             return
         
+        self.record_game(self.current_user, self.current_quiz, self.score)
+    
+    def record_game(self, username, quiz, score):
+        """Record a finished game in the history, leaderboard and user stats"""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
         score_entry = {
-            "username": self.current_user,
-            "score": self.score,
-            "quiz": self.current_quiz,
+            "username": username,
+            "score": score,
+            "quiz": quiz,
             "date": timestamp
         }
         
-        # Add to leaderboard
-        self.scores["leaderboard"].append(score_entry)
+        # Scores must be loaded and the history seeded before the first game lands in it
+        self._ensure_loaded()
+        self.storage.append_game(score_entry)
+        # Readers on other threads hold the lock too, so they never see the game half applied
+        with self.scores_lock:
+            stats = self._record_score(self.scores, self.leaderboard, score_entry)
+            self.rank_index.update(username, stats["total_score"])
+        
+        # Append only this result; the storage asks for a full snapshot when due
+        if self.storage.append_score(score_entry):
+            self.request_snapshot()
+        
+        return score_entry
+    
+    def _record_score(self, scores, leaderboard, score_entry):
+        """Apply a score entry to the leaderboard and user stats"""
+        username = score_entry["username"]
+        
+        # Add to leaderboard if it places in the top K
+        leaderboard.add(score_entry)
         
         # Update user stats
-        if "user_stats" not in self.scores:
-            self.scores["user_stats"] = {}
+        if "user_stats" not in scores:
+            scores["user_stats"] = {}
         
-        if self.current_user not in self.scores["user_stats"]:
-            self.scores["user_stats"][self.current_user] = {
+        if username not in scores["user_stats"]:
+            scores["user_stats"][username] = {
                 "total_games": 0,
                 "total_score": 0,
                 "average_score": 0
             }
         
         # Update stats
-        stats = self.scores["user_stats"][self.current_user]
+        stats = scores["user_stats"][username]
         stats["total_games"] += 1
-        stats["total_score"] += self.score
+        stats["total_score"] += score_entry["score"]
         stats["average_score"] = stats["total_score"] / stats["total_games"]
         
-        # Update auth system if available
-        if self.auth_system and self.current_user in self.auth_system.users:
-            self.auth_system.users[self.current_user]["games_played"] = stats["total_games"]
-            self.auth_system.users[self.current_user]["total_score"] = stats["total_score"]
-            self.auth_system.save_users()
-        
-        # Keep only top 50 scores in leaderboard
-        self.scores["leaderboard"].sort(key=lambda x: x["score"], reverse=True)
-        self.scores["leaderboard"] = self.scores["leaderboard"][:50]
-        
-        self.save_scores()
+        return stats
+    
+    def get_user_stats(self, username):
+        """Get a user's stats; this is the only copy of them"""
+        return self.scores.get("user_stats", {}).get(username)
     
     def get_leaderboard(self, limit=10):
         """Get top scores from leaderboard"""
-        return self.scores["leaderboard"][:limit]
+        return self.leaderboard.top(limit)
     
     def get_user_stats_leaderboard(self, limit=10):
         """Get leaderboard based on total user stats"""
-        if "user_stats" not in self.scores:
-            return []
+        rows, _ = self.get_user_stats_page(0, limit)
+        return rows
+    
+    def get_user_stats_page(self, offset=0, limit=50, sort_key="total_score", descending=True):
+        """Get one page of user stats rows and the total number of rows"""
+        user_stats = self.scores.get("user_stats", {})
+        
+        # The default order comes straight from the rank index; other orders
+        # only keep offset + limit rows while scanning
+        if sort_key == "total_score" and descending:
+            names = [username for username, _ in self.rank_index.page(offset, limit)]
+        elif sort_key == "username":
+            names = sorted_page(user_stats, None, descending, offset, limit)
+        else:
+            names = sorted_page(user_stats, lambda name: user_stats[name].get(sort_key, 0),
+                                descending, offset, limit)
         
-        # Create list from user stats
-        stats_list = []
-        for username, stats in self.scores["user_stats"].items():
-            stats_list.append({
+        rows = []
+        for username in names:
+            stats = user_stats[username]
+            rows.append({
                 "username": username,
+                "rank": self.rank_index.rank(username),
                 "total_games": stats["total_games"],
                 "total_score": stats["total_score"],
                 "average_score": stats["average_score"]
             })
-        
-        # Sort by total score (descending)
-        stats_list.sort(key=lambda x: x["total_score"], reverse=True)
-        return stats_list[:limit]
+        return rows, len(user_stats)
     
     def get_user_rank(self, username):
         """Get user's rank in the global leaderboard"""
-        if "user_stats" not in self.scores or username not in self.scores["user_stats"]:
-            return None
-        
-        stats_list = self.get_user_stats_leaderboard(limit=1000)  # Get all users
-        
-        for i, entry in enumerate(stats_list):
-            if entry["username"] == username:
-                return i + 1  # Rank is index + 1
-        
-        return None
+        return self.rank_index.rank(username)
+    
+    def get_points_to_next_rank(self, username):
+        """Get how many points the user needs to move up one rank"""
+        next_total = self.rank_index.next_higher_total(username)
+        if next_total is None:
+            return 0
+        return next_total - self.rank_index.totals[username]
     
     def get_progress(self):
         """Get current quiz progress"""
-        total = len(self.current_questions)
+        total = len(self.question_order)
         current = self.current_question_index
         return current, total
     
     def is_quiz_complete(self):
         """Check if quiz is complete"""
-        return self.current_question_index >= len(self.current_questions)
+        return self.current_question_index >= len(self.question_order)
     
     def get_best_player(self):
         """Get the player with the highest total score"""
-        if "user_stats" not in self.scores or not self.scores["user_stats"]:
+        best_username, best_score = self.rank_index.best()
+        if best_score <= 0:
             return None, 0
-        
-        best_username = None
-        best_score = 0
-        
-        for username, stats in self.scores["user_stats"].items():
-            if stats["total_score"] > best_score:
-                best_score = stats["total_score"]
-                best_username = username
-        
         return best_username, best_score
     
     def get_user_score_and_rank(self, username):
@@ -220,7 +402,7 @@ class QuizGame:
         if not best_username or username == best_username:
             return 0
         
-        user_score = self.scores.get("user_stats", {}).get(username, {}).get("total_score", 0)
+        user_score = self.rank_index.totals.get(username, 0)
         difference = best_score - user_score
         
         return difference
\ No newline at end of file
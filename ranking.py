@@ -0,0 +1,256 @@
+"""
+Ranking structures for GameMaster Quiz
+Keeps the top-K leaderboard and answers rank queries in logarithmic time
+"""
+
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from math import isqrt
+from itertools import islice
+
+LEADERBOARD_SIZE = 50
+RANK_SLOT_SLACK = 64  # empty rank slots kept before the index compacts
+RANK_PENDING_FACTOR = 8  # totals waiting for a slot, per square root of the slot count, before a rebuild
+
+
+def sorted_page(rows, key, descending=False, offset=0, limit=50):
+    """Get one page of rows in sort order without sorting all of them"""
+    select = heapq.nlargest if descending else heapq.nsmallest
+    return select(offset + limit, rows, key=key)[offset:]
+
+
+class Leaderboard:
+    """Top-K score entries kept in order by bisect insertion"""
+
+    def __init__(self, entries=None, size=LEADERBOARD_SIZE):
+        """Initialize leaderboard from existing entries"""
+        self.size = size
+        self.entries = sorted(entries or [], key=self._key)[:size]
+        self.keys = [self._key(entry) for entry in self.entries]
+
+    @staticmethod
+    def _key(entry):
+        """Higher scores first, earlier dates first among equal scores"""
+        return (-entry["score"], entry.get("date") or "")
+
+    def add(self, entry):
+        """Insert an entry; returns False if it does not make the top K"""
+        key = self._key(entry)
+
+        # Rejecting a result that can't place only needs the last key
+        if len(self.entries) >= self.size and (not self.keys or key >= self.keys[-1]):
+            return False
+
+        position = bisect_right(self.keys, key)
+        self.keys.insert(position, key)
+        self.entries.insert(position, entry)
+
+        if len(self.entries) > self.size:
+            self.keys.pop()
+            self.entries.pop()
+        return True
+
+    def top(self, limit=10):
+        """Get the best entries"""
+        return self.entries[:limit]
+
+    def __len__(self):
+        """Number of entries on the leaderboard"""
+        return len(self.entries)
+
+
+class RankIndex:
+    """Order-statistic index over user total scores: a Fenwick tree over the distinct totals
+
+    Totals without a slot in the tree wait in a small sorted list until the next rebuild,
+    so a total landing between existing ones costs a bisect, not a rebuild
+    """
+
+    def __init__(self, user_stats=None):
+        """Initialize rank index, optionally from a user_stats mapping"""
+        self.totals = {}
+        self.holders = {}
+        for username, stats in (user_stats or {}).items():
+            total = max(0, int(stats.get("total_score", 0)))
+            self.totals[username] = total
+            self.holders.setdefault(total, {})[username] = None
+        self.count = len(self.totals)
+        self._rebuild()
+
+    def _rebuild(self):
+        """Give each current total a slot, in sorted order, and rebuild the tree in linear time"""
+        # Tree size follows the number of distinct totals, not how large the totals are
+        self.pending = []
+        self.values = sorted(self.holders)
+        size = len(self.values)
+        self.tree = [0] * (size + 1)
+        for i, total in enumerate(self.values, 1):
+            self.tree[i] += len(self.holders[total])
+            parent = i + (i & -i)
+            if parent <= size:
+                self.tree[parent] += self.tree[i]
+
+    def _append_slot(self, total):
+        """Add a slot for a total above every other one; returns it"""
+        self.values.append(total)
+        i = len(self.values)
+        # Node i sums the slots after i - lowbit(i), which all exist already
+        self.tree.append(self._prefix(i - 1) - self._prefix(i - (i & -i)))
+        return i
+
+    def _slot(self, total):
+        """Get the tree slot of a total, or None if it has none"""
+        i = bisect_left(self.values, total)
+        return i + 1 if i < len(self.values) and self.values[i] == total else None
+
+    def _add(self, slot, delta):
+        """Add delta to the counter of a slot"""
+        i = slot
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, slot):
+        """Count users in slots 1..slot"""
+        result = 0
+        while slot > 0:
+            result += self.tree[slot]
+            slot -= slot & -slot
+        return result
+
+    def _count_at_most(self, total):
+        """Count users whose total score is <= total"""
+        return self._prefix(bisect_right(self.values, total)) + bisect_right(self.pending, total)
+
+    def _first_reaching(self, values, k):
+        """Get the smallest of sorted values with at least k users at or below it, or None"""
+        low, high = 0, len(values)
+        while low < high:
+            middle = (low + high) // 2
+            if self._count_at_most(values[middle]) >= k:
+                high = middle
+            else:
+                low = middle + 1
+        return values[low] if low < len(values) else None
+
+    def _kth_smallest(self, k):
+        """Get the k-th smallest total score (1-based)"""
+        if not self.pending:
+            # Descend the tree directly
+            pos = 0
+            step = 1 << (len(self.values).bit_length() - 1) if self.values else 0
+            while step:
+                nxt = pos + step
+                if nxt < len(self.tree) and self.tree[nxt] < k:
+                    pos = nxt
+                    k -= self.tree[nxt]
+                step >>= 1
+            return self.values[pos]  # slot pos + 1 holds the k-th total
+
+        # The answer is a slotted or a pending total, whichever reaches k first
+        candidates = [total for total in (self._first_reaching(self.values, k),
+                                          self._first_reaching(self.pending, k)) if total is not None]
+        return min(candidates)
+
+    def update(self, username, total):
+        """Set a user's total score"""
+        total = max(0, int(total))
+        if username in self.totals:
+            self.remove(username)
+
+        self.totals[username] = total
+        self.holders.setdefault(total, {})[username] = None
+        self.count += 1
+
+        slot = self._slot(total)
+        if slot is None:
+            if self.values and total < self.values[-1]:
+                # A slot between existing ones would shift every slot above it, so the
+                # total waits in the pending list; emptied slots are kept for reuse
+                insort(self.pending, total)
+                if len(self.pending) > max(RANK_SLOT_SLACK, RANK_PENDING_FACTOR * isqrt(len(self.values))):
+                    self._rebuild()
+                return
+            # Totals mostly grow, so a new highest total only appends a slot
+            slot = self._append_slot(total)
+        self._add(slot, 1)
+
+    def remove(self, username):
+        """Remove a user from the index"""
+        total = self.totals.pop(username, None)
+        if total is None:
+            return
+        holders = self.holders[total]
+        del holders[username]
+        if not holders:
+            del self.holders[total]
+        self.count -= 1
+        slot = self._slot(total)
+        if slot is None:
+            del self.pending[bisect_left(self.pending, total)]
+        else:
+            self._add(slot, -1)
+
+        # Compact once empty slots outnumber the totals users hold
+        if len(self.values) > 2 * len(self.holders) + RANK_SLOT_SLACK:
+            self._rebuild()
+
+    def rank(self, username):
+        """Get a user's rank (1 = best); tied users share a rank"""
+        if username not in self.totals:
+            return None
+        return self.count - self._count_at_most(self.totals[username]) + 1
+
+    def next_higher_total(self, username):
+        """Get the lowest total score above the user's, or None if they lead"""
+        if username not in self.totals:
+            return None
+        at_most = self._count_at_most(self.totals[username])
+        if at_most >= self.count:
+            return None
+        return self._kth_smallest(at_most + 1)
+
+    def page(self, offset=0, limit=50):
+        """Get (username, total) pairs in rank order starting at offset"""
+        result = []
+        position = max(0, offset)
+        if limit <= 0 or position >= self.count:
+            return result
+
+        # Find the (position + 1)-th highest total once, then walk down the totals from there
+        first = self._kth_smallest(self.count - position)
+        skip = position - (self.count - self._count_at_most(first))
+        for total in self._totals_from(first):
+            holders = self.holders[total]
+            for username in islice(holders, skip, skip + limit - len(result)):
+                result.append((username, total))
+            if len(result) >= limit:
+                break
+            skip = 0
+        return result
+
+    def _totals_from(self, highest):
+        """Yield the totals users hold, from highest downwards"""
+        i = bisect_right(self.values, highest) - 1
+        j = bisect_right(self.pending, highest) - 1
+        while i >= 0 or j >= 0:
+            if j < 0 or (i >= 0 and self.values[i] > self.pending[j]):
+                total = self.values[i]
+                i -= 1
+            else:
+                total = self.pending[j]
+                j = bisect_left(self.pending, total) - 1
+            # Emptied slots stay in the tree until it is compacted
+            if total in self.holders:
+                yield total
+
+    def best(self):
+        """Get (username, total) of the highest total score"""
+        if not self.count:
+            return None, 0
+        best_total = self._kth_smallest(self.count)
+        return next(iter(self.holders[best_total])), best_total
+
+    def __len__(self):
+        """Number of ranked users"""
+        return self.count
@@ -0,0 +1,87 @@
+"""
+Score journal for GameMaster Quiz
+Appends finished games to a compact log that is periodically folded into scores.json
+"""
+
+import json
+import os
+
+from durable import append_line, write_json_atomic
+
+JOURNAL_FILE = "data/scores.journal"
+COMPACT_THRESHOLD = 100
+
+
+class ScoreJournal:
+    """Append-only journal of score entries on top of a JSON snapshot"""
+
+    def __init__(self, snapshot_file, journal_file=JOURNAL_FILE, compact_threshold=COMPACT_THRESHOLD):
+        """Initialize score journal"""
+        self.snapshot_file = snapshot_file
+        self.journal_file = journal_file
+        self.compact_threshold = compact_threshold
+        self.seq = 0
+        self.pending = 0
+
+    def load(self):
+        """Load the snapshot and the journal entries written after it"""
+        snapshot = None
+        if os.path.exists(self.snapshot_file):
+            try:
+                with open(self.snapshot_file, 'r') as f:
+                    snapshot = json.load(f)
+            except (json.JSONDecodeError, FileNotFoundError) as e:
+                print(f"Warning: could not read {self.snapshot_file}: {e}")
+                snapshot = None
+
+        snapshot_seq = 0
+        if snapshot is not None:
+            snapshot_seq = snapshot.pop("journal_seq", 0)
+        self.seq = snapshot_seq
+
+        entries = []
+        for record in self._read_records():
+            # Records already folded into the snapshot are skipped, so a crash
+            # between writing the snapshot and truncating the journal is harmless
+            if record.get("seq", 0) <= snapshot_seq:
+                continue
+            self.seq = max(self.seq, record["seq"])
+            entries.append(record["entry"])
+
+        self.pending = len(entries)
+        return snapshot, entries
+
+    def _read_records(self):
+        """Yield journal records, skipping a torn last line"""
+        if not os.path.exists(self.journal_file):
+            return
+        with open(self.journal_file, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+    def append(self, entry):
+        """Append one score entry; returns True when compaction is due"""
+        self.seq += 1
+        record = {"seq": self.seq, "entry": entry}
+        append_line(self.journal_file, json.dumps(record, separators=(',', ':')))
+        self.pending += 1
+        return self.pending >= self.compact_threshold
+
+    def compact(self, scores):
+        """Write a full snapshot of scores and truncate the journal"""
+        snapshot = dict(scores)
+        snapshot["journal_seq"] = self.seq
+        write_json_atomic(self.snapshot_file, snapshot)
+        self.clear()
+
+    def clear(self):
+        """Drop all journal entries"""
+        if os.path.exists(self.journal_file):
+            open(self.journal_file, 'w').close()
+        self.pending = 0
@@ -0,0 +1,365 @@
+"""
+Headless HTTP/JSON server for GameMaster Quiz
+Serves register/login, the quiz catalog, games and leaderboards over asyncio
+"""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from auth import UserAuth
+from game_sessions import SessionManager
+from persistence import PersistenceManager, thread_scheduler
+from quiz_logic import QuizGame, quiz_label
+from quiz_manager import QuizManager
+from storage import open_storage
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+MAX_BODY_SIZE = 64 * 1024
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    401: "Unauthorized",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error"
+}
+
+
+class ApiError(Exception):
+    """An error answered with an HTTP status and a JSON message"""
+
+    def __init__(self, status, message):
+        """Initialize API error"""
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def question_payload(session):
+    """Get the current question of a session without its answer"""
+    question = session.current_question()
+    if question is None:
+        return None
+    answered, total = session.progress()
+    return {
+        "question": question.question,
+        "options": list(question.options),
+        "number": answered + 1,
+        "total": total
+    }
+
+
+class QuizServer:
+    """asyncio HTTP/1.1 server with keep-alive over the quiz engine"""
+
+    def __init__(self, storage=None, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """Initialize quiz server"""
+        self.host = host
+        self.port = port
+
+        # Every write runs on one thread, in order, so the event loop never waits
+        # on disk and score/user state is only mutated in one place
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="persistence")
+        self.persistence = PersistenceManager(scheduler=self._schedule_flush)
+
+        self.storage = storage or open_storage()
+        self.auth = UserAuth(self.storage, self.persistence)
+        self.quiz_manager = QuizManager(self.storage)
+        self.quiz_game = QuizGame(self.auth, self.storage, persistence=self.persistence)
+        self.sessions = SessionManager(self.quiz_game)
+        self.server = None
+
+        self.routes = {
+            ("POST", "register"): self.handle_register,
+            ("POST", "login"): self.handle_login,
+            ("POST", "logout"): self.handle_logout,
+            ("GET", "me"): self.handle_me,
+            ("GET", "quizzes"): self.handle_quizzes,
+            ("POST", "games"): self.handle_start_game,
+            ("GET", "games"): self.handle_get_game,
+            ("POST", "answer"): self.handle_answer,
+            ("GET", "leaderboard"): self.handle_leaderboard,
+            ("GET", "rankings"): self.handle_rankings
+        }
+
+    def _schedule_flush(self, delay, callback):
+        """Run debounced flushes on the writer thread"""
+        return thread_scheduler(delay, lambda: self.writer.submit(callback))
+
+    async def write(self, func, *args):
+        """Run a state-changing call on the writer thread and wait for it"""
+        return await asyncio.get_running_loop().run_in_executor(self.writer, func, *args)
+
+    async def read(self, func, *args):
+        """Run a call that reads from disk on the default executor and wait for it"""
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    async def read_state(self, func, *args):
+        """Run a call that reads scores on the default executor, holding the scores lock"""
+        # Scores and rank indexes change in place while the writer records a game,
+        # under the same lock, so a read never sees them half updated
+        def locked():
+            with self.quiz_game.scores_lock:
+                return func(*args)
+        return await self.read(locked)
+
+    def load_state(self):
+        """Load users, scores (seeding the history) and the quiz catalog before the first request"""
+        self.auth.users = self.auth.load_users()
+        self.quiz_game.reload_scores()
+        self.quiz_manager.get_catalog()
+
+    async def start(self):
+        """Start listening"""
+        await self.write(self.load_state)
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.server
+
+    async def serve_forever(self):
+        """Start listening and serve until cancelled"""
+        await self.start()
+        print(f"GameMaster Quiz server listening on http://{self.host}:{self.port}")
+        try:
+            async with self.server:
+                await self.server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        """Stop listening and write everything still pending"""
+        if self.server:
+            self.server.close()
+        await self.write(self.persistence.shutdown)
+        self.writer.shutdown(wait=True)
+
+    async def handle_connection(self, reader, writer):
+        """Serve requests on one connection until the client closes it"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, version = request_line.decode("latin-1").split()
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY_SIZE:
+                    status, payload = 413, {"error": "Request body too large"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = await self.dispatch(method, target, headers, body)
+
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method, target, headers, body):
+        """Route one request; returns (status, payload)"""
+        url = urlsplit(target)
+        parts = [part for part in url.path.split("/") if part]
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        # /games/<id>/answer and /leaderboard/<quiz> carry an argument in the path
+        route = parts[-1] if len(parts) == 3 and parts[0] == "games" else (parts[0] if parts else "")
+        handler = self.routes.get((method, route))
+        if handler is None:
+            known = any(name == route for _, name in self.routes)
+            return (405, {"error": "Method not allowed"}) if known else (404, {"error": "Not found"})
+
+        try:
+            data = json.loads(body) if body else {}
+            if not isinstance(data, dict):
+                raise ApiError(400, "Request body must be a JSON object")
+            request = {"args": parts[1:], "query": query, "data": data, "headers": headers}
+            return 200, await handler(request)
+        except ApiError as e:
+            return e.status, {"error": e.message}
+        except json.JSONDecodeError:
+            return 400, {"error": "Invalid JSON"}
+        except Exception as e:
+            print(f"Error handling {method} {url.path}: {e}")
+            return 500, {"error": "Internal server error"}
+
+    def authenticate(self, request):
+        """Get the user of the request's bearer token"""
+        scheme, _, token = request["headers"].get("authorization", "").partition(" ")
+        # Users are loaded at startup, and one lookup in the users dict is safe next to the writer
+        username = self.auth.authenticate(token) if scheme.lower() == "bearer" else None
+        if username is None:
+            raise ApiError(401, "Missing or invalid session token")
+        return username, token
+
+    def owned_session(self, request, username):
+        """Get the session named in the path if it belongs to username"""
+        try:
+            session = self.sessions.get(int(request["args"][0]))
+        except (IndexError, ValueError):
+            session = None
+        if session is None or session.username != username:
+            raise ApiError(404, "Game not found")
+        return session
+
+    async def handle_register(self, request):
+        """POST /register {username, password}"""
+        username = str(request["data"].get("username", "")).strip()
+        password = str(request["data"].get("password", ""))
+        # Users are added on the writer thread, so they are checked there too
+        valid, message = await self.write(self.auth.validate_registration, username, password)
+        if not valid:
+            raise ApiError(400, message)
+
+        password_hash = await asyncio.wrap_future(self.auth.hash_password_async(password))
+        success, message = await self.write(self.auth.create_user, username, password_hash)
+        if not success:
+            raise ApiError(400, message)
+        return {"message": message}
+
+    async def handle_login(self, request):
+        """POST /login {username, password}"""
+        username = str(request["data"].get("username", "")).strip()
+        password = str(request["data"].get("password", ""))
+
+        result = await asyncio.wrap_future(self.auth.check_password_async(username, password))
+        success, message = await self.write(self.auth.finish_login, username, result)
+        if not success:
+            raise ApiError(401, message)
+        return {"message": message, "token": self.auth.create_session(username)}
+
+    async def handle_logout(self, request):
+        """POST /logout"""
+        _, token = self.authenticate(request)
+        self.auth.logout(token)
+        return {"message": "Logged out"}
+
+    async def handle_me(self, request):
+        """GET /me"""
+        username, _ = self.authenticate(request)
+
+        def profile():
+            stats = self.quiz_game.get_user_stats(username) or {}
+            return {
+                "username": username,
+                "total_games": stats.get("total_games", 0),
+                "total_score": stats.get("total_score", 0),
+                "rank": self.quiz_game.get_user_rank(username),
+                "points_to_next_rank": self.quiz_game.get_points_to_next_rank(username)
+            }
+        return await self.read_state(profile)
+
+    async def handle_quizzes(self, request):
+        """GET /quizzes"""
+        # Reading the catalog may rebuild its index file, so it runs with the other writes
+        return {"quizzes": [
+            {key: entry[key] for key in ("name", "is_custom", "category", "description",
+                                         "created_by", "question_count")}
+            for entry in await self.write(self.quiz_manager.get_catalog)
+        ]}
+
+    async def handle_start_game(self, request):
+        """POST /games {quiz, custom, adaptive}"""
+        username, _ = self.authenticate(request)
+        quiz = str(request["data"].get("quiz", ""))
+        if not quiz:
+            raise ApiError(400, "Missing quiz name")
+
+        # Loading a quiz may parse or compile it, so keep it off the event loop
+        adaptive = bool(request["data"].get("adaptive"))
+        if request["data"].get("custom"):
+            session = await self.read(lambda: self.sessions.start(username, "custom", custom_quiz=quiz,
+                                                                  adaptive=adaptive))
+        else:
+            session = await self.read(lambda: self.sessions.start(username, quiz, adaptive=adaptive))
+        if session is None:
+            raise ApiError(404, "Quiz not found")
+        return {"game_id": session.session_id, "question": question_payload(session)}
+
+    async def handle_get_game(self, request):
+        """GET /games/<id>"""
+        username, _ = self.authenticate(request)
+        session = self.owned_session(request, username)
+        return {"game_id": session.session_id, "score": session.score,
+                "question": question_payload(session)}
+
+    async def handle_answer(self, request):
+        """POST /games/<id>/answer {answer}"""
+        username, _ = self.authenticate(request)
+        session = self.owned_session(request, username)
+        answer = request["data"].get("answer")
+        if isinstance(answer, bool) or not isinstance(answer, int):
+            raise ApiError(400, "Answer must be an option index")
+
+        is_correct, correct_answer = session.answer(answer)
+        response = {"correct": is_correct, "correct_answer": correct_answer, "score": session.score}
+
+        if session.is_complete():
+            self.sessions.end(session.session_id)
+            await self.write(self.sessions.record_answers, session)
+            await self.write(self.quiz_game.record_game, session.username, session.quiz, session.score)
+            response["finished"] = True
+            response["rank"] = await self.read_state(self.quiz_game.get_user_rank, username)
+        else:
+            response["finished"] = False
+            response["question"] = question_payload(session)
+        return response
+
+    def limit(self, request):
+        """Get the ?limit= of a leaderboard request, between 1 and 100"""
+        try:
+            return min(max(int(request["query"].get("limit", 10)), 1), 100)
+        except ValueError:
+            raise ApiError(400, "limit must be a number")
+
+    async def handle_leaderboard(self, request):
+        """GET /leaderboard or /leaderboard/<quiz>[?custom=1]"""
+        limit = self.limit(request)
+        if not request["args"]:
+            return {"leaderboard": await self.read_state(self.quiz_game.get_leaderboard, limit)}
+
+        # Games are recorded under the same name the game was started with
+        if request["query"].get("custom") in ("1", "true"):
+            quiz = quiz_label("custom", request["args"][0])
+        else:
+            quiz = quiz_label(request["args"][0])
+
+        # Per-quiz boards scan the game history, so keep them off the event loop
+        return {"leaderboard": await self.read(self.storage.get_quiz_scores, quiz, limit)}
+
+    async def handle_rankings(self, request):
+        """GET /rankings: users by total score"""
+        limit = self.limit(request)
+        return {"leaderboard": await self.read_state(self.quiz_game.get_user_stats_leaderboard, limit)}
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Run the quiz server until interrupted"""
+    server = QuizServer(host=host, port=port)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("Server stopped")
@@ -0,0 +1,683 @@
+"""
+Storage backends for GameMaster Quiz
+Users, scores and quizzes live either in the JSON data directory or in a SQLite database
+"""
+
+import heapq
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from durable import write_json_atomic
+from history import GameHistory, legacy_records
+from question_bank import bank_files, bank_path, open_bank
+from questions import compact_questions
+from quiz_cache import QUIZ_CACHE_SIZE, shared_cache
+from quiz_catalog import INDEX_FILENAME, QuizCatalog, catalog_entry
+from quiz_compiler import COMPILED_DIR, open_compiled, remove_compiled, source_signature, write_compiled
+from ranking import LEADERBOARD_SIZE
+from score_journal import ScoreJournal
+
+DATA_DIR = "data"
+SQLITE_FILE = "gamemaster.db"
+
+
+class JSONStorage:
+    """Stores users, scores and quizzes as JSON files in the data directory"""
+
+    backend = "json"
+
+    def __init__(self, data_dir=DATA_DIR, quiz_cache=None):
+        """Initialize JSON storage"""
+        self.data_dir = data_dir
+        self.quiz_cache = quiz_cache or shared_cache
+        self.users_file = os.path.join(data_dir, "users.json")
+        self.scores_file = os.path.join(data_dir, "scores.json")
+        self.migrations_file = os.path.join(data_dir, "migrations.json")
+        self.quizzes_dir = os.path.join(data_dir, "quizzes")
+        self.custom_dir = os.path.join(self.quizzes_dir, "custom")
+        self.journal = ScoreJournal(self.scores_file, os.path.join(data_dir, "scores.journal"))
+        self.history = GameHistory(os.path.join(data_dir, "history"))
+        self.catalog = QuizCatalog(os.path.join(data_dir, INDEX_FILENAME), self.quizzes_dir, self.custom_dir,
+                                   self.quiz_cache.load)
+        self.uncompilable = {}
+
+    # Users
+
+    def load_users(self):
+        """Load all users"""
+        if os.path.exists(self.users_file):
+            try:
+                with open(self.users_file, 'r') as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, FileNotFoundError):
+                return {}
+        return {}
+
+    def save_users(self, users, changed=None):
+        """Save all users (the JSON layout always rewrites the whole file)"""
+        write_json_atomic(self.users_file, users)
+
+    def save_user(self, username, users):
+        """Save a single user (the JSON layout rewrites the whole file)"""
+        self.save_users(users)
+
+    def get_user(self, username):
+        """Look up a single user"""
+        return self.load_users().get(username)
+
+    # Scores
+
+    def load_scores(self, leaderboard_size=LEADERBOARD_SIZE):
+        """Load the scores snapshot and the journal entries to replay on top of it"""
+        # The snapshot's leaderboard was trimmed to the configured size when it was saved
+        return self.journal.load()
+
+    def append_score(self, score_entry):
+        """Persist one finished game; returns True when a full snapshot is due"""
+        return self.journal.append(score_entry)
+
+    def save_scores(self, scores):
+        """Save a full scores snapshot"""
+        self.journal.compact(scores)
+
+    def clear_journal(self):
+        """Drop journal entries that are not part of the current snapshot"""
+        self.journal.clear()
+
+    def get_quiz_scores(self, quiz, limit=10):
+        """Get the best scores for one quiz"""
+        quiz_games = (entry for entry in self.history.iter_games() if entry.get("quiz") == quiz)
+        # nlargest keeps history order among equal scores: oldest first, as the SQLite query does
+        return heapq.nlargest(limit, quiz_games, key=lambda x: x["score"])
+
+    # Game history
+
+    def append_game(self, score_entry):
+        """Record a finished game in the full history"""
+        self.history.append(score_entry)
+
+    def append_games(self, score_entries):
+        """Record many games at once"""
+        self.history.append_many(score_entries)
+
+    def iter_games(self, start_day=None, end_day=None):
+        """Stream every recorded game in date order"""
+        return self.history.iter_games(start_day, end_day)
+
+    def has_games(self):
+        """Check if the history holds any game"""
+        return self.history.has_games()
+
+    def remove_games(self, predicate):
+        """Remove games matching predicate from the history"""
+        return self.history.remove(predicate)
+
+    def clear_games(self):
+        """Remove the whole game history"""
+        self.history.clear()
+
+    # Quizzes
+
+    def _quiz_path(self, name, is_custom):
+        """Get the file path of a quiz"""
+        directory = self.custom_dir if is_custom else self.quizzes_dir
+        return os.path.join(directory, f"{name}.json")
+
+    def list_quizzes(self):
+        """List all quizzes as (name, location, is_custom) tuples"""
+        return [(e["name"], e["location"], e["is_custom"]) for e in self.catalog.entries()]
+
+    def get_catalog(self):
+        """Get metadata of all quizzes from the catalog index"""
+        return self.catalog.entries()
+
+    def rebuild_catalog(self):
+        """Rescan all quiz files into the catalog index"""
+        self.catalog.rebuild()
+
+    def quiz_exists(self, name, is_custom=False):
+        """Check if a non-empty quiz exists"""
+        filepath = self._quiz_path(name, is_custom)
+        return os.path.exists(filepath) and os.path.getsize(filepath) > 0
+
+    def load_quiz(self, name, is_custom=False):
+        """Load a quiz; returns None if it is missing or empty"""
+        filepath = self._quiz_path(name, is_custom)
+        if not os.path.exists(filepath):
+            print(f"Quiz file not found: {filepath}")
+            return None
+        if os.path.getsize(filepath) == 0:
+            print(f"Quiz file is empty: {filepath}")
+            return None
+        return self.quiz_cache.load(filepath)
+
+    def load_questions(self, name, is_custom=False):
+        """Load a quiz's questions in compact, shared form; returns None if it is missing or empty"""
+        filepath = self._quiz_path(name, is_custom)
+        if not os.path.exists(filepath):
+            print(f"Quiz file not found: {filepath}")
+            return None
+        if os.path.getsize(filepath) == 0:
+            print(f"Quiz file is empty: {filepath}")
+            return None
+
+        # Compiled quizzes are decoded from a memory map; the JSON file stays the source
+        compiled = open_compiled(filepath, self.compiled_dir(is_custom)) or self._compile(filepath, is_custom)
+        quiz_info = compiled.info if compiled is not None else self.quiz_cache.load(filepath)
+
+        # Bank quizzes only hold metadata; their questions are read on demand
+        if quiz_info.get("question_bank"):
+            return open_bank(bank_path(self.data_dir, quiz_info), quiz_info.get("questions_per_game"))
+        if compiled is not None:
+            return compiled
+        return self.quiz_cache.load_questions(filepath)
+
+    def compiled_dir(self, is_custom):
+        """Get the directory of compiled quizzes; kept apart so the catalog's directory mtime stays put"""
+        return os.path.join(self.data_dir, COMPILED_DIR, "custom" if is_custom else "default")
+
+    def _compile(self, filepath, is_custom, quiz_data=None):
+        """Compile a quiz into the compiled directory; returns it, or None if it can't be compiled"""
+        signature = source_signature(filepath)
+        if self.uncompilable.get(filepath) == signature:
+            return None
+        compiled_dir = self.compiled_dir(is_custom)
+        try:
+            write_compiled(filepath, quiz_data if quiz_data is not None else self.quiz_cache.load(filepath),
+                           compiled_dir)
+        except (OSError, ValueError) as e:
+            print(f"Could not compile {filepath}, using JSON: {e}")
+            self.uncompilable[filepath] = signature
+            return None
+        return open_compiled(filepath, compiled_dir)
+
+    def save_quiz(self, name, quiz_data, is_custom=False):
+        """Save a quiz and return its location"""
+        filepath = self._quiz_path(name, is_custom)
+        write_json_atomic(filepath, quiz_data)
+        self.quiz_cache.invalidate(filepath)
+        self._compile(filepath, is_custom, quiz_data)
+        self.catalog.update(name, filepath, is_custom, quiz_data)
+        return filepath
+
+    def delete_quiz(self, name, is_custom=False):
+        """Delete a quiz"""
+        filepath = self._quiz_path(name, is_custom)
+        os.remove(filepath)
+        remove_compiled(filepath, self.compiled_dir(is_custom))
+        self.quiz_cache.invalidate(filepath)
+        self.catalog.remove(name, is_custom)
+
+    # Migrations
+
+    def has_migration(self, name):
+        """Check if a one-time migration already ran on this data directory"""
+        try:
+            with open(self.migrations_file, 'r') as f:
+                return name in json.load(f)
+        except (json.JSONDecodeError, FileNotFoundError):
+            return False
+
+    def mark_migration(self, name):
+        """Record that a one-time migration ran"""
+        try:
+            with open(self.migrations_file, 'r') as f:
+                migrations = json.load(f)
+        except (json.JSONDecodeError, FileNotFoundError):
+            migrations = {}
+        migrations[name] = datetime.now().strftime("%Y-%m-%d %H:%M")
+        write_json_atomic(self.migrations_file, migrations)
+
+    # Maintenance
+
+    def backup_files(self):
+        """Get all files that make up this store"""
+        files = [self.users_file, self.scores_file, self.migrations_file]
+        files.extend(location for _, location, _ in self.list_quizzes())
+        files.extend(path for _, path in self.history.segments())
+        files.extend(bank_files(self.data_dir))
+        return files
+
+    def prepare_restore(self, paths):
+        """Remove what restoring paths would leave stale: history segments and compiled copies of replaced quizzes"""
+        directories = [os.path.dirname(os.path.abspath(path)) for path in paths]
+
+        # Segments of days after the backup would otherwise survive next to the restored ones;
+        # a backup without segments keeps the history, which is seeded from its scores if empty
+        if os.path.abspath(self.history.history_dir) in directories:
+            self.history.clear()
+
+        quizzes_dir, custom_dir = os.path.abspath(self.quizzes_dir), os.path.abspath(self.custom_dir)
+        for path, directory in zip(paths, directories):
+            if directory in (quizzes_dir, custom_dir):
+                remove_compiled(path, self.compiled_dir(directory == custom_dir))
+
+    def close(self):
+        """Release resources (nothing to do for JSON files)"""
+
+
+class SQLiteStorage:
+    """Stores users, scores and quizzes in an indexed SQLite database"""
+
+    backend = "sqlite"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS users (
+            username TEXT PRIMARY KEY,
+            data TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS games (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            day TEXT NOT NULL,
+            username TEXT NOT NULL,
+            score INTEGER NOT NULL,
+            quiz TEXT,
+            date TEXT,
+            games INTEGER NOT NULL DEFAULT 1
+        );
+        CREATE INDEX IF NOT EXISTS games_by_day ON games (day);
+        CREATE INDEX IF NOT EXISTS games_by_score ON games (score DESC, date, id) WHERE quiz IS NOT NULL;
+        CREATE INDEX IF NOT EXISTS games_by_quiz ON games (quiz, score DESC);
+        CREATE INDEX IF NOT EXISTS games_by_user ON games (username);
+        CREATE TABLE IF NOT EXISTS user_stats (
+            username TEXT PRIMARY KEY,
+            total_games INTEGER NOT NULL,
+            total_score INTEGER NOT NULL,
+            average_score REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS user_stats_by_total ON user_stats (total_score);
+        CREATE TABLE IF NOT EXISTS quizzes (
+            name TEXT NOT NULL,
+            is_custom INTEGER NOT NULL,
+            data TEXT NOT NULL,
+            PRIMARY KEY (name, is_custom)
+        );
+        CREATE TABLE IF NOT EXISTS quiz_catalog (
+            name TEXT NOT NULL,
+            is_custom INTEGER NOT NULL,
+            category TEXT,
+            description TEXT,
+            created_by TEXT,
+            question_count INTEGER NOT NULL,
+            PRIMARY KEY (name, is_custom)
+        );
+        CREATE TABLE IF NOT EXISTS migrations (
+            name TEXT PRIMARY KEY,
+            applied TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, db_path=os.path.join(DATA_DIR, SQLITE_FILE)):
+        """Initialize SQLite storage"""
+        self.db_path = db_path
+        self.data_dir = os.path.dirname(db_path) or "."
+        self.lock = threading.Lock()
+        self._conn = None
+        self.question_cache = OrderedDict()
+
+    @property
+    def conn(self):
+        """Open the database on first use"""
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            # Imported on first use so JSON-only startups skip it
+            import sqlite3
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self.SCHEMA)
+        return self._conn
+
+    # Users
+
+    def load_users(self):
+        """Load all users"""
+        rows = self.conn.execute("SELECT username, data FROM users")
+        return {username: json.loads(data) for username, data in rows}
+
+    def save_users(self, users, changed=None):
+        """Save all users, or only the changed usernames"""
+        with self.lock, self.conn:
+            if changed is None:
+                self.conn.execute("DELETE FROM users")
+                changed = users
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO users (username, data) VALUES (?, ?)",
+                ((username, json.dumps(users[username])) for username in changed if username in users)
+            )
+
+    def save_user(self, username, users):
+        """Save a single user"""
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO users (username, data) VALUES (?, ?)",
+                (username, json.dumps(users[username]))
+            )
+
+    def get_user(self, username):
+        """Look up a single user"""
+        row = self.conn.execute("SELECT data FROM users WHERE username = ?", (username,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    # Scores
+
+    def load_scores(self, leaderboard_size=LEADERBOARD_SIZE):
+        """Load the top leaderboard_size games and all user stats"""
+        leaderboard = [
+            {"username": username, "score": score, "quiz": quiz, "date": date}
+            for username, score, quiz, date in self.conn.execute(
+                "SELECT username, score, quiz, date FROM games WHERE quiz IS NOT NULL "
+                "ORDER BY score DESC, date, id LIMIT ?",
+                (leaderboard_size,)
+            )
+        ]
+        user_stats = {
+            username: {"total_games": games, "total_score": total, "average_score": average}
+            for username, games, total, average in self.conn.execute(
+                "SELECT username, total_games, total_score, average_score FROM user_stats"
+            )
+        }
+        return {"leaderboard": leaderboard, "user_stats": user_stats}, []
+
+    def append_score(self, score_entry):
+        """Persist one finished game in the user stats"""
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO user_stats (username, total_games, total_score, average_score) "
+                "VALUES (?, 1, ?, ?) "
+                "ON CONFLICT(username) DO UPDATE SET "
+                "total_games = total_games + 1, "
+                "total_score = total_score + excluded.total_score, "
+                "average_score = (total_score + excluded.total_score) * 1.0 / (total_games + 1)",
+                (score_entry["username"], score_entry["score"], score_entry["score"])
+            )
+        return False
+
+    def save_scores(self, scores):
+        """Replace all user stats (the leaderboard is read from the game history)"""
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM user_stats")
+            self.conn.executemany(
+                "INSERT INTO user_stats (username, total_games, total_score, average_score) VALUES (?, ?, ?, ?)",
+                ((username, s["total_games"], s["total_score"], s["average_score"])
+                 for username, s in scores.get("user_stats", {}).items())
+            )
+
+    def clear_journal(self):
+        """SQLite commits every score directly, so there is no journal"""
+
+    def get_quiz_scores(self, quiz, limit=10):
+        """Get the best scores for one quiz"""
+        return [
+            {"username": username, "score": score, "quiz": quiz, "date": date}
+            for username, score, date in self.conn.execute(
+                "SELECT username, score, date FROM games WHERE quiz = ? ORDER BY score DESC, date, id LIMIT ?",
+                (quiz, limit)
+            )
+        ]
+
+    # Game history
+
+    def append_game(self, score_entry):
+        """Record a finished game in the full history"""
+        date = score_entry.get("date") or ""
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO games (day, username, score, quiz, date, games) VALUES (?, ?, ?, ?, ?, ?)",
+                (date[:10], score_entry["username"], score_entry["score"], score_entry.get("quiz"),
+                 date, score_entry.get("games", 1))
+            )
+
+    def append_games(self, score_entries):
+        """Record many games in one transaction"""
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO games (day, username, score, quiz, date, games) VALUES (?, ?, ?, ?, ?, ?)",
+                (((entry.get("date") or "")[:10], entry["username"], entry["score"], entry.get("quiz"),
+                  entry.get("date") or "", entry.get("games", 1)) for entry in score_entries)
+            )
+
+    def iter_games(self, start_day=None, end_day=None):
+        """Stream every recorded game in date order"""
+        cursor = self.conn.execute(
+            "SELECT username, score, quiz, date, games FROM games "
+            "WHERE day >= ? AND day <= ? ORDER BY day, id",
+            (start_day or "", end_day or "\uffff")
+        )
+        for username, score, quiz, date, games in cursor:
+            entry = {"username": username, "score": score, "quiz": quiz, "date": date}
+            if games != 1:
+                entry["games"] = games
+            yield entry
+
+    def has_games(self):
+        """Check if the history holds any game"""
+        return self.conn.execute("SELECT 1 FROM games LIMIT 1").fetchone() is not None
+
+    def remove_games(self, predicate):
+        """Remove games matching predicate from the history"""
+        doomed = []
+        for row in self.conn.execute("SELECT id, username, score, quiz, date FROM games"):
+            entry = {"username": row[1], "score": row[2], "quiz": row[3], "date": row[4]}
+            if predicate(entry):
+                doomed.append((row[0],))
+        with self.lock, self.conn:
+            self.conn.executemany("DELETE FROM games WHERE id = ?", doomed)
+        return len(doomed)
+
+    def clear_games(self):
+        """Remove the whole game history"""
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM games")
+
+    # Quizzes
+
+    def list_quizzes(self):
+        """List all quizzes as (name, location, is_custom) tuples"""
+        return [(e["name"], e["location"], e["is_custom"]) for e in self.get_catalog()]
+
+    def get_catalog(self):
+        """Get metadata of all quizzes from the catalog table"""
+        rows = self.conn.execute(
+            "SELECT name, is_custom, category, description, created_by, question_count "
+            "FROM quiz_catalog ORDER BY is_custom, name"
+        ).fetchall()
+        if not rows and self.conn.execute("SELECT 1 FROM quizzes LIMIT 1").fetchone():
+            self.rebuild_catalog()
+            return self.get_catalog()
+        return [
+            {
+                "name": name,
+                "location": f"{self.db_path}:{name}",
+                "is_custom": bool(is_custom),
+                "category": category,
+                "description": description,
+                "created_by": created_by,
+                "question_count": question_count
+            }
+            for name, is_custom, category, description, created_by, question_count in rows
+        ]
+
+    def _write_catalog_entry(self, name, is_custom, quiz_data):
+        """Upsert one catalog row (caller holds the transaction)"""
+        entry = catalog_entry(name, f"{self.db_path}:{name}", is_custom, quiz_data)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO quiz_catalog "
+            "(name, is_custom, category, description, created_by, question_count) VALUES (?, ?, ?, ?, ?, ?)",
+            (name, int(is_custom), entry["category"], entry["description"], entry["created_by"],
+             entry["question_count"])
+        )
+
+    def rebuild_catalog(self):
+        """Rebuild the catalog table from all stored quizzes"""
+        rows = self.conn.execute("SELECT name, is_custom, data FROM quizzes").fetchall()
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM quiz_catalog")
+            for name, is_custom, data in rows:
+                self._write_catalog_entry(name, is_custom, json.loads(data))
+
+    def quiz_exists(self, name, is_custom=False):
+        """Check if a quiz exists"""
+        row = self.conn.execute(
+            "SELECT 1 FROM quizzes WHERE name = ? AND is_custom = ?", (name, int(is_custom))
+        ).fetchone()
+        return row is not None
+
+    def load_quiz(self, name, is_custom=False):
+        """Load a quiz; returns None if it is missing"""
+        row = self.conn.execute(
+            "SELECT data FROM quizzes WHERE name = ? AND is_custom = ?", (name, int(is_custom))
+        ).fetchone()
+        if not row:
+            print(f"Quiz not found in database: {name}")
+            return None
+        return json.loads(row[0])
+
+    def load_questions(self, name, is_custom=False):
+        """Load a quiz's questions in compact, shared form; returns None if it is missing"""
+        row = self.conn.execute(
+            "SELECT data FROM quizzes WHERE name = ? AND is_custom = ?", (name, int(is_custom))
+        ).fetchone()
+        if not row:
+            print(f"Quiz not found in database: {name}")
+            return None
+
+        # Reused while the stored JSON is unchanged, so only edited quizzes are parsed again
+        key = (name, bool(is_custom))
+        with self.lock:
+            cached = self.question_cache.get(key)
+            if cached and cached[0] == row[0]:
+                self.question_cache.move_to_end(key)
+                return cached[1]
+
+        quiz_data = json.loads(row[0])
+        if quiz_data.get("question_bank"):
+            return open_bank(bank_path(self.data_dir, quiz_data), quiz_data.get("questions_per_game"))
+
+        questions = compact_questions(quiz_data.get("questions", []))
+        with self.lock:
+            self.question_cache[key] = (row[0], questions)
+            while len(self.question_cache) > QUIZ_CACHE_SIZE:
+                self.question_cache.popitem(last=False)
+        return questions
+
+    def save_quiz(self, name, quiz_data, is_custom=False):
+        """Save a quiz and return its location"""
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO quizzes (name, is_custom, data) VALUES (?, ?, ?)",
+                (name, int(is_custom), json.dumps(quiz_data))
+            )
+            self._write_catalog_entry(name, is_custom, quiz_data)
+        return f"{self.db_path}:{name}"
+
+    def delete_quiz(self, name, is_custom=False):
+        """Delete a quiz"""
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM quizzes WHERE name = ? AND is_custom = ?", (name, int(is_custom)))
+            self.conn.execute("DELETE FROM quiz_catalog WHERE name = ? AND is_custom = ?", (name, int(is_custom)))
+
+    # Migrations
+
+    def has_migration(self, name):
+        """Check if a one-time migration already ran on this database"""
+        return self.conn.execute("SELECT 1 FROM migrations WHERE name = ?", (name,)).fetchone() is not None
+
+    def mark_migration(self, name):
+        """Record that a one-time migration ran"""
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO migrations (name, applied) VALUES (?, ?)",
+                (name, datetime.now().strftime("%Y-%m-%d %H:%M"))
+            )
+
+    # Maintenance
+
+    def backup_files(self):
+        """Get all files that make up this store"""
+        if self._conn is not None:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return [self.db_path] + bank_files(self.data_dir)
+
+    def prepare_restore(self, paths):
+        """Nothing to remove; the database file is replaced as a whole"""
+
+    def close(self):
+        """Close the database connection"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def open_storage(backend=None, data_dir=DATA_DIR):
+    """Open the storage backend selected by GAMEMASTER_STORAGE (json or sqlite)"""
+    backend = backend or os.environ.get("GAMEMASTER_STORAGE", "json")
+    if backend == "sqlite":
+        return SQLiteStorage(os.path.join(data_dir, SQLITE_FILE))
+    if backend == "json":
+        return JSONStorage(data_dir)
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+def migrate(source, target):
+    """Copy all users, scores and quizzes from one storage to another"""
+    target.save_users(source.load_users())
+
+    scores, entries = source.load_scores()
+    target.save_scores(scores or {"leaderboard": [], "user_stats": {}})
+    for entry in entries:
+        target.append_score(entry)
+
+    # Data directories from before the game history get carry-over records
+    if source.has_games():
+        target.append_games(source.iter_games())
+    else:
+        target.append_games(legacy_records(scores or {}) + entries)
+
+    quiz_count = 0
+    for name, _, is_custom in source.list_quizzes():
+        quiz_data = source.load_quiz(name, is_custom)
+        if quiz_data is not None:
+            target.save_quiz(name, quiz_data, is_custom)
+            quiz_count += 1
+
+    return quiz_count
+
+
+def main(argv=None):
+    """Command line entry point for storage migration"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="GameMaster Quiz storage tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = subparsers.add_parser("migrate", help="Convert a data directory to another backend")
+    migrate_parser.add_argument("--from", dest="source", choices=["json", "sqlite"], default="json")
+    migrate_parser.add_argument("--to", dest="target", choices=["json", "sqlite"], default="sqlite")
+    migrate_parser.add_argument("--data-dir", default=DATA_DIR)
+    migrate_parser.add_argument("--target-dir", default=None, help="Defaults to --data-dir")
+
+    args = parser.parse_args(argv)
+
+    if args.source == args.target and not args.target_dir:
+        parser.error("Source and target are the same store")
+
+    source = open_storage(args.source, args.data_dir)
+    target = open_storage(args.target, args.target_dir or args.data_dir)
+    try:
+        quiz_count = migrate(source, target)
+    finally:
+        source.close()
+        target.close()
+
+    print(f"✓ Migrated {args.data_dir} ({args.source}) to {args.target_dir or args.data_dir} ({args.target})")
+    print(f"✓ {quiz_count} quizzes copied")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Background tasks for the GameMaster Quiz GUI
+Runs disk work off the Tk thread and hands results back with root.after
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+TASK_WORKERS = 2
+POLL_INTERVAL_MS = 20
+
+
+class Task:
+    """A background operation that can report progress and be cancelled"""
+
+    def __init__(self, runner, on_done, on_error, on_progress):
+        """Initialize task"""
+        self.runner = runner
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.cancel_event = threading.Event()
+
+    def report(self, done, total, message=""):
+        """Report progress from the worker thread"""
+        if self.on_progress:
+            self.runner.events.put((self.on_progress, (done, total, message)))
+
+    def cancel(self):
+        """Ask the operation to stop at its next checkpoint"""
+        self.cancel_event.set()
+
+    def is_cancelled(self):
+        """Check if cancellation was requested"""
+        return self.cancel_event.is_set()
+
+
+class TaskRunner:
+    """Executor-backed task layer whose callbacks always run on the Tk thread"""
+
+    def __init__(self, root, max_workers=TASK_WORKERS):
+        """Initialize task runner"""
+        self.root = root
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gui-task")
+        self.events = queue.Queue()
+        self.pending = 0
+        self.polling = False
+
+    def submit(self, func, *args, on_done=None, on_error=None, on_progress=None, cancellable=False):
+        """Run func(*args) in the background and return its Task"""
+        task = Task(self, on_done, on_error or self._report_error, on_progress)
+
+        # Long operations opt in to progress=task.report and cancelled=task.is_cancelled
+        kwargs = {}
+        if on_progress:
+            kwargs["progress"] = task.report
+        if cancellable:
+            kwargs["cancelled"] = task.is_cancelled
+
+        self.pending += 1
+        self.executor.submit(self._run, task, func, args, kwargs)
+        if not self.polling:
+            self.polling = True
+            self.root.after(POLL_INTERVAL_MS, self._poll)
+        return task
+
+    def _run(self, task, func, args, kwargs):
+        """Worker side: run the function and queue its outcome"""
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self.events.put((self._finish, (task.on_error, e)))
+        else:
+            self.events.put((self._finish, (task.on_done, result)))
+
+    def _finish(self, callback, value):
+        """Tk side: deliver a result or error"""
+        self.pending -= 1
+        if callback:
+            callback(value)
+
+    def _report_error(self, error):
+        """Default error handler"""
+        print(f"Background task failed: {error}")
+
+    def _poll(self):
+        """Drain queued events on the Tk thread"""
+        while True:
+            try:
+                callback, args = self.events.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"Background task callback failed: {e}")
+
+        if self.pending > 0:
+            self.root.after(POLL_INTERVAL_MS, self._poll)
+        else:
+            self.polling = False
+
+    def shutdown(self):
+        """Stop accepting tasks; running ones finish in the background"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,136 @@
+"""
+Tests for crash-safe writes, durable appends and group commit
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import durable
+from durable import GroupCommit, append_line, append_lines, write_bytes_atomic, write_json_atomic
+
+
+class AtomicWriteTest(unittest.TestCase):
+    """A replaced file is either the old one or the new one, and no temp files are left behind"""
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp(prefix="gamemaster-test-")
+        self.path = os.path.join(self.data_dir, "nested", "users.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def files(self):
+        return sorted(os.listdir(os.path.dirname(self.path)))
+
+    def test_writes_and_replaces_json(self):
+        write_json_atomic(self.path, {"alice": 1})
+        write_json_atomic(self.path, {"bob": 2})
+        with open(self.path) as f:
+            self.assertEqual(json.load(f), {"bob": 2})
+        self.assertEqual(self.files(), ["users.json"])
+
+    def test_failed_write_keeps_the_old_file(self):
+        write_json_atomic(self.path, {"alice": 1})
+        with self.assertRaises(TypeError):
+            write_json_atomic(self.path, {"broken": object()})
+        with open(self.path) as f:
+            self.assertEqual(json.load(f), {"alice": 1})
+        self.assertEqual(self.files(), ["users.json"])
+
+    def test_data_is_fsynced_before_the_rename(self):
+        events = []
+        with mock.patch.object(durable.os, "fsync", side_effect=lambda fd: events.append("fsync")), \
+             mock.patch.object(durable.os, "replace", side_effect=lambda *a: events.append("replace")):
+            write_bytes_atomic(self.path, b"data")
+        self.assertEqual(events[:2], ["fsync", "replace"])
+
+    def test_writes_bytes(self):
+        write_bytes_atomic(self.path, b"\x00\x01binary")
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), b"\x00\x01binary")
+
+
+class AppendTest(unittest.TestCase):
+    """Appends are fsynced once per call, with or without group commit"""
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp(prefix="gamemaster-test-")
+        self.path = os.path.join(self.data_dir, "history", "2024-01-05.jsonl")
+
+    def tearDown(self):
+        durable.disable_group_commit()
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def read_lines(self):
+        with open(self.path) as f:
+            return f.read().splitlines()
+
+    def test_append_lines_uses_one_fsync(self):
+        append_line(self.path, "first")
+        with mock.patch.object(durable.os, "fsync") as fsync:
+            append_lines(self.path, ["second", "third"])
+        self.assertEqual(fsync.call_count, 1)
+        self.assertEqual(self.read_lines(), ["first", "second", "third"])
+
+    def test_append_goes_through_group_commit_when_enabled(self):
+        durable.enable_group_commit(window_ms=1)
+        with mock.patch.object(durable._group_commit, "append", wraps=durable._group_commit.append) as append:
+            append_line(self.path, "first")
+        append.assert_called_once_with(self.path, "first\n")
+        self.assertEqual(self.read_lines(), ["first"])
+
+
+class GroupCommitTest(unittest.TestCase):
+    """Concurrent appends share fsyncs, and each returns only once an fsync covered it"""
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp(prefix="gamemaster-test-")
+        self.path = os.path.join(self.data_dir, "scores.journal")
+        self.synced_sizes = []
+        self.real_fsync_path = durable._fsync_path
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def fsync_path(self, path):
+        self.real_fsync_path(path)
+        self.synced_sizes.append(os.path.getsize(path))
+
+    def test_concurrent_appends_are_durable_and_share_fsyncs(self):
+        commit = GroupCommit(window=0.02)
+        writers, per_writer = 8, 20
+        not_covered = []
+
+        def write(writer):
+            for i in range(per_writer):
+                line = f"{writer}:{i}\n"
+                commit.append(self.path, line)
+                # Some fsync must have seen the file reach the end of our line
+                with open(self.path) as f:
+                    content = f.read()
+                end = content.index(line) + len(line)
+                if max(self.synced_sizes, default=0) < end:
+                    not_covered.append((writer, i))
+
+        with mock.patch.object(durable, "_fsync_path", side_effect=self.fsync_path):
+            threads = [threading.Thread(target=write, args=(w,)) for w in range(writers)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        with open(self.path) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(sorted(lines), sorted(f"{w}:{i}" for w in range(writers) for i in range(per_writer)))
+        self.assertEqual(not_covered, [])
+        self.assertLess(len(self.synced_sizes), writers * per_writer)
+        self.assertEqual(self.synced_sizes[-1], os.path.getsize(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
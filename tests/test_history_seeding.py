@@ -0,0 +1,59 @@
+"""
+Tests for carrying legacy scores over into the game history
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from quiz_logic import QuizGame
+from storage import JSONStorage, SQLiteStorage
+
+LEGACY_SCORES = {
+    "leaderboard": [
+        {"username": "Roberta", "score": 50, "quiz": "HISTORY", "date": "2024-01-05 10:00"}
+    ],
+    "user_stats": {
+        "Roberta": {"total_games": 3, "total_score": 110, "average_score": 110 / 3}
+    }
+}
+
+
+class HistorySeedingTest(unittest.TestCase):
+    """A game recorded on an unseeded store must not hide the legacy totals"""
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp(prefix="gamemaster-test-")
+        with open(os.path.join(self.data_dir, "scores.json"), "w") as f:
+            json.dump(LEGACY_SCORES, f)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def check_recalculation_keeps_legacy_stats(self, storage):
+        game = QuizGame(storage=storage)
+        game.record_game("Roberta", "HISTORY", 30)
+        game.record_game("newcomer", "HISTORY", 20)
+
+        game.recalculate_user_stats()
+        stats = game.get_user_stats("Roberta")
+        self.assertEqual(stats["total_games"], 4)
+        self.assertEqual(stats["total_score"], 140)
+        self.assertEqual(game.get_user_stats("newcomer")["total_score"], 20)
+
+    def test_json_storage(self):
+        self.check_recalculation_keeps_legacy_stats(JSONStorage(self.data_dir))
+
+    def test_sqlite_storage_after_migration(self):
+        source = JSONStorage(self.data_dir)
+        storage = SQLiteStorage(os.path.join(self.data_dir, "gamemaster.db"))
+        scores, entries = source.load_scores()
+        storage.save_scores(scores)
+        self.assertEqual(entries, [])
+        self.check_recalculation_keeps_legacy_stats(storage)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+"""
+Tests for question banks read through their offset index
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import question_bank
+from question_bank import INDEX_SUFFIX, QuestionBank, add_bank, build_index, open_bank
+from questions import compact_question
+from storage import JSONStorage
+
+
+def make_questions(count, start=0):
+    """Build count questions with varied record lengths"""
+    return [{"question": f"Question {i} " + "é" * (i % 7), "options": [f"a{i}", f"b{i}", "c" * (i % 5 + 1)],
+             "correct_answer": i % 3} for i in range(start, start + count)]
+
+
+class QuestionBankTest(unittest.TestCase):
+    """Every record is read back exactly, and stale or broken indexes are rebuilt"""
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp(prefix="gamemaster-test-")
+        self.path = os.path.join(self.data_dir, "bank.jsonl")
+        self.clear_open_banks()
+
+    def tearDown(self):
+        self.clear_open_banks()
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def clear_open_banks(self):
+        with question_bank._open_banks_lock:
+            banks = list(question_bank._open_banks.values())
+            question_bank._open_banks.clear()
+        for bank in banks:
+            bank.close()
+
+    def write_bank(self, questions, path=None, blank_lines=False):
+        with open(path or self.path, "w", encoding="utf-8") as f:
+            for question in questions:
+                f.write(json.dumps(question, ensure_ascii=False) + "\n")
+                if blank_lines:
+                    f.write("\n   \n")
+
+    def test_reads_every_record(self):
+        questions = make_questions(200)
+        self.write_bank(questions, blank_lines=True)
+        bank = QuestionBank(self.path)
+        self.assertEqual(len(bank), 200)
+        self.assertEqual([bank[i] for i in range(len(bank))], [compact_question(q) for q in questions])
+        self.assertEqual(bank[-1], compact_question(questions[-1]))
+        with self.assertRaises(IndexError):
+            bank[200]
+        bank.close()
+
+    def test_index_is_built_once_and_reused(self):
+        self.write_bank(make_questions(5))
+        self.assertEqual(build_index(self.path), 5)
+        with mock.patch.object(question_bank, "build_index") as rebuild:
+            bank = QuestionBank(self.path)
+        rebuild.assert_not_called()
+        self.assertEqual(bank[4], compact_question(make_questions(5)[4]))
+        bank.close()
+
+    def test_changed_bank_gets_a_new_index(self):
+        self.write_bank(make_questions(5))
+        QuestionBank(self.path).close()
+        self.write_bank(make_questions(8, start=100))
+        bank = QuestionBank(self.path)
+        self.assertEqual(len(bank), 8)
+        self.assertEqual(bank[0], compact_question(make_questions(1, start=100)[0]))
+        bank.close()
+
+    def test_truncated_index_is_rebuilt(self):
+        self.write_bank(make_questions(5))
+        build_index(self.path)
+        with open(self.path + INDEX_SUFFIX, "r+b") as f:
+            f.truncate(20)
+        bank = QuestionBank(self.path)
+        self.assertEqual(len(bank), 5)
+        bank.close()
+
+    def test_empty_bank(self):
+        open(self.path, "w").close()
+        bank = QuestionBank(self.path)
+        self.assertEqual(len(bank), 0)
+        with self.assertRaises(IndexError):
+            bank[0]
+
+    def test_closed_bank_reopens_unless_the_file_changed(self):
+        self.write_bank(make_questions(5))
+        bank = QuestionBank(self.path)
+        bank.close()
+        self.assertEqual(bank[2], compact_question(make_questions(5)[2]))
+        bank.close()
+        self.write_bank(make_questions(6))
+        with self.assertRaises(ValueError):
+            bank[2]
+
+    def test_open_banks_are_shared_and_bounded(self):
+        paths = []
+        for i in range(3):
+            path = os.path.join(self.data_dir, f"bank{i}.jsonl")
+            self.write_bank(make_questions(3), path)
+            paths.append(path)
+
+        with mock.patch.object(question_bank, "OPEN_BANKS_SIZE", 2):
+            first = open_bank(paths[0], per_game=5)
+            self.assertIs(open_bank(paths[0], per_game=7), first)
+            self.assertEqual(first.per_game, 7)
+            open_bank(paths[1])
+            open_bank(paths[2])
+        self.assertEqual(list(question_bank._open_banks), paths[1:])
+        self.assertTrue(first.closed)
+        # A game still holding the evicted bank keeps reading it
+        self.assertEqual(first[1], compact_question(make_questions(3)[1]))
+
+    def test_bank_quiz_loads_through_storage(self):
+        source = os.path.join(self.data_dir, "source.jsonl")
+        self.write_bank(make_questions(50), source)
+        storage = JSONStorage(os.path.join(self.data_dir, "data"))
+        self.assertEqual(add_bank(storage, "trivia", source, per_game=4), 50)
+
+        bank = storage.load_questions("trivia", is_custom=True)
+        self.assertEqual((len(bank), bank.per_game), (50, 4))
+        self.assertEqual(bank[49], compact_question(make_questions(50)[49]))
+        self.assertEqual(storage.get_catalog()[0]["question_count"], 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+"""
+Tests for the compiled .gmq quiz format
+"""
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import quiz_compiler
+from questions import compact_questions
+from quiz_compiler import (CompiledQuiz, compile_quiz, compiled_path, decompile_quiz, main, open_compiled,
+                           write_compiled)
+from storage import JSONStorage
+
+QUIZ = {
+    "category": "HISTORY",
+    "description": "Ünïcode and shared strings ✓",
+    "created_by": "Roberta",
+    "questions": [
+        {"question": "Which came first?", "options": ["Pong", "Tetris", "Doom"], "correct_answer": 0},
+        {"question": "Is this true?", "options": ["True", "False"], "correct_answer": 1},
+        {"question": "Also true?", "options": ["True", "False"], "correct_answer": 0},
+        {"question": "ゲームの名前は？", "options": ["", "ドラクエ", "FF", "ゼルダ"], "correct_answer": 3}
+    ],
+    "difficulty": "hard"
+}
+
+
+class CompileRoundTripTest(unittest.TestCase):
+    """Compiling and decompiling gives back the same quiz, key order included"""
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp(prefix="gamemaster-test-")
+        self.path = os.path.join(self.data_dir, "quiz.gmq")
+        self.opened = []
+
+    def tearDown(self):
+        for compiled in self.opened:
+            compiled.close()
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def round_trip(self, quiz_data):
+        with open(self.path, "wb") as f:
+            f.write(compile_quiz(quiz_data, (123, 456)))
+        compiled = CompiledQuiz(self.path)
+        self.opened.append(compiled)
+        return compiled
+
+    def test_round_trip(self):
+        compiled = self.round_trip(QUIZ)
+        self.assertEqual(len(compiled), 4)
+        self.assertEqual(compiled.source, (123, 456))
+        self.assertEqual(list(compiled), list(compact_questions(QUIZ["questions"])))
+        self.assertEqual(compiled[-1], compact_questions(QUIZ["questions"])[-1])
+        decompiled = decompile_quiz(compiled)
+        self.assertEqual(json.dumps(decompiled), json.dumps(QUIZ))
+        with self.assertRaises(IndexError):
+            compiled[4]
+
+    def test_empty_quiz(self):
+        compiled = self.round_trip({"category": "EMPTY", "questions": []})
+        self.assertEqual(len(compiled), 0)
+        self.assertEqual(decompile_quiz(compiled), {"category": "EMPTY", "questions": []})
+
+    def test_repeated_strings_are_stored_once(self):
+        repeated = {"questions": [{"question": "Same?", "options": ["True", "False"], "correct_answer": 0}] * 100}
+        single = {"questions": repeated["questions"][:1]}
+        record_size = quiz_compiler.record_struct(2).size
+        self.assertEqual(len(compile_quiz(repeated)) - len(compile_quiz(single)), 99 * record_size)
+
+    def test_content_the_format_cannot_hold_is_rejected(self):
+        bad_quizzes = [
+            {"questions": [{"question": "q", "options": ["a"], "correct_answer": 0, "hint": "extra"}]},
+            {"questions": [{"question": "q", "options": ["a"] * 256, "correct_answer": 0}]},
+            {"questions": [{"question": "q", "options": ["a"], "correct_answer": "0"}]},
+            {"questions": [{"question": "q", "options": ["a"], "correct_answer": 300}]},
+            {"questions": [{"question": "q", "options": [1, 2], "correct_answer": 0}]}
+        ]
+        for quiz_data in bad_quizzes:
+            with self.assertRaises(ValueError):
+                compile_quiz(quiz_data)
+
+    def test_files_that_are_not_compiled_quizzes_are_rejected(self):
+        for data in (b"", b"GMQUIZC1", b"NOTAQUIZ" + bytes(64)):
+            with open(self.path, "wb") as f:
+                f.write(data)
+            with self.assertRaises(ValueError):
+                CompiledQuiz(self.path)
+
+    def test_command_line_round_trip(self):
+        source = os.path.join(self.data_dir, "quiz.json")
+        target = os.path.join(self.data_dir, "back.json")
+        with open(source, "w") as f:
+            json.dump(QUIZ, f)
+        with contextlib.redirect_stdout(io.StringIO()):
+            main(["compile", source, self.path])
+            main(["decompile", self.path, target])
+        with open(target) as f:
+            self.assertEqual(json.load(f), QUIZ)
+
+
+class OpenCompiledTest(unittest.TestCase):
+    """Compiled quizzes are only used while they match their JSON source"""
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp(prefix="gamemaster-test-")
+        self.compiled_dir = os.path.join(self.data_dir, "compiled")
+        self.clear_open_quizzes()
+
+    def tearDown(self):
+        self.clear_open_quizzes()
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def clear_open_quizzes(self):
+        with quiz_compiler._open_quizzes_lock:
+            quizzes = list(quiz_compiler._open_quizzes.values())
+            quiz_compiler._open_quizzes.clear()
+        for compiled in quizzes:
+            compiled.close()
+
+    def write_json(self, name, quiz_data):
+        path = os.path.join(self.data_dir, f"{name}.json")
+        with open(path, "w") as f:
+            json.dump(quiz_data, f)
+        return path
+
+    def test_stale_compiled_quiz_is_not_used(self):
+        json_path = self.write_json("history", QUIZ)
+        self.assertIsNone(open_compiled(json_path, self.compiled_dir))
+        write_compiled(json_path, QUIZ, self.compiled_dir)
+        compiled = open_compiled(json_path, self.compiled_dir)
+        self.assertEqual(len(compiled), 4)
+        self.assertIs(open_compiled(json_path, self.compiled_dir), compiled)
+
+        self.write_json("history", dict(QUIZ, questions=QUIZ["questions"][:1]))
+        self.assertIsNone(open_compiled(json_path, self.compiled_dir))
+
+    def test_open_quizzes_are_bounded_and_closed_ones_map_again(self):
+        paths = [self.write_json(f"quiz{i}", QUIZ) for i in range(3)]
+        for path in paths:
+            write_compiled(path, QUIZ, self.compiled_dir)
+
+        with mock.patch.object(quiz_compiler, "OPEN_QUIZZES_SIZE", 2):
+            first = open_compiled(paths[0], self.compiled_dir)
+            for path in paths[1:]:
+                open_compiled(path, self.compiled_dir)
+        self.assertEqual(len(quiz_compiler._open_quizzes), 2)
+        self.assertIsNone(first.data)
+        # A game still holding the evicted quiz keeps reading it
+        self.assertEqual(first[0].question, "Which came first?")
+
+    def test_closed_quiz_fails_if_its_file_changed(self):
+        json_path = self.write_json("history", QUIZ)
+        write_compiled(json_path, QUIZ, self.compiled_dir)
+        compiled = open_compiled(json_path, self.compiled_dir)
+        compiled.close()
+        self.write_json("history", dict(QUIZ, description="changed"))
+        write_compiled(json_path, dict(QUIZ, description="changed"), self.compiled_dir)
+        with self.assertRaises(ValueError):
+            compiled[0]
+
+    def test_storage_compiles_quizzes_outside_the_quiz_directories(self):
+        storage = JSONStorage(os.path.join(self.data_dir, "data"))
+        json_path = storage.save_quiz("history", QUIZ)
+        questions = storage.load_questions("history")
+        self.assertIsInstance(questions, CompiledQuiz)
+        self.assertEqual(list(questions), list(compact_questions(QUIZ["questions"])))
+        self.assertTrue(os.path.exists(compiled_path(json_path, storage.compiled_dir(False))))
+        self.assertEqual(sorted(os.listdir(storage.quizzes_dir)), ["history.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+"""
+Tests for the rank index and leaderboard against brute-force references
+"""
+
+import random
+import unittest
+from unittest import mock
+
+import ranking
+from ranking import Leaderboard, RankIndex
+
+
+class ReferenceRanking:
+    """Ranks users by sorting every total, the slow and obvious way"""
+
+    def __init__(self):
+        self.totals = {}
+        self.order = {}  # when each user reached their total; earlier holders are listed first
+        self.clock = 0
+
+    def update(self, username, total):
+        self.clock += 1
+        self.totals[username] = max(0, total)
+        self.order[username] = self.clock
+
+    def remove(self, username):
+        self.totals.pop(username, None)
+        self.order.pop(username, None)
+
+    def rank(self, username):
+        if username not in self.totals:
+            return None
+        return 1 + sum(1 for total in self.totals.values() if total > self.totals[username])
+
+    def next_higher_total(self, username):
+        if username not in self.totals:
+            return None
+        higher = [total for total in self.totals.values() if total > self.totals[username]]
+        return min(higher) if higher else None
+
+    def page(self, offset, limit):
+        ordered = sorted(self.totals, key=lambda name: (-self.totals[name], self.order[name]))
+        return [(name, self.totals[name]) for name in ordered[offset:offset + limit]]
+
+
+class RankIndexTest(unittest.TestCase):
+    """Ranks, pages and neighbours match the reference through updates and removals"""
+
+    def check_matches(self, index, reference, rng):
+        self.assertEqual(len(index), len(reference.totals))
+        for username in list(reference.totals)[:50]:
+            self.assertEqual(index.rank(username), reference.rank(username))
+            self.assertEqual(index.next_higher_total(username), reference.next_higher_total(username))
+        for offset in (0, rng.randrange(len(reference.totals) + 1), len(reference.totals) - 1):
+            self.assertEqual(index.page(offset, 7), reference.page(max(offset, 0), 7))
+        if reference.totals:
+            best_name, best_total = index.best()
+            self.assertEqual(best_total, max(reference.totals.values()))
+            self.assertEqual(reference.totals[best_name], best_total)
+
+    def run_random_operations(self, seed, steps=3000, users=300, spread=500):
+        rng = random.Random(seed)
+        initial = {f"user{i}": {"total_score": rng.randrange(spread)} for i in range(users // 2)}
+        index = RankIndex(initial)
+        reference = ReferenceRanking()
+        for username, stats in initial.items():
+            reference.update(username, stats["total_score"])
+
+        for step in range(steps):
+            username = f"user{rng.randrange(users)}"
+            action = rng.random()
+            if action < 0.1:
+                index.remove(username)
+                reference.remove(username)
+            elif action < 0.6:
+                # Games only add points, the common case
+                total = reference.totals.get(username, 0) + rng.randrange(0, 60, 10)
+                index.update(username, total)
+                reference.update(username, total)
+            else:
+                total = rng.randrange(spread * 2)
+                index.update(username, total)
+                reference.update(username, total)
+            if step % 100 == 0:
+                self.check_matches(index, reference, rng)
+        self.check_matches(index, reference, rng)
+
+    def test_matches_reference(self):
+        for seed in range(3):
+            self.run_random_operations(seed)
+
+    def test_matches_reference_through_rebuilds_and_compaction(self):
+        # Tiny thresholds make pending totals, rebuilds and compaction happen all the time
+        with mock.patch.object(ranking, "RANK_SLOT_SLACK", 1), mock.patch.object(ranking, "RANK_PENDING_FACTOR", 1):
+            for seed in range(3):
+                self.run_random_operations(seed)
+
+    def test_tree_is_sized_by_distinct_totals(self):
+        index = RankIndex({"alice": {"total_score": 10 ** 9}, "bob": {"total_score": 5}})
+        index.update("carol", 10 ** 9 + 7)
+        self.assertLessEqual(len(index.tree), 4)
+        self.assertEqual(index.rank("carol"), 1)
+        self.assertEqual(index.rank("bob"), 3)
+
+    def test_ties_share_a_rank(self):
+        index = RankIndex({"alice": {"total_score": 50}, "bob": {"total_score": 50}, "carol": {"total_score": 20}})
+        self.assertEqual([index.rank(name) for name in ("alice", "bob", "carol")], [1, 1, 3])
+        self.assertEqual(index.next_higher_total("carol"), 50)
+        self.assertIsNone(index.next_higher_total("alice"))
+
+    def test_empty_index(self):
+        index = RankIndex()
+        self.assertEqual(index.page(0, 10), [])
+        self.assertEqual(index.best(), (None, 0))
+        self.assertIsNone(index.rank("nobody"))
+
+
+class LeaderboardTest(unittest.TestCase):
+    """The top-K list keeps the K best entries, oldest first among equal scores"""
+
+    def test_matches_sorting_every_entry(self):
+        rng = random.Random(7)
+        board = Leaderboard(size=10)
+        entries = []
+        for i in range(500):
+            entry = {"username": f"u{i}", "score": rng.randrange(0, 100, 10), "date": f"2024-01-01 {i:05d}"}
+            entries.append(entry)
+            board.add(entry)
+        expected = sorted(entries, key=lambda e: (-e["score"], e["date"]))[:10]
+        self.assertEqual(board.top(10), expected)
+        self.assertEqual(len(board), 10)
+
+    def test_rejects_an_entry_that_cannot_place(self):
+        board = Leaderboard([{"score": 50, "date": "a"}, {"score": 40, "date": "b"}], size=2)
+        self.assertFalse(board.add({"score": 40, "date": "c"}))
+        self.assertTrue(board.add({"score": 45, "date": "c"}))
+        self.assertEqual([e["score"] for e in board.top()], [50, 45])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+Tests for the score journal and its replay on top of the scores snapshot
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from quiz_logic import QuizGame
+from score_journal import ScoreJournal
+from storage import JSONStorage
+
+
+def entry(username, score):
+    """Build a score entry"""
+    return {"username": username, "score": score, "quiz": "HISTORY", "date": "2024-01-05 10:00"}
+
+
+class ScoreJournalTest(unittest.TestCase):
+    """Entries survive a restart until a snapshot folds them in, exactly once"""
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp(prefix="gamemaster-test-")
+        self.snapshot_file = os.path.join(self.data_dir, "scores.json")
+        self.journal_file = os.path.join(self.data_dir, "scores.journal")
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def journal(self, compact_threshold=100):
+        return ScoreJournal(self.snapshot_file, self.journal_file, compact_threshold)
+
+    def test_entries_are_replayed_in_order(self):
+        journal = self.journal()
+        journal.load()
+        for score in (10, 20, 30):
+            journal.append(entry("alice", score))
+
+        snapshot, entries = self.journal().load()
+        self.assertIsNone(snapshot)
+        self.assertEqual([e["score"] for e in entries], [10, 20, 30])
+
+    def test_append_asks_for_compaction_at_the_threshold(self):
+        journal = self.journal(compact_threshold=3)
+        journal.load()
+        self.assertEqual([journal.append(entry("alice", 10)) for _ in range(3)], [False, False, True])
+
+    def test_compaction_folds_entries_into_the_snapshot(self):
+        journal = self.journal()
+        journal.load()
+        journal.append(entry("alice", 10))
+        journal.compact({"leaderboard": [entry("alice", 10)], "user_stats": {}})
+        journal.append(entry("bob", 20))
+
+        snapshot, entries = self.journal().load()
+        self.assertEqual(snapshot["leaderboard"], [entry("alice", 10)])
+        self.assertNotIn("journal_seq", snapshot)
+        self.assertEqual(entries, [entry("bob", 20)])
+
+    def test_entries_in_the_snapshot_are_skipped_after_a_crash_before_truncation(self):
+        journal = self.journal()
+        journal.load()
+        journal.append(entry("alice", 10))
+        journal.append(entry("alice", 20))
+        with mock.patch.object(ScoreJournal, "clear"):
+            journal.compact({"leaderboard": [], "user_stats": {}})
+        journal.append(entry("alice", 30))
+
+        _, entries = self.journal().load()
+        self.assertEqual(entries, [entry("alice", 30)])
+
+    def test_a_torn_last_line_is_ignored(self):
+        journal = self.journal()
+        journal.load()
+        journal.append(entry("alice", 10))
+        with open(self.journal_file, "a") as f:
+            f.write('{"seq": 2, "entry": {"username"')
+
+        _, entries = self.journal().load()
+        self.assertEqual(entries, [entry("alice", 10)])
+
+    def test_sequence_numbers_continue_after_a_restart(self):
+        journal = self.journal()
+        journal.load()
+        journal.append(entry("alice", 10))
+        journal = self.journal()
+        journal.load()
+        journal.append(entry("alice", 20))
+
+        with open(self.journal_file) as f:
+            self.assertEqual([json.loads(line)["seq"] for line in f], [1, 2])
+
+
+class ScoreReplayTest(unittest.TestCase):
+    """A restarted game sees the same scores whether or not a snapshot was written"""
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp(prefix="gamemaster-test-")
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def test_journal_and_snapshot_give_the_same_scores(self):
+        game = QuizGame(storage=JSONStorage(self.data_dir))
+        for username, score in (("alice", 30), ("bob", 50), ("alice", 40)):
+            game.record_game(username, "HISTORY", score)
+
+        replayed = QuizGame(storage=JSONStorage(self.data_dir))
+        self.assertEqual(replayed.get_user_stats("alice")["total_score"], 70)
+        self.assertEqual(replayed.get_user_stats("alice")["total_games"], 2)
+        self.assertEqual([e["score"] for e in replayed.get_leaderboard()], [50, 40, 30])
+
+        replayed.save_scores()
+        restarted = QuizGame(storage=JSONStorage(self.data_dir))
+        self.assertEqual(restarted.scores["user_stats"], replayed.scores["user_stats"])
+        self.assertEqual(restarted.get_leaderboard(), replayed.get_leaderboard())
+        self.assertEqual(os.path.getsize(os.path.join(self.data_dir, "scores.journal")), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Tests for signed session tokens
+"""
+
+import unittest
+from unittest import mock
+
+from tokens import TokenManager
+
+NOW = 1700000000.0
+
+
+class TokenTest(unittest.TestCase):
+    """Tokens verify until they expire or are revoked, and forged ones never do"""
+
+    def setUp(self):
+        self.clock = mock.patch("tokens.time.time", return_value=NOW)
+        self.clock.start()
+        self.tokens = TokenManager(secret="test-secret", ttl=60, cache_size=2)
+
+    def tearDown(self):
+        self.clock.stop()
+
+    def advance(self, seconds):
+        self.clock.stop()
+        self.clock = mock.patch("tokens.time.time", return_value=NOW + seconds)
+        self.clock.start()
+
+    def test_issued_token_verifies(self):
+        token = self.tokens.issue("Roberta")
+        self.assertEqual(self.tokens.verify(token), "Roberta")
+        self.assertNotEqual(self.tokens.issue("Roberta"), token)
+
+    def test_token_verifies_by_signature_after_eviction_and_restart(self):
+        token = self.tokens.issue("élodie.user")
+        for name in ("a", "b", "c"):
+            self.tokens.issue(name)
+        self.assertNotIn(token, self.tokens.cache)
+        self.assertEqual(self.tokens.verify(token), "élodie.user")
+        self.assertEqual(TokenManager(secret="test-secret").verify(token), "élodie.user")
+        self.assertIsNone(TokenManager(secret="other-secret").verify(token))
+
+    def test_forged_and_malformed_tokens_are_rejected(self):
+        token = self.tokens.issue("alice")
+        other = self.tokens.issue("bob")
+        user_part, expires, nonce, signature = token.split(".")
+        bob_part = other.split(".")[0]
+        fresh = TokenManager(secret="test-secret")
+        self.assertIsNone(fresh.verify(".".join((bob_part, expires, nonce, signature))))
+        self.assertIsNone(fresh.verify(".".join((user_part, str(int(expires) + 3600), nonce, signature))))
+        for garbage in ("", "abc", "a.b", "a.b.c.d.e", "!!.1.x.y", token + "x"):
+            self.assertIsNone(fresh.verify(garbage))
+
+    def test_token_expires(self):
+        token = self.tokens.issue("alice")
+        self.advance(59)
+        self.assertEqual(self.tokens.verify(token), "alice")
+        self.advance(60)
+        self.assertIsNone(self.tokens.verify(token))
+        self.assertIsNone(TokenManager(secret="test-secret").verify(token))
+
+    def test_revoked_token_stays_invalid_after_eviction(self):
+        token = self.tokens.issue("alice")
+        self.tokens.revoke(token)
+        self.assertIsNone(self.tokens.verify(token))
+        for name in ("a", "b", "c"):
+            self.tokens.issue(name)
+        self.assertIsNone(self.tokens.verify(token))
+
+    def test_revocations_are_dropped_once_the_token_expired(self):
+        first = self.tokens.issue("alice")
+        self.tokens.revoke(first)
+        self.advance(61)
+        second = self.tokens.issue("alice")
+        self.tokens.revoke(second)
+        self.assertEqual(list(self.tokens.revoked), [second])
+
+    def test_cache_is_bounded(self):
+        for name in ("a", "b", "c", "d"):
+            self.tokens.issue(name)
+        self.assertEqual(len(self.tokens.cache), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Session tokens for GameMaster Quiz
+HMAC-signed, expiring tokens so repeat requests skip password hashing
+"""
+
+import base64
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
+
+TOKEN_TTL = 3600
+TOKEN_CACHE_SIZE = 10000
+
+
+def _b64(raw):
+    """Encode bytes URL-safe without padding"""
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _unb64(text):
+    """Decode bytes encoded by _b64"""
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+class TokenManager:
+    """Issues, verifies and revokes signed session tokens"""
+
+    def __init__(self, secret=None, ttl=TOKEN_TTL, cache_size=TOKEN_CACHE_SIZE):
+        """Initialize token manager; without a secret, tokens die with the process"""
+        secret = secret or os.environ.get("GAMEMASTER_TOKEN_SECRET") or os.urandom(32)
+        self.secret = secret.encode() if isinstance(secret, str) else secret
+        self.ttl = ttl
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.revoked = {}
+        self.lock = threading.Lock()
+
+    def _sign(self, payload):
+        """Sign a token payload"""
+        return _b64(hmac.new(self.secret, payload.encode(), hashlib.sha256).digest())
+
+    def issue(self, username):
+        """Issue a token for username"""
+        expires = int(time.time()) + self.ttl
+        payload = f"{_b64(username.encode())}.{expires}.{_b64(os.urandom(9))}"
+        token = f"{payload}.{self._sign(payload)}"
+        self._remember(token, username, expires)
+        return token
+
+    def _remember(self, token, username, expires):
+        """Add a verified token to the LRU cache"""
+        with self.lock:
+            self.cache[token] = (username, expires)
+            self.cache.move_to_end(token)
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+    def verify(self, token):
+        """Get the username of a valid token, or None"""
+        now = time.time()
+        with self.lock:
+            cached = self.cache.get(token)
+            if cached:
+                if cached[1] > now:
+                    self.cache.move_to_end(token)
+                    return cached[0]
+                del self.cache[token]
+                return None
+            if token in self.revoked:
+                return None
+
+        # Cache miss (evicted, or issued before a restart with the same secret)
+        try:
+            payload, signature = token.rsplit(".", 1)
+            user_part, expires, _ = payload.split(".")
+            expires = int(expires)
+            username = _unb64(user_part).decode()
+        except (ValueError, UnicodeDecodeError):
+            return None
+        if not hmac.compare_digest(signature, self._sign(payload)) or expires <= now:
+            return None
+
+        self._remember(token, username, expires)
+        return username
+
+    def revoke(self, token):
+        """Invalidate a token before it expires"""
+        with self.lock:
+            entry = self.cache.pop(token, None)
+            expires = entry[1] if entry else time.time() + self.ttl
+
+            # Revoked tokens are kept only until they would have expired anyway
+            now = time.time()
+            for old_token in [t for t, until in self.revoked.items() if until <= now]:
+                del self.revoked[old_token]
+            self.revoked[token] = expires